@@ -60,6 +60,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'course.query_middleware.QueryCountMiddleware',
+    'course.db_router.ReplicaPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -67,6 +69,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'course.shib_middleware.CustomShibbolethMiddleware',
+    'course.context.CourseContextMiddleware',
+    'course.activity_middleware.LastSeenMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -114,6 +118,21 @@ DATABASES = {
     }
 }
 
+# Optional streaming replica for the reporting views (see course/db_router.py).
+# Same database and credentials as the primary, another host.
+if os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.environ['DB_REPLICA_HOST'],
+        'PORT': os.environ.get('DB_REPLICA_PORT', ''),
+        # Tests see the primary's test database through this alias
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['course.db_router.ReplicaRouter']
+REPLICA_DATABASE = 'replica'
+# How long a user who wrote keeps reading from the primary; should exceed the replica lag
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 5))
+
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -176,6 +195,8 @@ LOGIN_REDIRECT_URL = '/course/home/'
 LOGOUT_URL = '/Shibboleth.sso/Logout'
 LOGOUT_REDIRECT_URL = '/'
 SHIBBOLETH_FORCE_REAUTH_SESSION = False
+# Seconds the HTTP_MAIL -> user id mapping is cached (see course/shib_middleware.py)
+SHIBBOLETH_IDENTITY_TTL = int(os.environ.get('SHIBBOLETH_IDENTITY_TTL', 300))
 
 # Update these Shibboleth settings
 SHIBBOLETH_LOGIN_URL = '/Shibboleth.sso/Login' 
@@ -202,47 +223,49 @@ SECURE_HSTS_PRELOAD = True
 SESSION_COOKIE_SECURE = True
 CSRF_COOKIE_SECURE = True
 
+# Per-request SQL query count and DB time (see course/query_middleware.py)
+QUERY_COUNT_HEADERS = os.environ.get('QUERY_COUNT_HEADERS', str(DEBUG)).lower() in ('1', 'true', 'yes')
+QUERY_COUNT_WARNING = int(os.environ.get('QUERY_COUNT_WARNING', 50))
+
+# Logging: request threads only enqueue records; a QueueListener thread writes
+# size-rotated JSON lines (see course/log.py). Chatty DEBUG/INFO loggers are sampled.
+LOG_DIR = os.environ.get('LOG_DIR', os.path.join(BASE_DIR, 'logs'))
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
-    'formatters': {
-        'verbose': {
-            'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
-            'style': '{',
+    'filters': {
+        'sampling': {
+            '()': 'course.log.SamplingFilter',
+            'rates': {
+                'course.views': float(os.environ.get('LOG_SAMPLE_VIEWS', 1.0)),
+                'course.shib_middleware': float(os.environ.get('LOG_SAMPLE_SHIBBOLETH', 0.1)),
+                'course.query_middleware': float(os.environ.get('LOG_SAMPLE_QUERIES', 0.1)),
+                'django.request': 1.0,
+            },
         },
     },
     'handlers': {
-        'console': {
-            'class': 'logging.StreamHandler',
-            'formatter': 'verbose',
-        },
-        'file': {
-            'class': 'logging.FileHandler',
-            'filename': 'debug.log',
-            'formatter': 'verbose',
-            'encoding': 'utf-8',
+        'queue': {
+            '()': 'course.log.QueueFileHandler',
+            'filename': os.path.join(LOG_DIR, 'app.log'),
+            'max_bytes': 20 * 1024 * 1024,  # 20MB per file
+            'backup_count': 10,
+            'console': DEBUG,
+            'filters': ['sampling'],
         },
     },
+    'root': {
+        'handlers': ['queue'],
+        'level': 'WARNING',
+    },
     'loggers': {
-        'course.shibboleth_views': {
-            'handlers': ['console', 'file'],
-            'level': 'DEBUG',
-            'propagate': True,
-        },
-        'course.shib_middleware': {
-            'handlers': ['console', 'file'],
-            'level': 'DEBUG',
-            'propagate': True,
-        },
-        'course.views': {
-            'handlers': ['console', 'file'],
-            'level': 'DEBUG',
-            'propagate': True,
+        'course': {
+            'level': LOG_LEVEL,
         },
         'django.core.mail': {
-            'handlers': ['console', 'file'],
-            'level': 'DEBUG',
-            'propagate': False,
+            'level': LOG_LEVEL,
         },
     },
 }
@@ -256,8 +279,6 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
 
-# Enable serving static files in production
-STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
 
 # Media and Data Storage Configuration
 DATA_URL = '/data/'
@@ -292,20 +313,83 @@ STORAGES = {
             'base_url': DATA_URL,
         }
     },
+    # Content-hashed filenames plus precompressed .gz/.br siblings at collectstatic time
     'staticfiles': {
-        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+        'BACKEND': 'course.storage.CompressedManifestStaticFilesStorage',
     },
 }
 
 # File Upload Settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 2 * 1024 * 1024 * 1024  # 2GB
-DATA_UPLOAD_MAX_MEMORY_SIZE = 2 * 1024 * 1024 * 1024  # 2GB
+# Uploads larger than this are spooled to FILE_UPLOAD_TEMP_DIR instead of worker RAM
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2 * 1024 * 1024  # 2MB
+# Non-file request data (form fields, JSON bodies)
+DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 MAX_UPLOAD_SIZE = 2 * 1024 * 1024 * 1024  # 2GB
 
 # Temporary file settings
 FILE_UPLOAD_TEMP_DIR = os.path.join(DATA_ROOT, 'tmp')
 os.makedirs(FILE_UPLOAD_TEMP_DIR, exist_ok=True)
 
+# Progress of multipart uploads is published under the client's X-Progress-ID;
+# every file is hashed (uploaded_file.sha256) while it streams to memory or disk
+FILE_UPLOAD_HANDLERS = [
+    'course.upload_handlers.UploadProgressHandler',
+    'course.upload_handlers.HashingMemoryFileUploadHandler',
+    'course.upload_handlers.HashingTemporaryFileUploadHandler',
+]
+
+# Shared between gunicorn workers: Redis when REDIS_URL is set. Without it the
+# cache lives in each process, which is only correct with a single worker
+# (gunicorn reads the worker count from WEB_CONCURRENCY).
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+elif int(os.environ.get('WEB_CONCURRENCY', 1)) > 1:
+    from django.core.exceptions import ImproperlyConfigured
+    raise ImproperlyConfigured('REDIS_URL is required with more than one worker (WEB_CONCURRENCY)')
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+# Last-seen tracking: buffered in the cache, written to the DB in batches
+LAST_SEEN_RESOLUTION = 60  # seconds between cache writes per user and process
+LAST_SEEN_FLUSH_INTERVAL = 300  # seconds between bulk updates of CustomUserModel.last_seen
+
+# Resumable (chunked) uploads for lesson videos and exercise materials
+RESUMABLE_UPLOAD_DIR = os.path.join(FILE_UPLOAD_TEMP_DIR, 'resumable')
+RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024  # 8MB
+RESUMABLE_UPLOAD_EXPIRY_HOURS = 24  # unfinished uploads older than this are discarded
+
+# Video transcoding (HLS ladder generated in the background with ffmpeg)
+FFMPEG_BINARY = os.environ.get('FFMPEG_BINARY', 'ffmpeg')
+FFPROBE_BINARY = os.environ.get('FFPROBE_BINARY', 'ffprobe')
+HLS_ROOT = os.path.join(DATA_ROOT, 'hls')
+HLS_SEGMENT_SECONDS = 6
+HLS_ENCODE_TIMEOUT = 6 * 60 * 60  # seconds per rendition
+# (height, video bitrate, audio bitrate)
+HLS_LADDER = [
+    (360, '800k', '96k'),
+    (720, '2800k', '128k'),
+    (1080, '5000k', '192k'),
+]
+
+# Rendered notebook HTML, cached by content hash (see course/utils/notebooks.py)
+NOTEBOOK_CACHE_ROOT = os.path.join(DATA_ROOT, 'notebook_cache')
+NOTEBOOK_CACHE_MAX_AGE = 30 * 24 * 60 * 60  # entries unused this long are pruned
+
+# Limits enforced on every uploaded or submitted notebook (see course/utils/notebook_validation.py)
+NOTEBOOK_MAX_BYTES = int(os.environ.get('NOTEBOOK_MAX_BYTES', 25 * 1024 * 1024))  # 25MB
+NOTEBOOK_MAX_OUTPUT_BYTES = int(os.environ.get('NOTEBOOK_MAX_OUTPUT_BYTES', 5 * 1024 * 1024))  # 5MB per output
+NOTEBOOK_MAX_CELLS = int(os.environ.get('NOTEBOOK_MAX_CELLS', 2000))
+
 # Security Settings
 SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = 'DENY'
@@ -0,0 +1,17 @@
+"""
+Settings for ``manage.py test``: the production settings with a per-process
+cache, so tests never touch (or clear) a shared Redis, and without the
+read replica.
+"""
+
+from app.settings import *  # noqa: F401,F403
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# A mirror is a second connection, which does not see the data a TestCase
+# writes in its transaction; reporting views read from the primary instead
+DATABASES.pop(REPLICA_DATABASE, None)  # noqa: F405
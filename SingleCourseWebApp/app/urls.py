@@ -17,8 +17,7 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
-from django.views.static import serve
+from course.utils.serving import serve_file, serve_static
 import os
 
 app_name = 'shibboleth'
@@ -29,16 +28,20 @@ urlpatterns = [
 ]
 
 if settings.DEBUG:
-    # Serve static files
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-    
-# Serve data files including exercise submissions
+    # Serve collected static files (precompressed variants, immutable caching for hashed names)
+    urlpatterns += [
+        path(f"{settings.STATIC_URL.strip('/')}/<path:path>", serve_static, {
+            'document_root': settings.STATIC_ROOT,
+        }),
+    ]
+
+# Serve data files including exercise submissions (range + conditional GET aware)
 urlpatterns += [
-    path('data/<path:path>', serve, {
+    path('data/<path:path>', serve_file, {
         'document_root': settings.DATA_ROOT,
         'show_indexes': False,
     }),
-    path('exercise_submissions/<path:path>', serve, {
+    path('exercise_submissions/<path:path>', serve_file, {
         'document_root': settings.EXERCISE_SUBMISSIONS_ROOT,
         'show_indexes': False,
     }),
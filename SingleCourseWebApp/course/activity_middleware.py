@@ -0,0 +1,33 @@
+from django.contrib import auth
+from django.utils.functional import SimpleLazyObject, empty
+from .shib_middleware import IDENTITY_SESSION_KEY
+from .utils.activity import record_activity
+
+
+class LastSeenMiddleware:
+    """Record authenticated users' activity in the buffer of course/utils/activity.py.
+
+    The user id is taken from the session (or an already loaded
+    ``request.user``), so tracking never forces a user query by itself.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        user_id = self.user_id(request)
+        if user_id is not None:
+            record_activity(int(user_id))
+        return response
+
+    @staticmethod
+    def user_id(request):
+        user = getattr(request, 'user', None)
+        if user is not None and not (isinstance(user, SimpleLazyObject) and user._wrapped is empty):
+            return user.pk if user.is_authenticated else None
+        session = getattr(request, 'session', None)
+        if session is None:
+            return None
+        identity = session.get(IDENTITY_SESSION_KEY)
+        return identity[1] if identity else session.get(auth.SESSION_KEY)
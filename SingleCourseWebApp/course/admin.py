@@ -5,7 +5,7 @@ import os
 from .models import (
     CustomUserModel, Course, Enrollment,
     Module, Lesson, Submission, StudentProfile,
-    InstructorProfile, Exercise, Group, ExerciseMaterial,
+    InstructorProfile, Exercise, Group, GroupMembership, ExerciseMaterial,
     SubmissionFile
 )
 
@@ -119,11 +119,11 @@ class CourseAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
 
 class GroupMemberInline(admin.TabularInline):
-    model = Group.members.through
+    model = GroupMembership
     extra = 1
     verbose_name = "Member"
     verbose_name_plural = "Members"
-    autocomplete_fields = ['customusermodel']
+    autocomplete_fields = ['student']
 
 @admin.register(Group)
 class GroupAdmin(admin.ModelAdmin):
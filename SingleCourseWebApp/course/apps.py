@@ -5,4 +5,7 @@ class CourseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'course'
 
+    def ready(self):
+        from . import signals  # noqa: F401
+
 
@@ -0,0 +1,102 @@
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
+from .models import Course, Enrollment, Group, Lesson
+
+
+class CourseContext:
+    """Per-request facts about the course and the current user's place in it.
+
+    Every attribute is computed on first access and then memoised for the
+    rest of the request, so the enrollment decorator, the view and the
+    template context processor share one set of queries.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self._lessons = {}
+
+    @property
+    def user(self):
+        return self.request.user
+
+    @cached_property
+    def course(self):
+        return Course.objects.active()
+
+    def use_course(self, course_id):
+        """Pin the context to *course_id* (404 if it does not exist) and return the course."""
+        current = self.course  # usually the cached active course, no query
+        if current is not None and current.id == int(course_id):
+            return current
+        self._set_course(get_object_or_404(Course, id=course_id))
+        return self.course
+
+    def lesson(self, lesson_id):
+        """Return the lesson with its module and course (404 if missing); pins the course."""
+        lesson_id = int(lesson_id)
+        if lesson_id not in self._lessons:
+            lesson = get_object_or_404(Lesson.objects.select_related('module__course'), id=lesson_id)
+            self._lessons[lesson_id] = lesson
+            current = self.__dict__.get('course')
+            if current is None or current.id != lesson.module.course_id:
+                self._set_course(lesson.module.course)
+            else:
+                lesson.module.course = current  # one shared instance
+        return self._lessons[lesson_id]
+
+    def _set_course(self, course):
+        self.__dict__['course'] = course
+        for name in ('enrollment', 'group', 'is_instructor'):
+            self.__dict__.pop(name, None)
+
+    @cached_property
+    def enrollment(self):
+        if self.course is None or not self.user.is_authenticated:
+            return None
+        return Enrollment.objects.filter(student=self.user, course=self.course).first()
+
+    @cached_property
+    def group(self):
+        if self.course is None or not self.user.is_authenticated:
+            return None
+        return Group.objects.filter(course=self.course, members=self.user).first()
+
+    @property
+    def is_enrolled(self):
+        return self.enrollment is not None
+
+    @cached_property
+    def is_instructor(self):
+        user = self.user
+        if not user.is_authenticated:
+            return False
+        return user.is_instructor or (self.course is not None and self.course.instructor_id == user.id)
+
+    @property
+    def is_admin(self):
+        return self.user.is_authenticated and self.user.is_superuser
+
+    def require_course(self):
+        if self.course is None:
+            raise Http404("No course")
+        return self.course
+
+
+def get_course_context(request):
+    """Return the request's :class:`CourseContext`, creating it if the middleware did not run."""
+    context = getattr(request, 'course_context', None)
+    if context is None:
+        context = request.course_context = CourseContext(request)
+    return context
+
+
+class CourseContextMiddleware:
+    """Attach a lazy :class:`CourseContext` as ``request.course_context``. Costs no queries by itself."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.course_context = CourseContext(request)
+        return self.get_response(request)
@@ -0,0 +1,103 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from django.conf import settings
+
+# Cookie holding the time (unix seconds) until which the user reads from the primary
+PIN_COOKIE = 'db_primary_until'
+
+# Apps always read from the primary: the session of a fresh login may not have replicated yet
+PRIMARY_APPS = {'sessions'}
+
+_read_alias = ContextVar('replica_read_alias', default=None)
+_writes = ContextVar('replica_request_writes', default=None)
+
+
+def replica_alias():
+    """The configured replica alias, or None when ``REPLICA_DATABASE`` is not in DATABASES."""
+    alias = getattr(settings, 'REPLICA_DATABASE', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+def is_pinned(request):
+    """True while the user's recent write may not have reached the replica yet."""
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def use_replica(view):
+    """Run the reads of *view*'s GET/HEAD requests against the replica.
+
+    Falls back to the primary when no replica is configured, for other
+    methods, and while the user is pinned after a write. Put it below
+    ``login_required`` so the user is still loaded from the primary.
+    """
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        alias = replica_alias()
+        if alias is None or request.method not in ('GET', 'HEAD') or is_pinned(request):
+            return view(request, *args, **kwargs)
+        token = _read_alias.set(alias)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _read_alias.reset(token)
+    return wrapped
+
+
+@contextmanager
+def on_primary():
+    """Read from the primary inside the block, e.g. to fill a shared cache from current data."""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """Send reads inside :func:`use_replica` views to the replica; everything else to ``default``."""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or model._meta.app_label in PRIMARY_APPS:
+            return None
+        if _writes.get():
+            return None  # the request wrote already and must read its own writes
+        return alias
+
+    def db_for_write(self, model, **hints):
+        writes = _writes.get()
+        if writes is not None and model._meta.app_label not in PRIMARY_APPS:
+            writes.append(model._meta.label)
+        return None
+
+
+class ReplicaPinMiddleware:
+    """Pin users who wrote to the primary for ``REPLICA_PIN_SECONDS``.
+
+    Every write the router sees during the request is recorded; if there
+    was one, a short-lived cookie makes :func:`use_replica` views read from
+    the primary until the replica has caught up.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _writes.set([])
+        try:
+            response = self.get_response(request)
+            wrote = bool(_writes.get())
+        finally:
+            _writes.reset(token)
+        if wrote and replica_alias() is not None:
+            seconds = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(
+                PIN_COOKIE, f'{time.time() + seconds:.3f}', max_age=seconds,
+                httponly=True, samesite='Lax', secure=request.is_secure(),
+            )
+        return response
@@ -1,6 +1,7 @@
 from django import forms
 from .models import Exercise, ExerciseMaterial, JupyterLabImage, validate_file_size
 from django.conf import settings
+from .utils.notebook_validation import validate_notebook
 import os
 import re
 
@@ -110,53 +111,45 @@ class JupyterExerciseUploadForm(forms.Form):
     def clean_notebook(self):
         notebook = self.cleaned_data.get('notebook')
         if notebook:
-            print(f"Validating notebook file: {notebook.name}")
             if not notebook.name.endswith('.ipynb'):
                 raise forms.ValidationError("Only Jupyter notebook files (.ipynb) are allowed.")
-            if notebook.size > settings.FILE_UPLOAD_MAX_MEMORY_SIZE:
-                raise forms.ValidationError(f"File size cannot exceed {settings.FILE_UPLOAD_MAX_MEMORY_SIZE/(1024*1024)}MB")
+            validate_notebook(notebook)
         return notebook
 
     def clean_materials(self):
         materials = self.cleaned_data.get('materials', [])
-        print(f"Validating {len(materials)} material files")
         if materials:
             allowed_extensions = ['.py', '.csv', '.json', '.txt', '.dat', '.npy', '.h5', '.pkl']
             for material in materials:
-                print(f"Checking material file: {material.name} ({material.size} bytes)")
                 ext = os.path.splitext(material.name)[1].lower()
                 if ext not in allowed_extensions:
                     raise forms.ValidationError(
                         f"Invalid file type for {material.name}. Allowed types: {', '.join(allowed_extensions)}"
                     )
-                if material.size > settings.FILE_UPLOAD_MAX_MEMORY_SIZE:
+                if material.size > settings.MAX_UPLOAD_SIZE:
                     raise forms.ValidationError(
-                        f"File size cannot exceed {settings.FILE_UPLOAD_MAX_MEMORY_SIZE/(1024*1024)}MB"
+                        f"File size cannot exceed {settings.MAX_UPLOAD_SIZE/(1024*1024)}MB"
                     )
-                print(f"Material file {material.name} passed validation")
         return materials
 
     def clean_jupyterlab_image(self):
         image = self.cleaned_data.get('jupyterlab_image')
         if image:
-            print(f"Validating JupyterLab image: {image.name}")
             valid_extensions = ['.tar', '.tar.gz', '.tgz']
             if not any(image.name.endswith(ext) for ext in valid_extensions):
                 raise forms.ValidationError(
                     "Invalid file format. Please upload a tar or tar.gz file."
                 )
-            if image.size > settings.FILE_UPLOAD_MAX_MEMORY_SIZE:
+            if image.size > settings.MAX_UPLOAD_SIZE:
                 raise forms.ValidationError(
-                    f"File size cannot exceed {settings.FILE_UPLOAD_MAX_MEMORY_SIZE/(1024*1024)}MB"
+                    f"File size cannot exceed {settings.MAX_UPLOAD_SIZE/(1024*1024)}MB"
                 )
-            print(f"JupyterLab image {image.name} passed validation")
         return image
 
     def clean(self):
         cleaned_data = super().clean()
         image = cleaned_data.get('jupyterlab_image')
         version = cleaned_data.get('image_version')
-        print("Running final form validation")
 
         if image and not version:
             raise forms.ValidationError(
@@ -167,5 +160,4 @@ class JupyterExerciseUploadForm(forms.Form):
                 "Please upload a JupyterLab image file."
             )
 
-        print("Form validation completed successfully")
         return cleaned_data 
\ No newline at end of file
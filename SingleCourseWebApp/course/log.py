@@ -0,0 +1,132 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+
+# Attributes every LogRecord has; anything else was passed via ``extra=`` and is logged as a field
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, logger, message, exception and ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'line': record.lineno,
+            'process': record.process,
+            'thread': record.thread,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of DEBUG/INFO records, per logger prefix.
+
+    ``rates`` maps logger names to the share of records to keep, e.g.
+    ``{'course.views': 0.1}``; the longest matching prefix wins and loggers
+    without an entry are not sampled. WARNING and above always pass.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+
+    def rate_for(self, name):
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition('.')[0]
+        return 1.0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        return random.random() < self.rate_for(record.name)
+
+
+class QueueFileHandler(logging.handlers.QueueHandler):
+    """Hand records to a background thread that writes rotated JSON files.
+
+    The request thread only puts the record on a bounded queue. When the
+    queue is full the record is dropped (and counted) instead of blocking;
+    the number of dropped records is logged once the writer catches up.
+    """
+
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=5,
+                 queue_size=10000, console=False):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.dropped = 0
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        targets = [logging.handlers.RotatingFileHandler(
+            filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True
+        )]
+        if console:
+            targets.append(logging.StreamHandler(sys.stderr))
+        formatter = JsonFormatter()
+        for target in targets:
+            target.setFormatter(formatter)
+        self.listener = logging.handlers.QueueListener(self.queue, *targets, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.close)
+        # Threads do not survive fork(); give each forked worker its own writer
+        os.register_at_fork(after_in_child=self._restart_listener)
+
+    def _restart_listener(self):
+        if self.listener is not None:
+            # A fresh queue too: the parent's lock may have been held mid-fork
+            self.queue = self.listener.queue = queue.Queue(maxsize=self.queue.maxsize)
+            self.listener._thread = None
+            self.listener.start()
+
+    def prepare(self, record):
+        # Render message and traceback now; the record must not reference request objects later
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        for key, value in list(vars(record).items()):
+            if key not in _RECORD_ATTRS and not isinstance(value, (str, int, float, bool, type(None))):
+                setattr(record, key, str(value))
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.dropped and self.queue.qsize() < self.queue.maxsize // 2:
+            dropped, self.dropped = self.dropped, 0
+            try:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                    'msg': f'Dropped {dropped} log records while the log queue was full',
+                }))
+            except queue.Full:
+                self.dropped += dropped
+
+    def close(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        super().close()
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from course.utils.activity import flush_last_seen
+
+
+class Command(BaseCommand):
+    help = 'Writes buffered last-seen timestamps from the cache to the user table'
+
+    def handle(self, *args, **options):
+        flushed = flush_last_seen()
+        self.stdout.write(self.style.SUCCESS(f'Updated last-seen for {flushed} users'))
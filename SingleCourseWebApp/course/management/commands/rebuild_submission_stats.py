@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from course.utils.submission_stats import rebuild_submission_stats
+
+
+class Command(BaseCommand):
+    help = 'Recounts the per-exercise submission counters shown on the submissions dashboard'
+
+    def add_arguments(self, parser):
+        parser.add_argument('exercise_ids', nargs='*', type=int, help='Exercises to rebuild (default: all)')
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_submission_stats(options['exercise_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt submission counters for {rebuilt} exercises'))
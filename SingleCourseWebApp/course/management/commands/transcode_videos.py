@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from course.models import Lesson
+from course.utils.video import stale_transcodes, transcode_lesson_video
+
+
+class Command(BaseCommand):
+    help = (
+        'Transcodes lesson videos into HLS renditions. By default: lessons without a ready ladder '
+        'whose job is not running, including jobs left in "processing" by a restarted worker. '
+        'Run it periodically (e.g. from cron) to recover such lessons.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Re-transcode every video lesson')
+        parser.add_argument('--lesson', type=int, help='Only transcode the lesson with this ID')
+
+    def handle(self, *args, **options):
+        lessons = Lesson.objects.filter(lesson_type='video').exclude(video_file='').exclude(video_file__isnull=True)
+        if options['lesson']:
+            lessons = lessons.filter(id=options['lesson'])
+        elif not options['all']:
+            # Jobs that still heartbeat belong to a live worker; leave them alone
+            lessons = lessons.exclude(video_status__in=('ready', 'pending', 'processing')) | lessons.filter(
+                id__in=stale_transcodes().values('id')
+            )
+
+        for lesson in lessons:
+            self.stdout.write(f'Transcoding "{lesson.title}" ...')
+            transcode_lesson_video(lesson.id, lesson.video_file.name)
+            lesson.refresh_from_db(fields=['video_status'])
+            style = self.style.SUCCESS if lesson.video_status == 'ready' else self.style.ERROR
+            self.stdout.write(style(f'  {lesson.video_status}'))
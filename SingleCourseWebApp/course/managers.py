@@ -1,7 +1,14 @@
 from django.contrib.auth.models import BaseUserManager
+from django.core.cache import cache
+from django.db import models
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
+from .db_router import on_primary
+from .utils.versioning import current_version, bump_version
+
+ACTIVE_COURSE_VERSION_KEY = 'active_course_version'
+ACTIVE_COURSE_TIMEOUT = 60 * 60  # upper bound for a missed invalidation
 
 class CustomUserManager(BaseUserManager):
     def email_validation(self, email):
@@ -54,4 +61,25 @@ class CustomUserManager(BaseUserManager):
         
         user = self.create_user(clean_email, first_name, last_name, password, **extra_fields)
         user.save()
-        return user
\ No newline at end of file
+        return user
+
+
+class CourseManager(models.Manager):
+    def active(self):
+        """Return the course this installation serves (or None), with its JupyterLab image.
+
+        Cached in the shared cache under a versioned key; saving or deleting a
+        Course or JupyterLabImage bumps the version (see course/signals.py).
+        """
+        key = f'active_course_v{current_version(ACTIVE_COURSE_VERSION_KEY)}'
+        cached = cache.get(key)
+        if cached is None:
+            # Wrapped in a tuple so "no course yet" is cached as well; read from
+            # the primary so a lagging replica is never cached as current
+            with on_primary():
+                cached = (self.select_related('jupyterlab_image').first(),)
+            cache.set(key, cached, ACTIVE_COURSE_TIMEOUT)
+        return cached[0]
+
+    def invalidate_active(self):
+        bump_version(ACTIVE_COURSE_VERSION_KEY)
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.3 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0026_alter_course_difficulty_level_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='video_status',
+            field=models.CharField(choices=[('none', 'No Video'), ('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='none', help_text='State of the adaptive-bitrate (HLS) transcoding of the video', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_playlist',
+            field=models.FileField(blank=True, help_text='HLS master playlist generated from the uploaded video', max_length=255, null=True, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='lesson',
+            name='video_poster',
+            field=models.FileField(blank=True, help_text='Poster frame extracted from the uploaded video', max_length=255, null=True, upload_to=''),
+        ),
+    ]
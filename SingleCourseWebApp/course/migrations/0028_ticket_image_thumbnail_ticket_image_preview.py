@@ -0,0 +1,23 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0027_lesson_video_status_lesson_video_playlist_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='image_thumbnail',
+            field=models.FileField(blank=True, editable=False, help_text='Downscaled WebP thumbnail generated from the uploaded image', max_length=255, null=True, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='image_preview',
+            field=models.FileField(blank=True, editable=False, help_text='Compressed JPEG variant attached to the notification email', max_length=255, null=True, upload_to=''),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0029_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customusermodel',
+            name='last_seen',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
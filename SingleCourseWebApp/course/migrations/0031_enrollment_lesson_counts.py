@@ -0,0 +1,48 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:05
+
+from django.db import migrations, models
+from django.db.models import Count, FloatField, OuterRef, Subquery
+from django.db.models.functions import Cast, Coalesce
+
+
+def fill_lesson_counts(apps, schema_editor):
+    """Count completed lessons for existing enrollments and derive progress."""
+    Course = apps.get_model('course', 'Course')
+    Enrollment = apps.get_model('course', 'Enrollment')
+    Lesson = apps.get_model('course', 'Lesson')
+    LessonProgress = apps.get_model('course', 'LessonProgress')
+    db = schema_editor.connection.alias
+
+    for course in Course.objects.using(db):
+        total = Lesson.objects.using(db).filter(module__course=course).count()
+        completed = Coalesce(Subquery(
+            LessonProgress.objects.filter(
+                student_id=OuterRef('student_id'), lesson__module__course=course, is_completed=True
+            ).order_by().values('student_id').annotate(count=Count('id')).values('count')
+        ), 0)
+        Enrollment.objects.using(db).filter(course=course).update(
+            completed_lessons=completed,
+            total_lessons=total,
+            progress=Cast(completed, FloatField()) * 100.0 / total if total else 0.0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0030_customusermodel_last_seen'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollment',
+            name='completed_lessons',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='total_lessons',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_lesson_counts, migrations.RunPython.noop),
+    ]
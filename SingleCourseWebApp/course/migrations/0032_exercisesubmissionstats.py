@@ -0,0 +1,56 @@
+# Generated by Django 5.1.3 on 2026-10-18 17:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_submission_stats(apps, schema_editor):
+    """Count groups per exercise by their latest submission (as rebuild_submission_stats does)."""
+    Exercise = apps.get_model('course', 'Exercise')
+    ExerciseSubmissionStats = apps.get_model('course', 'ExerciseSubmissionStats')
+    Group = apps.get_model('course', 'Group')
+    Submission = apps.get_model('course', 'Submission')
+    db = schema_editor.connection.alias
+
+    group_of = dict(Group.members.through.objects.using(db).values_list('customusermodel_id', 'group_id'))
+    latest = {}
+    for row in Submission.objects.using(db).order_by().values_list(
+        'exercise_id', 'student_id', 'submitted_at', 'id', 'score', 'passed'
+    ).iterator():
+        group_id = group_of.get(row[1])
+        if group_id is None:
+            continue
+        key = (row[0], group_id)
+        if key not in latest or row[2:4] > latest[key][:2]:
+            latest[key] = row[2:]
+
+    stats = {pk: ExerciseSubmissionStats(exercise_id=pk) for pk in Exercise.objects.using(db).values_list('id', flat=True)}
+    for (exercise_id, _), (submitted_at, _, score, passed) in latest.items():
+        row = stats[exercise_id]
+        row.groups_submitted += 1
+        row.groups_pending += score is None
+        row.groups_passed += bool(score is not None and passed)
+        if row.last_submission_at is None or submitted_at > row.last_submission_at:
+            row.last_submission_at = submitted_at
+    ExerciseSubmissionStats.objects.using(db).bulk_create(stats.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0031_enrollment_lesson_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExerciseSubmissionStats',
+            fields=[
+                ('exercise', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='submission_stats', serialize=False, to='course.exercise')),
+                ('groups_submitted', models.PositiveIntegerField(default=0)),
+                ('groups_pending', models.PositiveIntegerField(default=0)),
+                ('groups_passed', models.PositiveIntegerField(default=0)),
+                ('last_submission_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(fill_submission_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0032_exercisesubmissionstats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['exercise', 'submitted_at', 'id'], name='course_subm_exercis_f35f0a_idx'),
+        ),
+    ]
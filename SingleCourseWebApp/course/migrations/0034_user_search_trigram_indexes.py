@@ -0,0 +1,42 @@
+# Generated by Django 5.1.3 on 2026-10-18 19:05
+
+from django.db import migrations
+
+# The admin user directory matches search terms with icontains, which
+# PostgreSQL compiles to UPPER(column::text) LIKE UPPER('%term%'); trigram
+# indexes over the same expressions serve those matches. Other backends
+# (SQLite in development) have no trigram support and keep scanning.
+TRIGRAM_INDEXES = {
+    'course_user_first_name_trgm': 'first_name',
+    'course_user_last_name_trgm': 'last_name',
+    'course_user_email_trgm': 'email',
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON course_customusermodel '
+            f'USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0033_submission_course_subm_exercis_f35f0a_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
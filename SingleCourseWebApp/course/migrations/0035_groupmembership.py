@@ -0,0 +1,84 @@
+# Generated by Django 5.1.3 on 2026-10-18 21:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_memberships(apps, schema_editor):
+    """Move the rows of the implicit M2M table into GroupMembership.
+
+    Where a student ended up in several groups of one course (the old check
+    ran in Python only), the membership in the oldest group is kept.
+    """
+    Group = apps.get_model('course', 'Group')
+    GroupMembership = apps.get_model('course', 'GroupMembership')
+    db = schema_editor.connection.alias
+
+    seen = set()
+    memberships = []
+    for group_id, course_id, student_id in Group.members.through.objects.using(db).order_by('group_id', 'id').values_list(
+        'group_id', 'group__course_id', 'customusermodel_id'
+    ).iterator():
+        if (course_id, student_id) in seen:
+            continue
+        seen.add((course_id, student_id))
+        memberships.append(GroupMembership(group_id=group_id, course_id=course_id, student_id=student_id))
+    GroupMembership.objects.using(db).bulk_create(memberships, batch_size=1000)
+
+
+def restore_memberships(apps, schema_editor):
+    Group = apps.get_model('course', 'Group')
+    GroupMembership = apps.get_model('course', 'GroupMembership')
+    db = schema_editor.connection.alias
+
+    Group.members.through.objects.using(db).bulk_create(
+        [
+            Group.members.through(group_id=group_id, customusermodel_id=student_id)
+            for group_id, student_id in GroupMembership.objects.using(db).values_list('group_id', 'student_id').iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0034_user_search_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('course', models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='group_memberships', to='course.course')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='course.group')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_memberships', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Group membership',
+                'verbose_name_plural': 'Group memberships',
+                'constraints': [models.UniqueConstraint(fields=('course', 'student'), name='unique_group_per_student_and_course')],
+            },
+        ),
+        migrations.RunPython(copy_memberships, restore_memberships),
+        # Django cannot switch an M2M to an explicit through model in place:
+        # drop the old table and point the field at GroupMembership in the state only
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RemoveField(
+                    model_name='group',
+                    name='members',
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='group',
+                    name='members',
+                    field=models.ManyToManyField(blank=True, limit_choices_to={'is_student': True}, related_name='course_groups', through='course.GroupMembership', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+        ),
+    ]
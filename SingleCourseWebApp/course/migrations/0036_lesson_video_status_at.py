@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0035_groupmembership'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='video_status_at',
+            field=models.DateTimeField(blank=True, help_text='Last change of video_status; refreshed before every rendition while processing', null=True),
+        ),
+    ]
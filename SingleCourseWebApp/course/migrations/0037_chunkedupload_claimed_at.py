@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-19 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0036_lesson_video_status_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chunkedupload',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, help_text='Set when a save attaches the finished upload; rolled back with that save', null=True),
+        ),
+    ]
@@ -1,10 +1,11 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.utils.translation import gettext_lazy as _
-from .managers import CustomUserManager
+from .managers import CustomUserManager, CourseManager
 from datetime import timedelta
 from django.core.exceptions import ValidationError
 import os
+import uuid
 
 def validate_file_size(value):
     filesize = value.size
@@ -103,6 +104,8 @@ class CustomUserModel(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=False)
     date_joined = models.DateTimeField(auto_now_add=True)
     last_login = models.DateTimeField(auto_now=True)
+    # Updated in batches from the activity buffer (see course/utils/activity.py)
+    last_seen = models.DateTimeField(null=True, blank=True, editable=False)
     is_instructor = models.BooleanField(default=False)
     is_student = models.BooleanField(default=True)
 
@@ -183,6 +186,8 @@ class Course(models.Model):
         help_text="Enrollment key required for students to join the course"
     )
 
+    objects = CourseManager()
+
     class Meta:
         verbose_name = _("Course")
         verbose_name_plural = _("Courses")
@@ -207,11 +212,17 @@ class Enrollment(models.Model):
     )
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='enrollments')
     enrolled_at = models.DateTimeField(auto_now_add=True)
+    # Percent of the course's lessons completed; kept current by complete_lesson
+    # and recomputed when lessons are added or removed (see utils/progress.py)
     progress = models.FloatField(default=0.0)
+    completed_lessons = models.PositiveIntegerField(default=0)
+    total_lessons = models.PositiveIntegerField(default=0)
 
     def save(self, *args, **kwargs):
-        if not self.course_id and Course.objects.exists():
-            self.course = Course.objects.first()
+        if not self.course_id:
+            course = Course.objects.active()
+            if course:
+                self.course = course
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -271,6 +282,13 @@ class Lesson(models.Model):
         ('reading', 'Reading Material'),
         ('exercise', 'Exercise'),
     )
+    VIDEO_STATUS_CHOICES = (
+        ('none', 'No Video'),
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    )
     
     module = models.ForeignKey(Module, on_delete=models.CASCADE, related_name='lessons')
     title = models.CharField(max_length=255)
@@ -289,6 +307,29 @@ class Lesson(models.Model):
         help_text="Upload video content for the lesson",
         validators=[validate_file_size]
     )
+    video_status = models.CharField(
+        max_length=20,
+        choices=VIDEO_STATUS_CHOICES,
+        default='none',
+        help_text="State of the adaptive-bitrate (HLS) transcoding of the video"
+    )
+    video_status_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="Last change of video_status; refreshed before every rendition while processing"
+    )
+    video_playlist = models.FileField(
+        blank=True,
+        null=True,
+        max_length=255,
+        help_text="HLS master playlist generated from the uploaded video"
+    )
+    video_poster = models.FileField(
+        blank=True,
+        null=True,
+        max_length=255,
+        help_text="Poster frame extracted from the uploaded video"
+    )
     lesson_content = models.TextField(blank=True, null=True, help_text="Main lesson content/text material")
 
     class Meta:
@@ -408,6 +449,7 @@ class Group(models.Model):
     )
     members = models.ManyToManyField(
         CustomUserModel,
+        through='GroupMembership',
         related_name='course_groups',
         limit_choices_to={'is_student': True},
         blank=True,
@@ -448,33 +490,6 @@ class Group(models.Model):
             number += 1
         return number
 
-    def clean(self):
-        # Skip member validation for new groups (not yet saved)
-        if not self.pk:
-            return
-            
-        if self.members.count() > self.course.max_members:
-            raise ValidationError({
-                'members': f"Group cannot have more than {self.course.max_members} members"
-            })
-        
-        # Check for existing memberships in ANY group for this course
-        for member in self.members.all():
-            other_groups = Group.objects.filter(
-                course=self.course,
-                members=member
-            ).exclude(pk=self.pk)
-            
-            if other_groups.exists():
-                raise ValidationError({
-                    'members': f'Student {member.get_full_name()} is already in another group for this course'
-                })
-            
-            if not self.course.enrollments.filter(student=member).exists():
-                raise ValidationError({
-                    'members': f'Student {member.get_full_name()} is not enrolled in the course'
-                })
-
     def save(self, *args, **kwargs):
         # Auto-assign group number if not set
         if self.group_number is None:
@@ -487,35 +502,73 @@ class Group(models.Model):
     def member_count(self):
         return self.members.count()
 
-    def can_add_member(self, student):
-        """Check if a student can be added to this group"""
-        if self.members.count() >= self.course.max_members:
-            return False, "Group is full"
-        
-        if student.course_groups.filter(course=self.course).exists():
-            return False, "Student is already in another group"
-        
-        if not self.course.enrollments.filter(student=student).exists():
-            return False, "Student is not enrolled in the course"
-        
-        return True, None
-
     def add_member(self, student):
-        """Add a member to the group with validation"""
-        can_add, error = self.can_add_member(student)
-        if not can_add:
-            raise ValidationError(error)
-        
-        self.members.add(student)
-        self.save()
+        """Add a member to the group with validation.
+
+        "At most one group per course" is the unique (course, student)
+        constraint of GroupMembership, so the insert itself is the check. The
+        group row is locked while counting so concurrent joins cannot overfill it.
+        """
+        if not Enrollment.objects.filter(course_id=self.course_id, student=student).exists():
+            raise ValidationError("Student is not enrolled in the course", code='not_enrolled')
+
+        with transaction.atomic():
+            max_members = (
+                Group.objects.select_for_update(of=('self',)).filter(pk=self.pk)
+                .values_list('course__max_members', flat=True).get()
+            )
+            if self.memberships.count() >= max_members:
+                raise ValidationError("Group is full", code='group_full')
+            try:
+                GroupMembership.objects.create(group=self, course_id=self.course_id, student=student)
+            except IntegrityError:
+                # Leaving the block rolls the failed insert back
+                raise ValidationError("Student is already in another group", code='in_other_group')
 
     def remove_member(self, student):
         """Remove a member from the group"""
-        if student not in self.members.all():
+        deleted, _ = self.memberships.filter(student=student).delete()
+        if not deleted:
             raise ValidationError("Student is not a member of this group")
-        
-        self.members.remove(student)
-        self.save()
+
+
+class GroupMembership(models.Model):
+    """A student's membership in a group.
+
+    ``course`` repeats ``group.course`` so the database can enforce that a
+    student is in at most one group per course.
+    """
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name='memberships')
+    student = models.ForeignKey(CustomUserModel, on_delete=models.CASCADE, related_name='group_memberships')
+    course = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name='group_memberships', editable=False,
+        db_index=False,  # the unique (course, student) index covers lookups by course
+    )
+
+    class Meta:
+        verbose_name = _("Group membership")
+        verbose_name_plural = _("Group memberships")
+        constraints = [
+            models.UniqueConstraint(fields=['course', 'student'], name='unique_group_per_student_and_course'),
+        ]
+
+    def __str__(self):
+        return f"{self.student} in group {self.group_id}"
+
+    def clean(self):
+        # Forms leave out ``course``, so Django skips the (course, student)
+        # constraint in validate_constraints; check it here for a readable error
+        if self.group_id is not None:
+            self.course_id = self.group.course_id
+        if self.student_id is not None and GroupMembership.objects.filter(
+            course_id=self.course_id, student_id=self.student_id
+        ).exclude(pk=self.pk).exists():
+            raise ValidationError({'student': 'Student is already in another group for this course'})
+
+    def save(self, *args, **kwargs):
+        if self.course_id is None:
+            self.course_id = self.group.course_id
+        super().save(*args, **kwargs)
 
 # Submission Model
 class Submission(models.Model):
@@ -530,6 +583,7 @@ class Submission(models.Model):
         ordering = ['-submitted_at']
         indexes = [
             models.Index(fields=['exercise', 'student']),
+            models.Index(fields=['exercise', 'submitted_at', 'id']),  # keyset pages of exercise_submissions
             models.Index(fields=['submitted_at']),
             models.Index(fields=['passed']),
         ]
@@ -540,11 +594,10 @@ class Submission(models.Model):
     def clean(self):
         super().clean()
         # Verify student is in a group
-        group = Group.objects.filter(
-            course=self.exercise.lesson.module.course,
-            members=self.student
-        ).first()
-        if not group:
+        if not GroupMembership.objects.filter(
+            course_id=self.exercise.lesson.module.course_id,
+            student=self.student
+        ).exists():
             raise ValidationError("Student must be in a group to submit exercises")
             
     def save(self, *args, **kwargs):
@@ -574,6 +627,25 @@ class SubmissionFile(models.Model):
     def __str__(self):
         return f"File {self.file.name} for {self.submission}"
 
+class ExerciseSubmissionStats(models.Model):
+    """Per-exercise counters for the submissions dashboard.
+
+    A group counts by its latest submission: pending while that is ungraded,
+    passed once it is graded as passed. Kept current by submit_exercise and
+    grade_submission (see utils/submission_stats.py); rebuild with
+    ``manage.py rebuild_submission_stats``.
+    """
+    exercise = models.OneToOneField(
+        Exercise, on_delete=models.CASCADE, primary_key=True, related_name='submission_stats'
+    )
+    groups_submitted = models.PositiveIntegerField(default=0)
+    groups_pending = models.PositiveIntegerField(default=0)
+    groups_passed = models.PositiveIntegerField(default=0)
+    last_submission_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Submission stats for exercise {self.exercise_id}"
+
 # Lesson Progress Model
 class LessonProgress(models.Model):
     student = models.ForeignKey(
@@ -622,6 +694,20 @@ class Ticket(models.Model):
         help_text="Optional image to help describe the issue",
         validators=[validate_file_size]
     )
+    image_thumbnail = models.FileField(
+        null=True,
+        blank=True,
+        editable=False,
+        max_length=255,
+        help_text="Downscaled WebP thumbnail generated from the uploaded image"
+    )
+    image_preview = models.FileField(
+        null=True,
+        blank=True,
+        editable=False,
+        max_length=255,
+        help_text="Compressed JPEG variant attached to the notification email"
+    )
     status = models.CharField(
         max_length=20,
         choices=STATUS_CHOICES,
@@ -654,3 +740,48 @@ class Ticket(models.Model):
         """Check if a user can edit the ticket status."""
         return user.is_staff or user.is_instructor
 
+
+class ChunkedUpload(models.Model):
+    """A resumable upload in progress (see utils/uploads.py).
+
+    Chunks are written straight into a staging file under
+    ``RESUMABLE_UPLOAD_DIR``; ``received`` holds one '0'/'1' flag per chunk so
+    chunks can arrive in parallel and out of order.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        CustomUserModel,
+        on_delete=models.CASCADE,
+        related_name='chunked_uploads'
+    )
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField(help_text="Total size announced by the client (Upload-Length)")
+    chunk_size = models.PositiveIntegerField()
+    received = models.TextField(help_text="Per-chunk receipt flags")
+    claimed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Set when a save attaches the finished upload; rolled back with that save"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Upload {self.id} ({self.filename})"
+
+    @property
+    def is_complete(self):
+        return '0' not in self.received
+
+    @property
+    def offset(self):
+        """Bytes received contiguously from the start of the file (tus Upload-Offset)."""
+        first_missing = self.received.find('0')
+        if first_missing == -1:
+            return self.size
+        return first_missing * self.chunk_size
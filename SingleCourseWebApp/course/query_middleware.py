@@ -0,0 +1,54 @@
+import logging
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """``execute_wrapper`` that counts queries and their wall time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class QueryCountMiddleware:
+    """Report the number of SQL queries and total DB time of every request.
+
+    Always logged (subject to sampling) to ``course.query_middleware``, at
+    WARNING once a request runs more than ``QUERY_COUNT_WARNING`` queries.
+    With ``QUERY_COUNT_HEADERS`` on, the numbers are also sent as
+    ``X-DB-Queries`` and ``Server-Timing`` response headers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+
+        duration_ms = stats.duration * 1000
+        level = logging.WARNING if stats.count > settings.QUERY_COUNT_WARNING else logging.INFO
+        logger.log(
+            level, "%s %s: %d queries in %.1f ms", request.method, request.path, stats.count, duration_ms,
+            extra={'db_queries': stats.count, 'db_time_ms': round(duration_ms, 1), 'status': response.status_code},
+        )
+        if settings.QUERY_COUNT_HEADERS:
+            response['X-DB-Queries'] = str(stats.count)
+            response['Server-Timing'] = f'db;dur={duration_ms:.1f};desc="{stats.count} queries"'
+        return response
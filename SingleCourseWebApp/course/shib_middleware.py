@@ -7,9 +7,27 @@ from django.core.exceptions import ImproperlyConfigured
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError
 from django.contrib import auth
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+import hashlib
+import time
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+# Session key holding [email, user_id, expires_at] for the Shibboleth identity
+IDENTITY_SESSION_KEY = '_shib_identity'
+
+
+def identity_cache_key(email):
+    return 'shib_identity_' + hashlib.sha256(email.encode()).hexdigest()
+
+
+def forget_identity(email):
+    """Drop the shared email -> user id mapping (called from the user signals)."""
+    if email:
+        cache.delete(identity_cache_key(email))
+
 class CustomShibbolethMiddleware(ShibbolethRemoteUserMiddleware):
     header = 'HTTP_MAIL'
     
@@ -29,14 +47,13 @@ class CustomShibbolethMiddleware(ShibbolethRemoteUserMiddleware):
             email = request.META.get(self.header)
             if email:
                 # Try to get existing user first
-                try:
-                    user = User.objects.get(email=email)
-                    logger.debug(f"Found existing user with email {email}")
-                    request.user = user
-                    #auth.login(request, user)
+                user_id = self.resolve_user_id(request, email)
+                if user_id is not None:
+                    if request.session.get(auth.SESSION_KEY) != str(user_id):
+                        request.user = SimpleLazyObject(lambda: self.load_user(request, user_id))
+                    # else: AuthenticationMiddleware already loads this user from the session
                     return None
-                except User.DoesNotExist:
-                    logger.debug(f"No user found with email {email}, will create new user")
+                logger.debug(f"No user found with email {email}, will create new user")
                     
             # Call parent's process_request if no existing user found
             result = super().process_request(request)
@@ -61,6 +78,37 @@ class CustomShibbolethMiddleware(ShibbolethRemoteUserMiddleware):
             logger.exception("Error in CustomShibbolethMiddleware")
             return redirect(settings.LOGIN_URL)
 
+    def resolve_user_id(self, request, email):
+        """Map the Shibboleth email to a user id without touching the database.
+
+        The mapping is kept in the session and in the shared cache for
+        ``SHIBBOLETH_IDENTITY_TTL`` seconds. User saves and deletes clear the
+        cache entry; the session copy is only trusted until it expires, so a
+        renamed or deleted account is picked up within one TTL.
+        """
+        identity = request.session.get(IDENTITY_SESSION_KEY)
+        if identity and identity[0] == email and identity[2] > time.time():
+            return identity[1]
+
+        key = identity_cache_key(email)
+        user_id = cache.get(key)
+        if user_id is None:
+            user_id = User.objects.filter(email=email).values_list('pk', flat=True).first()
+            if user_id is None:
+                return None
+            cache.set(key, user_id, settings.SHIBBOLETH_IDENTITY_TTL)
+            logger.debug(f"Found existing user with email {email}")
+        request.session[IDENTITY_SESSION_KEY] = [email, user_id, time.time() + settings.SHIBBOLETH_IDENTITY_TTL]
+        return user_id
+
+    def load_user(self, request, user_id):
+        """Fetch the user on first access to ``request.user``; stale ids give an anonymous user."""
+        user = User.objects.filter(pk=user_id).first()
+        if user is None:
+            request.session.pop(IDENTITY_SESSION_KEY, None)
+            return AnonymousUser()
+        return user
+
     def clean_username(self, username, request):
         """Clean the username before using it"""
         logger.debug(f"Cleaning username: {username}")
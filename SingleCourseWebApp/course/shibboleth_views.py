@@ -129,7 +129,7 @@ class ShibbolethDebugView(TemplateView):
         debug_info['Authentication Flow Analysis'] = auth_flow
 
         # Log the debug information
-        logger.info("Authentication Debug Information:\n%s", pformat(debug_info))
+        logger.debug("Authentication Debug Information:\n%s", pformat(debug_info))
 
         return render(request, self.template_name, {'debug_info': debug_info})
 
@@ -143,40 +143,40 @@ class ShibbolethLoginView(TemplateView):
     def get(self, request, *args, **kwargs):
         try:
             # Enhanced logging about the incoming request
-            logger.info("==== ShibbolethLoginView GET Request ====")
-            logger.info(f"Path: {request.path}")
-            logger.info(f"GET params: {request.GET}")
-            logger.info(f"Headers: {dict(request.headers)}")
-            logger.info(f"User authenticated: {request.user.is_authenticated}")
+            logger.debug("==== ShibbolethLoginView GET Request ====")
+            logger.debug(f"Path: {request.path}")
+            logger.debug(f"GET params: {request.GET}")
+            logger.debug(f"Headers: {dict(request.headers)}")
+            logger.debug(f"User authenticated: {request.user.is_authenticated}")
             
             # Log detailed Shibboleth headers
             shibboleth_headers = {
                 key: value for key, value in request.META.items() 
                 if key.startswith(('HTTP_SHIB', 'REMOTE_USER', 'Shib-', 'MAIL'))
             }
-            logger.info(f"Shibboleth headers: {shibboleth_headers}")
+            logger.debug(f"Shibboleth headers: {shibboleth_headers}")
             
             # Log middleware and settings info
             User = get_user_model()
-            logger.info(f"Using header: {getattr(settings, 'SHIBBOLETH_ATTRIBUTE_MAP', {}).get('REMOTE_USER', {}).get('HTTP_HEADER', 'HTTP_MAIL')}")
+            logger.debug(f"Using header: {getattr(settings, 'SHIBBOLETH_ATTRIBUTE_MAP', {}).get('REMOTE_USER', {}).get('HTTP_HEADER', 'HTTP_MAIL')}")
             
             # Check if user exists with the email in headers
             email = request.META.get('HTTP_MAIL', '')
             if email:
-                logger.info(f"Found email in headers: {email}")
+                logger.debug(f"Found email in headers: {email}")
                 user_exists = User.objects.filter(email=email).exists()
-                logger.info(f"User exists with this email: {user_exists}")
+                logger.debug(f"User exists with this email: {user_exists}")
                 if user_exists:
                     user = User.objects.get(email=email)
-                    logger.info(f"Found user: id={user.id}, username={user.username}, is_active={user.is_active}")
+                    logger.debug(f"Found user: id={user.id}, username={user.username}, is_active={user.is_active}")
             else:
-                logger.info("No email found in HTTP_MAIL header")
+                logger.debug("No email found in HTTP_MAIL header")
             
             # Check if path is exempt from Shibboleth
             exempt_paths = getattr(settings, 'SHIBBOLETH_EXEMPT_PATHS', [])
             is_exempt = any(request.path.startswith(path) for path in exempt_paths)
-            logger.info(f"Path is exempt from Shibboleth: {is_exempt}")
-            logger.info(f"Exempt paths: {exempt_paths}")
+            logger.debug(f"Path is exempt from Shibboleth: {is_exempt}")
+            logger.debug(f"Exempt paths: {exempt_paths}")
 
             # Use the direct Shibboleth.sso handler
             shibboleth_login_url = '/Shibboleth.sso/Login'
@@ -331,6 +331,6 @@ class ShibbolethRequestDebugView(TemplateView):
         debug_info['Process Request Simulation'] = process_steps
         
         # Log the debug information
-        logger.info("Process Request Debug Information:\n%s", pformat(debug_info))
+        logger.debug("Process Request Debug Information:\n%s", pformat(debug_info))
         
         return render(request, self.template_name, {'debug_info': debug_info})
\ No newline at end of file
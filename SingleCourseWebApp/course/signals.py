@@ -0,0 +1,104 @@
+from functools import partial
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from .models import Course, Enrollment, GroupMembership, JupyterLabImage, Module, Lesson, Exercise, Submission
+from .shib_middleware import forget_identity
+from .utils.outline import invalidate_course_outline
+from .utils.progress import recompute_progress, invalidate_progress_matrix
+from .utils.submission_stats import invalidate_submission_statistics
+
+
+def on_commit_once(func, *args, origin=None):
+    """
+    ``transaction.on_commit(lambda: func(*args))``, once per delete.
+
+    A delete sends post_delete for every row it cascades to, all with the
+    same *origin*; only the first of them queues the callback. The origin
+    remembers what it has queued until the callback runs. Saves pass no
+    origin and always queue it.
+    """
+    if origin is None:
+        transaction.on_commit(partial(func, *args))
+        return
+    key = (func, args)
+    queued = origin.__dict__.setdefault('_queued_on_commit', set())
+    if key in queued:
+        return
+    queued.add(key)
+
+    def callback():
+        queued.discard(key)
+        func(*args)
+
+    transaction.on_commit(callback)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    # last_login and similar partial saves cannot change who an email belongs to
+    if update_fields is None or 'email' in update_fields:
+        forget_identity(instance.email)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def user_deleted(sender, instance, **kwargs):
+    forget_identity(instance.email)
+
+
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=JupyterLabImage)
+def course_changed(sender, origin=None, **kwargs):
+    # After commit, so no request can re-cache the old row under the new version
+    on_commit_once(Course.objects.invalidate_active, origin=origin)
+
+
+@receiver([post_save, post_delete], sender=Module)
+@receiver([post_save, post_delete], sender=Lesson)
+@receiver([post_save, post_delete], sender=Exercise)
+def outline_changed(sender, origin=None, **kwargs):
+    on_commit_once(invalidate_course_outline, origin=origin)
+
+
+@receiver(post_save, sender=Lesson)
+def lesson_created(sender, instance, created, **kwargs):
+    # Edits of an existing lesson leave every enrollment's counts unchanged
+    if created:
+        transaction.on_commit(partial(recompute_progress, instance.module.course_id))
+
+
+@receiver(post_delete, sender=Lesson)
+def lesson_deleted(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Course):
+        return  # its enrollments go with it
+    if isinstance(origin, Module):
+        course_id = origin.course_id  # a module cascade needs no lookup per lesson
+    elif Lesson.module.is_cached(instance):
+        course_id = instance.module.course_id
+    else:
+        course_id = Module.objects.filter(pk=instance.module_id).values_list('course_id', flat=True).first()
+    if course_id is not None:
+        on_commit_once(recompute_progress, course_id, origin=origin)
+
+
+@receiver(post_save, sender=Enrollment)
+def enrollment_created(sender, created, **kwargs):
+    # Counter updates go through .update() and never get here
+    if created:
+        transaction.on_commit(invalidate_progress_matrix)
+
+
+@receiver(post_delete, sender=Enrollment)
+def enrollment_deleted(sender, origin=None, **kwargs):
+    on_commit_once(invalidate_progress_matrix, origin=origin)
+
+
+@receiver(post_save, sender=Submission)
+@receiver(post_delete, sender=Submission)
+@receiver([post_save, post_delete], sender=GroupMembership)
+@receiver(m2m_changed, sender=GroupMembership)
+def submission_statistics_changed(sender, origin=None, **kwargs):
+    # Grades are written with save(); group membership decides who a score counts for.
+    # Memberships are created by Group.add_member (post_save) or members.add (m2m_changed)
+    on_commit_once(invalidate_submission_statistics, origin=origin)
@@ -4,6 +4,65 @@
  */
 
 (() => {
+    const USERS_URL = '/course/admin/users/';
+    const ROLE_LABELS = { admin: 'Administrator', instructor: 'Dozent', student: 'Student' };
+    const ROLE_BADGES = {
+        admin: '<span class="badge bg-primary">Admin</span>',
+        instructor: '<span class="badge bg-info">Dozent</span>',
+        student: '<span class="badge bg-success">Student</span>'
+    };
+
+    function escapeHtml(value) {
+        return String(value)
+            .replace(/&/g, '&amp;')
+            .replace(/</g, '&lt;')
+            .replace(/>/g, '&gt;')
+            .replace(/"/g, '&quot;')
+            .replace(/'/g, '&#039;');
+    }
+
+    function debounce(callback, delay = 300) {
+        let timer = null;
+        return (...args) => {
+            clearTimeout(timer);
+            timer = setTimeout(() => callback(...args), delay);
+        };
+    }
+
+    /**
+     * Pages through the user directory API. load(true) starts over with the
+     * current params(); load(false) fetches the page after the last one.
+     * Responses to superseded requests are ignored.
+     */
+    class UserPager {
+        constructor(params, onPage) {
+            this.params = params;
+            this.onPage = onPage;
+            this.next = null;
+            this.request = 0;
+        }
+
+        async load(reset) {
+            const query = new URLSearchParams(this.params());
+            if (!reset && this.next) {
+                query.set('after', this.next);
+            }
+            const request = ++this.request;
+            const response = await fetch(`${USERS_URL}?${query}`, {
+                headers: { 'Accept': 'application/json' }
+            });
+            const data = await response.json();
+            if (request !== this.request) {
+                return;
+            }
+            if (!data.success) {
+                throw new Error(data.error || `HTTP error! status: ${response.status}`);
+            }
+            this.next = data.next;
+            this.onPage(data.users, reset, Boolean(data.next));
+        }
+    }
+
     class AdminDashboard {
         constructor() {
             // Wait for DOM to be ready
@@ -32,15 +91,21 @@
             this.csrfToken = csrfInput.value;
             
             this.initializeEventListeners();
-            this.initializeSearch();
+            this.initializeUserTable();
             this.initializeEmailForm();
         }
 
         initializeEventListeners() {
-            // Role change buttons
-            document.querySelectorAll('.change-role').forEach(button => {
-                button.addEventListener('click', (e) => this.handleRoleChange(e));
-            });
+            // Role change and delete buttons; the rows are loaded later, so listen on the table
+            const usersTable = document.getElementById('usersTable');
+            if (usersTable) {
+                usersTable.addEventListener('click', (e) => {
+                    const roleButton = e.target.closest('.change-role');
+                    const deleteButton = e.target.closest('.delete-user');
+                    if (roleButton) this.handleRoleChange(roleButton);
+                    if (deleteButton) this.handleDeleteUser(deleteButton);
+                });
+            }
 
             // Confirm role change button in modal
             const confirmButton = document.getElementById('confirmRoleChange');
@@ -48,11 +113,6 @@
                 confirmButton.addEventListener('click', () => this.confirmRoleChange());
             }
             
-            // Delete user buttons
-            document.querySelectorAll('.delete-user').forEach(button => {
-                button.addEventListener('click', (e) => this.handleDeleteUser(e));
-            });
-            
             // Confirm delete user button in modal
             const confirmDeleteButton = document.getElementById('confirmDeleteUser');
             if (confirmDeleteButton) {
@@ -60,8 +120,8 @@
             }
         }
 
-        async handleRoleChange(event) {
-            const userId = event.target.dataset.userId;
+        async handleRoleChange(button) {
+            const userId = button.dataset.userId;
             const modalElement = document.getElementById('roleModal');
             
             if (!modalElement) {
@@ -146,9 +206,9 @@
             }
         }
 
-        async handleDeleteUser(event) {
-            const userId = event.target.dataset.userId;
-            const userName = event.target.dataset.userName;
+        async handleDeleteUser(button) {
+            const userId = button.dataset.userId;
+            const userName = button.dataset.userName;
             const modalElement = document.getElementById('deleteUserModal');
             
             if (!modalElement) {
@@ -239,27 +299,84 @@
             }
         }
 
-        initializeSearch() {
+        initializeUserTable() {
+            const tbody = document.querySelector('#usersTable tbody');
+            if (!tbody) {
+                return;
+            }
             const searchInput = document.querySelector('.search-input');
+            const roleFilter = document.getElementById('userRoleFilter');
+            const enrollmentFilter = document.getElementById('userEnrollmentFilter');
+            const sortSelect = document.getElementById('userSort');
+            const loadMore = document.getElementById('loadMoreUsers');
+
+            this.userTable = new UserPager(
+                () => ({
+                    q: searchInput ? searchInput.value.trim() : '',
+                    role: roleFilter ? roleFilter.value : '',
+                    enrollment: enrollmentFilter ? enrollmentFilter.value : '',
+                    sort: sortSelect ? sortSelect.value : 'name'
+                }),
+                (users, reset, hasMore) => {
+                    if (reset) {
+                        tbody.innerHTML = '';
+                    }
+                    tbody.insertAdjacentHTML('beforeend', users.map(user => this.renderUserRow(user)).join(''));
+                    if (reset && !users.length) {
+                        tbody.innerHTML = '<tr><td colspan="5" class="text-center text-muted">Keine Benutzer gefunden</td></tr>';
+                    }
+                    if (loadMore) {
+                        loadMore.style.display = hasMore ? 'inline-block' : 'none';
+                    }
+                }
+            );
+            const reload = () => this.userTable.load(true).catch(error => {
+                console.error('Error:', error);
+                this.showNotification('Benutzer konnten nicht geladen werden', 'danger');
+            });
+
             if (searchInput) {
-                searchInput.addEventListener('input', (e) => this.handleSearch(e.target.value));
+                searchInput.addEventListener('input', debounce(reload));
             }
+            [roleFilter, enrollmentFilter, sortSelect].forEach(select => {
+                if (select) select.addEventListener('change', reload);
+            });
+            if (loadMore) {
+                loadMore.addEventListener('click', () => {
+                    loadMore.disabled = true;
+                    this.userTable.load(false)
+                        .catch(() => this.showNotification('Benutzer konnten nicht geladen werden', 'danger'))
+                        .finally(() => { loadMore.disabled = false; });
+                });
+            }
+            reload();
         }
 
-        handleSearch(query) {
-            const userRows = document.querySelectorAll('#usersTable tbody tr');
-            query = query.toLowerCase();
-
-            userRows.forEach(row => {
-                const name = row.querySelector('td:first-child').textContent.toLowerCase();
-                const email = row.querySelector('td:nth-child(2)').textContent.toLowerCase();
-                
-                if (name.includes(query) || email.includes(query)) {
-                    row.style.display = '';
-                } else {
-                    row.style.display = 'none';
-                }
-            });
+        renderUserRow(user) {
+            const disabled = user.is_self ? 'disabled' : '';
+            const progress = user.progress
+                ? `${Math.round(user.progress.percent)}% (${user.progress.completed_lessons}/${user.progress.total_lessons})`
+                : '&ndash;';
+            return `
+                <tr data-user-id="${user.id}">
+                    <td>${escapeHtml(user.name)}</td>
+                    <td>${escapeHtml(user.email)}</td>
+                    <td>${ROLE_LABELS[user.role]}</td>
+                    <td>${progress}</td>
+                    <td>
+                        <div class="btn-group">
+                            <button class="btn btn-sm btn-outline-primary change-role"
+                                    data-user-id="${user.id}" ${disabled}>
+                                Rolle ändern
+                            </button>
+                            <button class="btn btn-sm btn-outline-danger delete-user ms-1"
+                                    data-user-id="${user.id}"
+                                    data-user-name="${escapeHtml(user.name)}" ${disabled}>
+                                Benutzer löschen
+                            </button>
+                        </div>
+                    </td>
+                </tr>`;
         }
 
         initializeEmailForm() {
@@ -275,25 +392,27 @@
                     recipientSelect.addEventListener('change', () => {
                         if (recipientSelect.value === 'selected') {
                             userSelectionContainer.style.display = 'block';
+                            if (!this.userPicker.loaded) this.reloadUserPicker();
                         } else {
                             userSelectionContainer.style.display = 'none';
                         }
                     });
                 }
                 
-                // Initialize user search
+                // Initialize user search; the list shows one page of matches at a time
                 const userSearch = document.getElementById('userSearch');
                 const clearSearch = document.getElementById('clearSearch');
+                this.initializeUserPicker(userSearch);
                 
                 if (userSearch) {
-                    userSearch.addEventListener('input', (e) => this.handleUserSearch(e.target.value));
+                    userSearch.addEventListener('input', debounce(() => this.reloadUserPicker()));
                 }
                 
                 if (clearSearch) {
                     clearSearch.addEventListener('click', () => {
                         if (userSearch) {
                             userSearch.value = '';
-                            this.handleUserSearch('');
+                            this.reloadUserPicker();
                         }
                     });
                 }
@@ -312,27 +431,70 @@
             }
         }
         
-        handleUserSearch(query) {
-            const userItems = document.querySelectorAll('#userList .list-group-item');
-            query = query.toLowerCase();
-            
-            userItems.forEach(item => {
-                const label = item.querySelector('label').textContent.toLowerCase();
-                
-                if (label.includes(query)) {
-                    item.style.display = '';
-                } else {
-                    item.style.display = 'none';
+        initializeUserPicker(userSearch) {
+            const userList = document.getElementById('userList');
+            const container = document.getElementById('userListContainer');
+            // Checked users stay selected while the list changes with the search
+            this.selectedUsers = new Set();
+
+            this.userPicker = new UserPager(
+                () => ({ q: userSearch ? userSearch.value.trim() : '', sort: 'name' }),
+                (users, reset) => {
+                    this.userPicker.loaded = true;
+                    if (reset) {
+                        userList.innerHTML = '';
+                        container.scrollTop = 0;
+                    }
+                    userList.insertAdjacentHTML('beforeend', users.map(user => `
+                        <div class="list-group-item">
+                            <div class="form-check">
+                                <input class="form-check-input user-checkbox" type="checkbox" value="${user.id}" id="user-${user.id}"
+                                       ${this.selectedUsers.has(String(user.id)) ? 'checked' : ''}>
+                                <label class="form-check-label" for="user-${user.id}">
+                                    ${escapeHtml(user.name)} (${escapeHtml(user.email)})
+                                    ${ROLE_BADGES[user.role]}
+                                </label>
+                            </div>
+                        </div>`).join(''));
+                }
+            );
+
+            userList.addEventListener('change', (e) => {
+                if (e.target.classList.contains('user-checkbox')) {
+                    if (e.target.checked) {
+                        this.selectedUsers.add(e.target.value);
+                    } else {
+                        this.selectedUsers.delete(e.target.value);
+                    }
+                }
+            });
+            // Load the next page when the list is scrolled to the bottom
+            container.addEventListener('scroll', () => {
+                if (this.userPicker.next && !this.userPicker.busy &&
+                        container.scrollTop + container.clientHeight >= container.scrollHeight - 20) {
+                    this.userPicker.busy = true;
+                    this.userPicker.load(false)
+                        .catch(error => console.error('Error:', error))
+                        .finally(() => { this.userPicker.busy = false; });
                 }
             });
         }
+
+        reloadUserPicker() {
+            this.userPicker.load(true).catch(error => {
+                console.error('Error:', error);
+                this.showNotification('Benutzer konnten nicht geladen werden', 'danger');
+            });
+        }
         
         toggleAllUsers(select) {
-            const checkboxes = document.querySelectorAll('.user-checkbox');
-            checkboxes.forEach(checkbox => {
-                const item = checkbox.closest('.list-group-item');
-                if (item.style.display !== 'none') {
-                    checkbox.checked = select;
+            // Applies to the users currently listed (the loaded matches of the search)
+            document.querySelectorAll('.user-checkbox').forEach(checkbox => {
+                checkbox.checked = select;
+                if (select) {
+                    this.selectedUsers.add(checkbox.value);
+                } else {
+                    this.selectedUsers.delete(checkbox.value);
                 }
             });
         }
@@ -344,10 +506,7 @@
             
             // Handle selected users
             if (formData.get('recipients') === 'selected') {
-                const selectedUsers = [];
-                document.querySelectorAll('.user-checkbox:checked').forEach(checkbox => {
-                    selectedUsers.push(checkbox.value);
-                });
+                const selectedUsers = Array.from(this.selectedUsers);
                 
                 if (selectedUsers.length === 0) {
                     this.showNotification('Bitte wählen Sie mindestens einen Benutzer aus', 'warning');
@@ -376,6 +535,8 @@
                 if (data.success) {
                     this.showNotification(data.message || 'E-Mail wurde erfolgreich gesendet', 'success');
                     form.reset();
+                    this.selectedUsers.clear();
+                    document.querySelectorAll('.user-checkbox').forEach(checkbox => { checkbox.checked = false; });
                     // restore default No Reply subject and notice
                     const subjectInput = document.getElementById('emailSubject');
                     const contentTextarea = document.getElementById('emailContent');
@@ -1,9 +1,19 @@
+// Tickets per page, and how often the list is checked for changes
+const TICKET_PAGE_SIZE = 50;
+const TICKET_POLL_INTERVAL = 30000;
+
 class TicketManagement {
     constructor() {
         this.csrfToken = document.querySelector('[name=csrfmiddlewaretoken]')?.value;
-        this.ticketModal = new bootstrap.Modal(document.getElementById('ticketModal'));
+        this.ticketModalElement = document.getElementById('ticketModal');
+        this.ticketModal = new bootstrap.Modal(this.ticketModalElement);
+        this.tickets = []; // The tickets loaded so far, newest first
+        this.next = null; // Cursor of the next page
+        this.etag = null; // ETag of the last response to this.lastUrl
+        this.lastUrl = null;
         this.setupEventListeners();
         this.loadTickets();
+        setInterval(() => this.pollTickets(), TICKET_POLL_INTERVAL);
 
         // Update status mappings to match backend values
         this.statusDisplayMap = {
@@ -18,15 +28,23 @@ class TicketManagement {
             'in_progress': 'warning',
             'closed': 'success'
         };
-
-        this.tickets = []; // Add this line to store all tickets
     }
 
     setupEventListeners() {
         // Search functionality
         const searchInput = document.querySelector('.search-input');
         if (searchInput) {
-            searchInput.addEventListener('input', (e) => this.handleSearch(e.target.value));
+            let timer = null;
+            searchInput.addEventListener('input', (e) => {
+                clearTimeout(timer);
+                timer = setTimeout(() => this.handleSearch(e.target.value), 300);
+            });
+        }
+
+        // Further pages
+        const loadMoreButton = document.getElementById('loadMoreTickets');
+        if (loadMoreButton) {
+            loadMoreButton.addEventListener('click', () => this.loadTickets({ more: true }));
         }
 
         // Save ticket changes
@@ -58,51 +76,94 @@ class TicketManagement {
             });
         }
 
-        // Add status filter listener
-        const statusFilter = document.querySelector('.status-filter');
-        if (statusFilter) {
-            statusFilter.addEventListener('change', () => this.filterTickets());
-        }
+        // Filters run on the server; any change starts over at the first page
+        ['.status-filter', '#ticketAssigneeFilter', '#ticketCreatedFrom', '#ticketCreatedTo'].forEach(selector => {
+            const element = document.querySelector(selector);
+            if (element) {
+                element.addEventListener('change', () => this.filterTickets());
+            }
+        });
     }
 
-    async loadTickets() {
+    ticketsUrl(params = {}) {
+        const query = new URLSearchParams();
+        const status = document.querySelector('.status-filter')?.value;
+        if (status && status !== 'all') query.set('status', status);
+        const assignee = document.getElementById('ticketAssigneeFilter')?.value;
+        if (assignee) query.set('assigned_to', assignee);
+        const createdFrom = document.getElementById('ticketCreatedFrom')?.value;
+        if (createdFrom) query.set('created_from', createdFrom);
+        const createdTo = document.getElementById('ticketCreatedTo')?.value;
+        if (createdTo) query.set('created_to', createdTo);
+        const search = document.querySelector('.search-input')?.value.trim();
+        if (search) query.set('q', search);
+        Object.entries(params).forEach(([key, value]) => query.set(key, value));
+        return `/course/tickets/?${query}`;
+    }
+
+    /**
+     * Load the first page of tickets for the current filters, or with
+     * {more: true} the page after the loaded ones. With {poll: true} the
+     * loaded range is re-requested with If-None-Match and only re-rendered
+     * when the server reports a change.
+     */
+    async loadTickets({ more = false, poll = false } = {}) {
+        let url;
+        if (more) {
+            if (!this.next) return;
+            url = this.ticketsUrl({ after: this.next, limit: TICKET_PAGE_SIZE });
+        } else {
+            const limit = poll ? Math.max(this.tickets.length, TICKET_PAGE_SIZE) : TICKET_PAGE_SIZE;
+            url = this.ticketsUrl({ limit });
+        }
+
+        const headers = {
+            'X-Requested-With': 'XMLHttpRequest',
+            'Accept': 'application/json'
+        };
+        if (poll && this.etag && url === this.lastUrl) {
+            headers['If-None-Match'] = this.etag;
+        }
+
         try {
-            const response = await fetch('/course/tickets/', {
-                headers: {
-                    'X-Requested-With': 'XMLHttpRequest',
-                    'Accept': 'application/json'
-                }
-            });
+            const response = await fetch(url, { headers, cache: 'no-store' });
+            if (response.status === 304) return; // Nothing changed since the last poll
 
             if (!response.ok) throw new Error('Failed to load tickets');
 
             const data = await response.json();
             if (data.success) {
-                this.tickets = data.tickets; // Store all tickets
-                this.filterTickets(); // Apply current filters
+                if (!more) {
+                    this.etag = response.headers.get('ETag');
+                    this.lastUrl = url;
+                }
+                this.tickets = more ? this.tickets.concat(data.tickets) : data.tickets;
+                this.next = data.next;
+                this.renderTickets(this.tickets);
+                const loadMoreButton = document.getElementById('loadMoreTickets');
+                if (loadMoreButton) {
+                    loadMoreButton.style.display = this.next ? 'inline-block' : 'none';
+                }
             } else {
                 console.error('Error loading tickets:', data.error);
                 this.showAlert('danger', data.error || 'Fehler beim Laden der Tickets');
             }
         } catch (error) {
             console.error('Error:', error);
-            this.showAlert('danger', 'Fehler beim Laden der Tickets');
+            if (!poll) {
+                this.showAlert('danger', 'Fehler beim Laden der Tickets');
+            }
         }
     }
 
-    filterTickets() {
-        const statusFilter = document.querySelector('.status-filter').value;
-        const searchQuery = document.querySelector('.search-input')?.value.toLowerCase() || '';
-
-        const filteredTickets = this.tickets.filter(ticket => {
-            const matchesStatus = statusFilter === 'all' || ticket.status === statusFilter;
-            const matchesSearch = Object.values(ticket).some(value => 
-                String(value).toLowerCase().includes(searchQuery)
-            );
-            return matchesStatus && matchesSearch;
-        });
+    pollTickets() {
+        // Skip while the tab is hidden or a ticket is being edited
+        if (document.hidden || this.ticketModalElement.classList.contains('show')) return;
+        this.loadTickets({ poll: true });
+    }
 
-        this.renderTickets(filteredTickets);
+    filterTickets() {
+        this.loadTickets();
     }
 
     renderTickets(tickets) {
@@ -112,7 +173,9 @@ class TicketManagement {
         tbody.innerHTML = tickets.map(ticket => `
             <tr>
                 <td>#${ticket.id}</td>
-                <td>${ticket.subject}</td>
+                <td>
+                    ${ticket.image_thumbnail ? `<img src="${ticket.image_thumbnail}" alt="" loading="lazy" class="rounded me-2" style="height: 32px; width: 32px; object-fit: cover;">` : ''}${ticket.subject}
+                </td>
                 <td>${ticket.user}</td>
                 <td><span class="badge bg-${this.statusClassMap[ticket.status]}">${this.statusDisplayMap[ticket.status]}</span></td>
                 <td>${ticket.created_at}</td>
@@ -172,11 +235,22 @@ class TicketManagement {
         imageContainer.innerHTML = ''; // Clear previous content
         
         if (ticket.image) {
+            // Show the thumbnail; the full-size original is only loaded on click
             const link = document.createElement('a');
             link.href = ticket.image;
             link.target = '_blank';
             link.className = 'd-block mt-2';
-            link.innerHTML = '<i class="fas fa-image me-2"></i>Bild anzeigen';
+            if (ticket.image_thumbnail) {
+                const thumbnail = document.createElement('img');
+                thumbnail.src = ticket.image_thumbnail;
+                thumbnail.alt = 'Bild anzeigen';
+                thumbnail.loading = 'lazy';
+                thumbnail.className = 'img-thumbnail';
+                thumbnail.style.maxHeight = '240px';
+                link.appendChild(thumbnail);
+            } else {
+                link.innerHTML = '<i class="fas fa-image me-2"></i>Bild anzeigen';
+            }
             imageContainer.appendChild(link);
         }
     }
@@ -282,7 +356,7 @@ class TicketManagement {
     }
 
     handleSearch(query) {
-        this.filterTickets(); // Replace the old search logic with filterTickets
+        this.filterTickets(); // The search runs on the server with the other filters
     }
 
     showAlert(type, message) {
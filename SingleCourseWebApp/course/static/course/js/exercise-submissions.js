@@ -8,10 +8,15 @@ function initSubmissionsTable() {
 
     // Store exercise max points globally for use in column rendering
     let exerciseMaxPoints = null;
+    // Opaque cursor of the next page, null once everything is loaded
+    let nextCursor = null;
+    const loadMoreButton = document.getElementById('loadMoreSubmissions');
+    const filter = document.getElementById('submissionFilter');
 
-    // Initialize DataTable
-    table.DataTable({
-        order: [[2, 'desc']],
+    // Initialize DataTable; rows are appended page by page by loadSubmissions()
+    const dataTable = table.DataTable({
+        data: [],
+        order: [[1, 'desc']],
         pageLength: 25, // Show 25 entries per page
         language: {
             search: "Suche in Abgaben:",
@@ -27,33 +32,6 @@ function initSubmissionsTable() {
                 previous: "Vorherige"
             }
         },
-        ajax: {
-            url: window.location.href,
-            dataSrc: function(json) {
-                if (!json.success) {
-                    // Handle error cases
-                    if (json.error) {
-                        showError(json.error);
-                    }
-                    return [];
-                }
-                // Store the exercise max points for use in column rendering
-                exerciseMaxPoints = json.exercise_max_points;
-                return json.submissions || [];
-            },
-            error: function(xhr, error, thrown) {
-                if (xhr.status === 403) {
-                    // Handle permission denied
-                    showError('Sie haben keine Berechtigung, diese Abgaben einzusehen.');
-                    // Redirect to home page after a delay
-                    setTimeout(() => {
-                        window.location.href = '/';
-                    }, 3000);
-                } else {
-                    showError('Beim Laden der Abgaben ist ein Fehler aufgetreten.');
-                }
-            }
-        },
         columns: [
             { 
                 data: 'group',
@@ -92,9 +70,14 @@ function initSubmissionsTable() {
                 title: 'Dateien',
                 render: function(data, type, row) {
                     if (!data || !data.length) return 'Keine Dateien';
-                    return data.map(file => 
-                        `<a href="${file.url}" target="_blank">${file.name}</a>`
-                    ).join('<br>');
+                    return data.map(file => {
+                        const link = `<a href="${file.url}" target="_blank">${escapeHtml(file.name)}</a>`;
+                        if (!file.render_url) return link;
+                        // Notebooks get a rendered preview next to the download
+                        return `${link} <button type="button" class="btn btn-link btn-sm p-0 ms-1"
+                            data-render-url="${file.render_url}" data-file-url="${file.url}"
+                            data-file-type=".ipynb" onclick="loadSubmissionFile(this)">Vorschau</button>`;
+                    }).join('<br>');
                 }
             },
             {
@@ -109,25 +92,60 @@ function initSubmissionsTable() {
             { orderable: false, targets: [0, 3] }
         ]
     });
-    
-    // Handle submission filtering
-    document.getElementById('submissionFilter')?.addEventListener('change', function() {
-        const filterValue = this.value;
-        let searchValue = '';
-        let searchColumn = 3; // Status column index
-        
-        if (filterValue === 'graded') {
-            searchValue = 'Bewertet';
-        } else if (filterValue === 'not_graded') {
-            searchValue = 'Nicht bewertet';
+
+    function loadSubmissions(reset) {
+        const params = new URLSearchParams();
+        if (filter && filter.value) {
+            params.set('status', filter.value);
         }
-        
-        table.DataTable().column(searchColumn).search(
-            searchValue,
-            true, // Use regex
-            false // Exact match
-        ).draw();
-    });
+        if (!reset && nextCursor) {
+            params.set('after', nextCursor);
+        }
+        if (loadMoreButton) loadMoreButton.disabled = true;
+
+        fetch(`${window.location.pathname}?${params}`, {
+            headers: { 'Accept': 'application/json' }
+        })
+            .then(response => {
+                if (response.status === 403) {
+                    // Handle permission denied
+                    showError('Sie haben keine Berechtigung, diese Abgaben einzusehen.');
+                    // Redirect to home page after a delay
+                    setTimeout(() => {
+                        window.location.href = '/';
+                    }, 3000);
+                    return null;
+                }
+                return response.json();
+            })
+            .then(json => {
+                if (!json) return;
+                if (!json.success) {
+                    showError(json.error || 'Beim Laden der Abgaben ist ein Fehler aufgetreten.');
+                    return;
+                }
+                // Store the exercise max points for use in column rendering
+                exerciseMaxPoints = json.exercise_max_points;
+                nextCursor = json.next;
+                if (reset) {
+                    dataTable.clear();
+                }
+                dataTable.rows.add(json.submissions || []).draw(false);
+                if (loadMoreButton) {
+                    loadMoreButton.style.display = nextCursor ? 'inline-block' : 'none';
+                }
+            })
+            .catch(() => showError('Beim Laden der Abgaben ist ein Fehler aufgetreten.'))
+            .finally(() => {
+                if (loadMoreButton) loadMoreButton.disabled = false;
+            });
+    }
+
+    loadMoreButton?.addEventListener('click', () => loadSubmissions(false));
+    // Handle submission filtering; the filter runs on the server, so reload from the first page
+    filter?.addEventListener('change', () => loadSubmissions(true));
+
+    loadSubmissions(true);
 }
 
 function initGradingView() {
@@ -164,28 +182,49 @@ function handleReferenceUpload(event) {
     const file = event.target.files[0];
     if (!file) return;
 
-    const reader = new FileReader();
-    reader.onload = function(e) {
-        if (file.name.endsWith('.ipynb')) {
-            displayNotebook(e.target.result, 'referenceViewer');
-        } else {
-            displayPythonFile(e.target.result, 'referenceViewer');
-        }
-    };
-    reader.readAsText(file);
+    if (!file.name.endsWith('.ipynb')) {
+        // Plain source files are previewed locally
+        const reader = new FileReader();
+        reader.onload = e => displayPythonFile(e.target.result, 'referenceViewer');
+        reader.readAsText(file);
+        return;
+    }
+
+    // Notebooks are stored as the reference solution and previewed as rendered on the server
+    const formData = new FormData();
+    formData.append('file', file);
+    fetch(event.target.dataset.uploadUrl, {
+        method: 'POST',
+        headers: { 'X-CSRFToken': document.querySelector('[name=csrfmiddlewaretoken]')?.value },
+        body: formData
+    })
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) throw new Error(data.error);
+            return fetch(data.reference_url).then(response => response.text());
+        })
+        .then(html => displayNotebook(html, 'referenceViewer'))
+        .catch(error => showError(error.message || 'Die Referenzlösung konnte nicht hochgeladen werden.'));
 }
 
 function loadSubmissionFile(element) {
     currentFile = element;
     currentFileType = element.dataset.fileType;
-    const fileUrl = element.dataset.fileUrl;
+    const isNotebook = currentFileType.includes('.ipynb');
+    // Notebooks are rendered to HTML (and cached) on the server
+    const fileUrl = isNotebook ? element.dataset.renderUrl : element.dataset.fileUrl;
 
     fetch(fileUrl)
         .then(response => response.text())
         .then(content => {
-            if (currentFileType.includes('.ipynb')) {
+            if (isNotebook) {
                 displayNotebook(content, 'submissionViewer');
-                hideFileList();
+                const modal = document.getElementById('notebookPreviewModal');
+                if (modal) {
+                    bootstrap.Modal.getOrCreateInstance(modal).show();
+                } else {
+                    hideFileList();
+                }
             } else {
                 displayPythonFile(content, 'submissionViewer');
                 hideFileList();
@@ -194,7 +233,7 @@ function loadSubmissionFile(element) {
         .catch(error => console.error('Error loading file:', error));
 }
 
-function displayNotebook(content, containerId) {
+function displayNotebook(html, containerId) {
     const container = document.getElementById(containerId);
     
     // Create notebook viewer element if it doesn't exist
@@ -209,9 +248,10 @@ function displayNotebook(content, containerId) {
     viewer.innerHTML = '';
     viewer.style.display = 'block';
     
-    // Use nbviewer to render the notebook
-    const notebook = JSON.parse(content);
-    viewer.render(notebook, viewer);
+    viewer.innerHTML = html;
+    if (window.hljs) {
+        viewer.querySelectorAll('pre code').forEach(block => hljs.highlightElement(block));
+    }
 }
 
 function displayPythonFile(content, containerId) {
@@ -11,7 +11,9 @@ class FileUploadHandler {
     setupFormSubmit() {
         this.form.addEventListener('submit', (e) => {
             e.preventDefault();
-            this.uploadId = Date.now().toString();
+            this.uploadId = window.crypto && crypto.randomUUID
+                ? crypto.randomUUID()
+                : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
             this.startUpload();
         });
     }
@@ -42,14 +44,16 @@ class FileUploadHandler {
         // Start progress checking
         this.progressCheckInterval = setInterval(() => {
             this.checkProgress();
-        }, 1000);
+        }, 500);
 
-        // Submit the form
+        // Submit the form; the server reports progress under the X-Progress-ID header
         const formData = new FormData(this.form);
-        formData.append('upload_id', this.uploadId);
 
         fetch(this.form.action, {
             method: 'POST',
+            headers: {
+                'X-Progress-ID': this.uploadId
+            },
             body: formData,
             credentials: 'same-origin'
         })
@@ -77,6 +81,9 @@ class FileUploadHandler {
                     this.progressBar.style.width = `${progress}%`;
                     this.progressBar.textContent = `${progress}%`;
                 }
+                if (data.done) {
+                    clearInterval(this.progressCheckInterval);
+                }
             })
             .catch(error => {
                 console.error('Error checking progress:', error);
@@ -1,19 +1,10 @@
 let currentFileType = null;
 let currentFile = null;
-let referenceContent = null;
-let markdownConverter;
+let hasReference = false;
 
-// Initialize markdown converter
 document.addEventListener('DOMContentLoaded', function() {
-    // Try to initialize markdown converter
-    if (typeof showdown === 'object' && typeof showdown.Converter === 'function') {
-        markdownConverter = new showdown.Converter();
-    }
-
-    // Initialize reference solution if available
-    if (initialReferenceSolution) {
-        referenceContent = JSON.stringify(initialReferenceSolution);
-    }
+    const container = document.querySelector('.viewer-container');
+    hasReference = !!container && container.dataset.hasReference === 'true';
 });
 
 function initGradingForm(submissionId, returnUrl) {
@@ -116,8 +107,8 @@ function handleReferenceUpload(event) {
     .then(response => response.json())
     .then(data => {
         if (data.success) {
-            // Update reference content
-            referenceContent = data.reference_solution;
+            // Notebooks are now compared against the new reference on the server
+            hasReference = true;
             
             // Update UI to show reference solution is available
             const referenceInfo = document.querySelector('.reference-solution-info');
@@ -159,20 +150,27 @@ function loadSubmissionFile(element) {
     });
     element.classList.add('active');
 
+    if (currentFileType.includes('.ipynb')) {
+        // Rendered (and cached) on the server; only the HTML fragment is transferred
+        const renderUrl = element.dataset.renderUrl + (hasReference ? '?compare=reference' : '');
+        fetch(renderUrl)
+            .then(response => response.text())
+            .then(html => {
+                displayNotebook(html);
+                hideFileList();
+            })
+            .catch(error => {
+                console.error('Error loading notebook:', error);
+                alert('Error loading submission file');
+            });
+        return;
+    }
+
     fetch(fileUrl)
         .then(response => response.text())
         .then(content => {
-            if (currentFileType.includes('.ipynb')) {
-                if (referenceContent) {
-                    displayNotebookDiff(referenceContent, content);
-                } else {
-                    displayNotebook(content);
-                }
-                hideFileList();
-            } else {
-                displayPythonFile(content);
-                hideFileList();
-            }
+            displayPythonFile(content);
+            hideFileList();
         })
         .catch(error => {
             console.error('Error loading file:', error);
@@ -180,28 +178,7 @@ function loadSubmissionFile(element) {
         });
 }
 
-function displayNotebook(content) {
-    const viewer = document.querySelector('.notebook-viewer');
-    const editorContainer = document.querySelector('.editor-container');
-    
-    if (editorContainer) {
-        editorContainer.style.display = 'none';
-    }
-    
-    if (viewer) {
-        viewer.style.display = 'block';
-        
-        try {
-            const notebook = JSON.parse(content);
-            nbviewer.render(notebook, viewer);
-        } catch (error) {
-            console.error('Error parsing notebook:', error);
-            viewer.innerHTML = '<div class="alert alert-danger">Error loading notebook</div>';
-        }
-    }
-}
-
-function displayNotebookDiff(referenceContent, submissionContent) {
+function displayNotebook(html) {
     const viewer = document.querySelector('.notebook-viewer');
     const editorContainer = document.querySelector('.editor-container');
     
@@ -211,150 +188,15 @@ function displayNotebookDiff(referenceContent, submissionContent) {
     
     if (viewer) {
         viewer.style.display = 'block';
+        viewer.innerHTML = html;
         
-        try {
-            const reference = JSON.parse(referenceContent);
-            const submission = JSON.parse(submissionContent);
-            
-            // Clear outputs from both notebooks
-            clearNotebookOutputs(reference);
-            clearNotebookOutputs(submission);
-            
-            // Compare notebooks and create diff view
-            const diffHtml = generateNotebookDiff(reference, submission);
-            viewer.innerHTML = diffHtml;
-            
-            // Apply syntax highlighting to code cells
-            if (window.hljs) {
-                viewer.querySelectorAll('pre code').forEach(block => {
-                    hljs.highlightBlock(block);
-                });
-            }
-        } catch (error) {
-            console.error('Error creating notebook diff:', error);
-            viewer.innerHTML = '<div class="alert alert-danger">Error comparing notebooks</div>';
-        }
-    }
-}
-
-function clearNotebookOutputs(notebook) {
-    if (notebook.cells) {
-        notebook.cells.forEach(cell => {
-            if (cell.cell_type === 'code') {
-                cell.outputs = [];
-                cell.execution_count = null;
-            }
-        });
-    }
-}
-
-function generateNotebookDiff(reference, submission) {
-    let diffHtml = '<div class="notebook-diff">';
-    
-    // Header with total points only
-    diffHtml += `
-        <div class="comparison-header">
-            <div class="comparison-title">Referenzlösung</div>
-            <div class="comparison-title">Studentenlösung</div>
-        </div>
-    `;
-    
-    const refCells = reference.cells || [];
-    const subCells = submission.cells || [];
-    const maxCells = Math.max(refCells.length, subCells.length);
-    
-    for (let i = 0; i < maxCells; i++) {
-        const refCell = refCells[i];
-        const subCell = subCells[i];
-        
-        if (!refCell) {
-            // Added cell in student submission
-            diffHtml += `<div class="cell-comparison">
-                <div></div>
-                ${generateCellHtml(subCell, 'added')}
-            </div>`;
-        } else if (!subCell) {
-            // Cell only in reference
-            diffHtml += `<div class="cell-comparison">
-                ${generateCellHtml(refCell, 'removed')}
-                <div></div>
-            </div>`;
-        } else {
-            const refContent = getCellContent(refCell);
-            const subContent = getCellContent(subCell);
-            
-            if (refContent === subContent) {
-                // Identical cells
-                diffHtml += `<div class="cell-single">
-                    ${generateCellHtml(refCell, 'unchanged')}
-                </div>`;
-            } else {
-                // Different cells
-                diffHtml += `<div class="cell-comparison">
-                    ${generateCellHtml(refCell, 'removed')}
-                    ${generateCellHtml(subCell, 'added')}
-                </div>`;
-            }
-        }
-    }
-    
-    diffHtml += '</div>';
-    return diffHtml;
-}
-
-function getCellContent(cell) {
-    if (cell.cell_type === 'code') {
-        return cell.source.join('');
-    } else {
-        return cell.source.join('');
-    }
-}
-
-function generateCellHtml(cell, status) {
-    const cellClass = `diff-${status}`;
-    let html = `<div class="notebook-cell ${cellClass}">`;
-    
-    // Add cell content without the cell type indicator
-    if (cell.cell_type === 'code') {
-        html += '<div class="cell-content"><pre><code class="python">';
-        html += escapeHtml(cell.source.join(''));
-        html += '</code></pre>';
-        
-        // Add outputs if they exist
-        if (cell.outputs && cell.outputs.length > 0) {
-            html += '<div class="cell-outputs">';
-            cell.outputs.forEach(output => {
-                if (output.output_type === 'stream') {
-                    html += `<pre class="output-stream">${escapeHtml(output.text.join(''))}</pre>`;
-                } else if (output.output_type === 'execute_result' || output.output_type === 'display_data') {
-                    if (output.data['text/plain']) {
-                        html += `<pre class="output-result">${escapeHtml(output.data['text/plain'].join(''))}</pre>`;
-                    }
-                }
+        // Apply syntax highlighting to code cells
+        if (window.hljs) {
+            viewer.querySelectorAll('pre code').forEach(block => {
+                hljs.highlightBlock(block);
             });
-            html += '</div>';
         }
-        
-        html += '</div>';
-    } else {
-        // Markdown or raw cell
-        html += '<div class="cell-content">';
-        try {
-            const markdownText = cell.source.join('');
-            if (markdownConverter) {
-                html += markdownConverter.makeHtml(markdownText);
-            } else {
-                html += `<pre>${escapeHtml(markdownText)}</pre>`;
-            }
-        } catch (error) {
-            console.error('Error rendering markdown:', error);
-            html += `<pre>${escapeHtml(cell.source.join(''))}</pre>`;
-        }
-        html += '</div>';
     }
-    
-    html += '</div>';
-    return html;
 }
 
 function displayPythonFile(content) {
@@ -97,7 +97,7 @@ document.addEventListener('DOMContentLoaded', function() {
             moduleData.lessons.forEach((lesson, lessonIndex) => {
                 console.log(`Processing lesson ${lessonIndex}: ${lesson.title}`);
                 console.log(`Lesson duration:`, lesson.duration, typeof lesson.duration);
-                console.log(`Lesson debug_minutes:`, lesson.debug_minutes);
+                console.log(`Lesson minutes:`, lesson.minutes);
                 console.log(`Lesson type:`, lesson.lesson_type);
                 
                 // Count exercise lessons
@@ -108,11 +108,11 @@ document.addEventListener('DOMContentLoaded', function() {
                     }
                 }
                 
-                // Add to total duration - use debug_minutes when available
-                if (lesson.debug_minutes !== undefined) {
-                    // Use the debug_minutes field directly
-                    totalDurationMinutes += lesson.debug_minutes;
-                    console.log(`Using debug_minutes: ${lesson.debug_minutes} minutes`);
+                // Add to total duration - use minutes when available
+                if (lesson.minutes !== undefined) {
+                    // Use the minutes field directly
+                    totalDurationMinutes += lesson.minutes;
+                    console.log(`Using minutes: ${lesson.minutes} minutes`);
                 }
                 // Fallback to parsing the duration string
                 else if (lesson.duration) {
@@ -768,11 +768,23 @@ function createNewLesson() {
 // Exercise Management Functions
 // ============================================================================
 
+/**
+ * Upload a file through the resumable upload API, showing progress on the save button.
+ * @param {File} file - The file to upload
+ * @param {HTMLElement} saveButton - Button used as progress indicator
+ * @returns {Promise<string>} The upload ID
+ */
+function uploadWithProgress(file, saveButton) {
+    return resumableUpload(file, fraction => {
+        saveButton.innerHTML = `<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> ${file.name}: ${Math.round(fraction * 100)}%`;
+    });
+}
+
 /**
  * Save the current lesson with all its content.
  * @returns {Promise<void>}
  */
-function saveLesson() {
+async function saveLesson() {
     if (!currentLessonId) return;
     
     // Validate all inputs first
@@ -829,37 +841,34 @@ function saveLesson() {
             
             if (materialFiles && materialFiles.files.length > 0) {
                 console.log('Adding materials:', materialFiles.files.length, 'files');
-                // Log each material file being added
-                Array.from(materialFiles.files).forEach((file, index) => {
-                    console.log(`Adding material file ${index + 1}:`, {
-                        name: file.name,
-                        size: file.size,
-                        type: file.type
-                    });
-                    formData.append('materials', file);
-                });
-
-                // Debug log FormData contents
-                console.log('FormData entries:');
-                for (let [key, value] of formData.entries()) {
-                    if (value instanceof File) {
-                        console.log('FormData entry:', key, {
-                            name: value.name,
-                            size: value.size,
-                            type: value.type
-                        });
-                    } else {
-                        console.log('FormData entry:', key, value);
+                // Materials (datasets can be large) go through the resumable upload API
+                try {
+                    for (const file of Array.from(materialFiles.files)) {
+                        formData.append('material_upload_ids', await uploadWithProgress(file, saveButton));
                     }
+                } catch (error) {
+                    console.error('Error uploading materials:', error);
+                    showToast('Fehler beim Hochladen: ' + error.message, 'error');
+                    saveButton.innerHTML = originalButtonText;
+                    saveButton.disabled = false;
+                    return;
                 }
             }
         }
     } else if (lessonType === 'video') {
-        // Handle video file upload
+        // Handle video file upload in resumable chunks
         const videoFile = document.getElementById('videoFile');
         if (videoFile && videoFile.files[0]) {
             console.log('Adding video file:', videoFile.files[0].name);
-            formData.append('video_file', videoFile.files[0]);
+            try {
+                formData.append('video_upload_id', await uploadWithProgress(videoFile.files[0], saveButton));
+            } catch (error) {
+                console.error('Error uploading video:', error);
+                showToast('Fehler beim Hochladen: ' + error.message, 'error');
+                saveButton.innerHTML = originalButtonText;
+                saveButton.disabled = false;
+                return;
+            }
         }
     }
     
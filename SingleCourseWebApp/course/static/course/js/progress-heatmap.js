@@ -0,0 +1,134 @@
+/**
+ * Student x lesson completion heatmap for the progress page.
+ *
+ * The matrix comes from the progress_matrix API: one hex bitset per student,
+ * bit i set when lesson i is completed. Everything is drawn on one canvas, so
+ * 2,000 students x 150 lessons stay a single DOM node.
+ */
+document.addEventListener('DOMContentLoaded', function() {
+    const container = document.getElementById('progressHeatmap');
+    const canvas = document.getElementById('progressCanvas');
+    const tooltip = document.getElementById('progressTooltip');
+    const filterInput = document.getElementById('progressFilter');
+    if (!container || !canvas) {
+        return;
+    }
+
+    const CELL = 8;          // px per lesson column and student row
+    const LABEL_WIDTH = 220; // px for student names
+    const HEADER_HEIGHT = 24;
+    const COLORS = ['#e9ecef', '#198754'];
+    const MODULE_COLORS = ['#0d6efd', '#6f42c1'];
+
+    let matrix = null;
+    let rows = [];
+
+    // Bit i of a hex bitset, counted from the last digit
+    function isCompleted(hex, i) {
+        const digit = hex.length - 1 - (i >> 2);
+        if (digit < 0) {
+            return false;
+        }
+        return ((parseInt(hex[digit], 16) >> (i & 3)) & 1) === 1;
+    }
+
+    function showError(message) {
+        const errorElement = document.getElementById('progressError');
+        errorElement.textContent = message;
+        errorElement.classList.remove('d-none');
+    }
+
+    function draw() {
+        const lessons = matrix.lessons;
+        const ratio = window.devicePixelRatio || 1;
+        const width = LABEL_WIDTH + lessons.length * CELL;
+        const height = HEADER_HEIGHT + rows.length * CELL;
+        canvas.width = width * ratio;
+        canvas.height = height * ratio;
+        canvas.style.width = width + 'px';
+        canvas.style.height = height + 'px';
+
+        const ctx = canvas.getContext('2d');
+        ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+        ctx.clearRect(0, 0, width, height);
+
+        // Module bands above the lesson columns
+        let moduleIndex = -1;
+        let previousModule = null;
+        lessons.forEach((lesson, i) => {
+            if (lesson.module_id !== previousModule) {
+                moduleIndex += 1;
+                previousModule = lesson.module_id;
+            }
+            ctx.fillStyle = MODULE_COLORS[moduleIndex % MODULE_COLORS.length];
+            ctx.fillRect(LABEL_WIDTH + i * CELL, HEADER_HEIGHT - 6, CELL, 4);
+        });
+
+        ctx.font = '7px sans-serif';
+        ctx.textBaseline = 'top';
+        rows.forEach((student, row) => {
+            const y = HEADER_HEIGHT + row * CELL;
+            ctx.fillStyle = '#212529';
+            ctx.fillText(`${student.name} (${student.count}/${lessons.length})`, 4, y, LABEL_WIDTH - 8);
+            for (let i = 0; i < lessons.length; i++) {
+                ctx.fillStyle = COLORS[isCompleted(student.completed, i) ? 1 : 0];
+                ctx.fillRect(LABEL_WIDTH + i * CELL, y, CELL - 1, CELL - 1);
+            }
+        });
+    }
+
+    function applyFilter() {
+        const term = filterInput.value.trim().toLowerCase();
+        rows = term
+            ? matrix.students.filter(s => s.name.toLowerCase().includes(term) || s.email.toLowerCase().includes(term))
+            : matrix.students;
+        document.getElementById('progressStudentCount').textContent = `${rows.length} Studierende`;
+        draw();
+    }
+
+    canvas.addEventListener('mousemove', function(event) {
+        if (!matrix) {
+            return;
+        }
+        const rect = canvas.getBoundingClientRect();
+        const column = Math.floor((event.clientX - rect.left - LABEL_WIDTH) / CELL);
+        const row = Math.floor((event.clientY - rect.top - HEADER_HEIGHT) / CELL);
+        const lesson = matrix.lessons[column];
+        const student = rows[row];
+        if (column < 0 || row < 0 || !lesson || !student) {
+            tooltip.classList.add('d-none');
+            return;
+        }
+        const state = isCompleted(student.completed, column) ? 'abgeschlossen' : 'offen';
+        tooltip.textContent = `${student.name} · ${lesson.title}: ${state}`;
+        tooltip.style.left = (event.clientX + 12) + 'px';
+        tooltip.style.top = (event.clientY + 12) + 'px';
+        tooltip.classList.remove('d-none');
+    });
+
+    canvas.addEventListener('mouseleave', function() {
+        tooltip.classList.add('d-none');
+    });
+
+    filterInput.addEventListener('input', function() {
+        if (matrix) {
+            applyFilter();
+        }
+    });
+
+    fetch(container.dataset.url, { headers: { 'Accept': 'application/json' } })
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) {
+                showError(data.error || 'Der Lernfortschritt konnte nicht geladen werden.');
+                return;
+            }
+            matrix = data;
+            document.getElementById('progressLessonCount').textContent = `${data.lessons.length} Lektionen`;
+            applyFilter();
+        })
+        .catch(error => {
+            console.error('Error loading progress matrix:', error);
+            showError('Der Lernfortschritt konnte nicht geladen werden.');
+        });
+});
@@ -0,0 +1,132 @@
+// ============================================================================
+// Resumable chunked uploads (tus-style protocol served by views.chunked_upload)
+// ============================================================================
+
+// Set by the including template: <script ... data-upload-url="{% url 'course:create_chunked_upload' %}">
+const RESUMABLE_UPLOAD_URL = document.currentScript.dataset.uploadUrl;
+const RESUMABLE_PARALLEL_CHUNKS = 3;
+const RESUMABLE_MAX_RETRIES = 5;
+
+function resumableStorageKey(file) {
+    return `resumable-upload:${file.name}:${file.size}:${file.lastModified}`;
+}
+
+function resumableCsrfToken() {
+    const tokenElement = document.querySelector('[name=csrfmiddlewaretoken]');
+    return tokenElement ? tokenElement.value : '';
+}
+
+function parseReceivedChunks(header) {
+    const received = new Set();
+    (header || '').split(',').filter(Boolean).forEach(part => {
+        const [start, end] = part.split('-').map(Number);
+        for (let i = start; i <= (isNaN(end) ? start : end); i++) received.add(i);
+    });
+    return received;
+}
+
+function sleep(ms) {
+    return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+/**
+ * Fetch the server-side state of an upload, or null if it no longer exists.
+ * @param {string} uploadUrl
+ * @returns {Promise<{chunkSize: number, received: Set<number>}|null>}
+ */
+async function fetchUploadState(uploadUrl) {
+    const response = await fetch(uploadUrl, { method: 'HEAD', cache: 'no-store' });
+    if (!response.ok) return null;
+    return {
+        chunkSize: parseInt(response.headers.get('Upload-Chunk-Size'), 10),
+        received: parseReceivedChunks(response.headers.get('Upload-Received'))
+    };
+}
+
+async function createUpload(file) {
+    const filename = btoa(String.fromCharCode(...new TextEncoder().encode(file.name)));
+    const response = await fetch(RESUMABLE_UPLOAD_URL, {
+        method: 'POST',
+        headers: {
+            'X-CSRFToken': resumableCsrfToken(),
+            'Tus-Resumable': '1.0.0',
+            'Upload-Length': String(file.size),
+            'Upload-Metadata': `filename ${filename}`
+        }
+    });
+    if (response.status !== 201) {
+        const data = await response.json().catch(() => ({}));
+        throw new Error(data.error || 'Upload konnte nicht gestartet werden');
+    }
+    return {
+        uploadUrl: response.headers.get('Location'),
+        chunkSize: parseInt(response.headers.get('Upload-Chunk-Size'), 10),
+        received: new Set()
+    };
+}
+
+async function sendChunk(uploadUrl, file, index, chunkSize) {
+    const start = index * chunkSize;
+    const response = await fetch(uploadUrl, {
+        method: 'PATCH',
+        headers: {
+            'X-CSRFToken': resumableCsrfToken(),
+            'Tus-Resumable': '1.0.0',
+            'Upload-Offset': String(start),
+            'Content-Type': 'application/offset+octet-stream'
+        },
+        body: file.slice(start, Math.min(start + chunkSize, file.size))
+    });
+    if (response.status !== 204) {
+        throw new Error(`Chunk ${index} fehlgeschlagen (${response.status})`);
+    }
+}
+
+/**
+ * Upload a file in parallel chunks, resuming a previous attempt if possible.
+ * @param {File} file - The file to upload
+ * @param {function(number): void} [onProgress] - Called with a 0..1 fraction
+ * @returns {Promise<string>} The upload ID to pass to save_lesson
+ */
+async function resumableUpload(file, onProgress) {
+    const storageKey = resumableStorageKey(file);
+    let uploadUrl = localStorage.getItem(storageKey);
+    let state = uploadUrl ? await fetchUploadState(uploadUrl).catch(() => null) : null;
+
+    if (!state) {
+        const created = await createUpload(file);
+        uploadUrl = created.uploadUrl;
+        state = created;
+        localStorage.setItem(storageKey, uploadUrl);
+    }
+
+    const totalChunks = Math.ceil(file.size / state.chunkSize);
+    const pending = [];
+    for (let i = 0; i < totalChunks; i++) {
+        if (!state.received.has(i)) pending.push(i);
+    }
+    let done = totalChunks - pending.length;
+    if (onProgress) onProgress(totalChunks ? done / totalChunks : 1);
+
+    async function worker() {
+        while (pending.length > 0) {
+            const index = pending.shift();
+            for (let attempt = 0; ; attempt++) {
+                try {
+                    await sendChunk(uploadUrl, file, index, state.chunkSize);
+                    break;
+                } catch (error) {
+                    if (attempt >= RESUMABLE_MAX_RETRIES) throw error;
+                    // Back off, then continue where the network dropped us
+                    await sleep(Math.min(1000 * 2 ** attempt, 30000));
+                }
+            }
+            done++;
+            if (onProgress) onProgress(done / totalChunks);
+        }
+    }
+
+    await Promise.all(Array.from({ length: RESUMABLE_PARALLEL_CHUNKS }, worker));
+    localStorage.removeItem(storageKey);
+    return uploadUrl.replace(/\/$/, '').split('/').pop();
+}
@@ -0,0 +1,74 @@
+import gzip
+import logging
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip siblings are always written
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.mjs', '.map', '.json', '.svg', '.html', '.txt', '.xml', '.ico')
+MIN_COMPRESS_SIZE = 512  # bytes; smaller files are not worth an extra variant
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also writes ``.gz`` and ``.br`` siblings at collectstatic time.
+
+    Hashed filenames never change content, so they can be served with
+    ``Cache-Control: immutable`` (see ``course.utils.serving.serve_static``).
+    """
+
+    # Unknown names fall back to their plain URL instead of raising, so pages
+    # still render before collectstatic has run (development, tests).
+    manifest_strict = False
+
+    def hashed_name(self, name, content=None, filename=None):
+        try:
+            return super().hashed_name(name, content, filename)
+        except ValueError:
+            if content is not None:
+                raise
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed_names = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if not isinstance(processed, Exception):
+                processed_names.add(name)
+                if hashed_name:
+                    processed_names.add(hashed_name)
+            yield name, hashed_name, processed
+
+        if dry_run:
+            return
+        for name in sorted(processed_names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self._write_compressed_variants(name)
+
+    def _write_compressed_variants(self, name):
+        path = self.path(name)
+        try:
+            with open(path, 'rb') as fh:
+                data = fh.read()
+        except OSError as e:
+            logger.warning("Could not read %s for compression: %s", name, e)
+            return
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+
+        variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(data, quality=11)))
+
+        for suffix, compressed in variants:
+            if len(compressed) >= len(data):
+                continue
+            with open(path + suffix, 'wb') as fh:
+                fh.write(compressed)
+            # Keep the sibling's mtime aligned so ETags/Last-Modified agree
+            stat = os.stat(path)
+            os.utime(path + suffix, ns=(stat.st_atime_ns, stat.st_mtime_ns))
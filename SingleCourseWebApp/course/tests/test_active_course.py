@@ -0,0 +1,51 @@
+from django.core.cache import cache
+from django.test import TestCase
+from course.models import CustomUserModel, Course, Enrollment, JupyterLabImage
+
+
+class ActiveCourseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.instructor = CustomUserModel.objects.create_user(
+            'instructor@test.com', 'Test', 'Instructor',
+            password='testpass123', username='instructor', is_instructor=True
+        )
+
+    def test_no_course_is_cached_too(self):
+        self.assertIsNone(Course.objects.active())
+        with self.assertNumQueries(0):
+            self.assertIsNone(Course.objects.active())
+
+    def test_cached_with_image_and_invalidated_on_save(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            course = Course.objects.create(title='Python', instructor=self.instructor)
+            JupyterLabImage.objects.create(course=course, image_name='jupyter/base:1')
+        Course.objects.active()
+        with self.assertNumQueries(0):
+            active = Course.objects.active()
+            self.assertEqual(active.jupyterlab_image.image_name, 'jupyter/base:1')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            course.jupyterlab_image.image_name = 'jupyter/base:2'
+            course.jupyterlab_image.save()
+        self.assertEqual(Course.objects.active().jupyterlab_image.image_name, 'jupyter/base:2')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            course.title = 'Python II'
+            course.save()
+        self.assertEqual(Course.objects.active().title, 'Python II')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            course.delete()
+        self.assertIsNone(Course.objects.active())
+
+    def test_enrollment_defaults_to_active_course(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            course = Course.objects.create(title='Python', instructor=self.instructor)
+        student = CustomUserModel.objects.create_user(
+            'student@test.com', 'Test', 'Student', password='testpass123', username='student'
+        )
+        Course.objects.active()
+        with self.assertNumQueries(1):  # just the INSERT
+            enrollment = Enrollment.objects.create(student=student)
+        self.assertEqual(enrollment.course_id, course.id)
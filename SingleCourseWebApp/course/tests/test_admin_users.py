@@ -0,0 +1,99 @@
+from django.test import TestCase
+from django.urls import reverse
+from course.models import CustomUserModel, Course, Enrollment
+from course.utils.pagination import decode_cursor, encode_cursor
+
+
+class AdminUsersTests(TestCase):
+    """The paginated user directory behind the admin dashboard."""
+
+    def setUp(self):
+        self.admin = CustomUserModel.objects.create_user(
+            'admin@test.com', 'Ada', 'Admin', password='testpass123', username='admin',
+            is_superuser=True, is_student=False,
+        )
+        course = Course.objects.create(title='Python', instructor=self.admin)
+        self.instructor = CustomUserModel.objects.create_user(
+            'dozent@test.com', 'Doris', 'Dozent', password='x', username='dozent', is_instructor=True,
+        )
+        # Twelve students; several share a first name, so sorting needs the tie-breakers
+        self.students = []
+        for i in range(12):
+            student = CustomUserModel.objects.create_user(
+                f'student{i:02}@uni.test', ['Max', 'Mia', 'Max'][i % 3], f'Muster{i:02}',
+                password='x', username=f'student{i}',
+            )
+            if i % 2 == 0:
+                Enrollment.objects.create(student=student, course=course, progress=50.0,
+                                          completed_lessons=1, total_lessons=2)
+            self.students.append(student)
+        self.url = reverse('course:admin_users')
+        self.client.force_login(self.admin)
+
+    def fetch(self, **params):
+        response = self.client.get(self.url, params)
+        return response.status_code, response.json()
+
+    def walk(self, **params):
+        """All user ids over every page, following the next cursors."""
+        ids, after = [], None
+        while True:
+            if after:
+                params['after'] = after
+            status, data = self.fetch(limit=5, **params)
+            self.assertEqual(status, 200)
+            ids.extend(user['id'] for user in data['users'])
+            after = data['next']
+            if not after:
+                return ids
+
+    def test_pages_follow_each_sort_order(self):
+        everyone = CustomUserModel.objects
+        expected = {
+            'name': everyone.order_by('first_name', 'last_name', 'id'),
+            '-name': everyone.order_by('-first_name', '-last_name', '-id'),
+            'email': everyone.order_by('email', 'id'),
+            '-joined': everyone.order_by('-date_joined', '-id'),
+        }
+        for sort, queryset in expected.items():
+            with self.subTest(sort=sort):
+                self.assertEqual(self.walk(sort=sort), list(queryset.values_list('id', flat=True)))
+
+    def test_search_and_filters(self):
+        def ids(**params):
+            return sorted(self.walk(**params))
+
+        self.assertEqual(ids(q='dozent'), [self.instructor.id])
+        self.assertEqual(ids(q='MIA uni.test'), sorted(s.id for s in self.students[1::3]))
+        self.assertEqual(ids(role='admin'), [self.admin.id])
+        self.assertEqual(ids(role='student'), sorted(s.id for s in self.students))
+        self.assertEqual(ids(enrollment='enrolled', q='max'), sorted(
+            s.id for i, s in enumerate(self.students) if i % 2 == 0 and i % 3 != 1
+        ))
+
+        _, data = self.fetch(q='student00@')
+        self.assertEqual(data['users'][0]['progress'], {'percent': 50.0, 'completed_lessons': 1, 'total_lessons': 2})
+        _, data = self.fetch(q='admin@')
+        self.assertEqual(data['users'][0]['role'], 'admin')
+        self.assertTrue(data['users'][0]['is_self'])
+        self.assertIsNone(data['users'][0]['progress'])
+
+    def test_page_queries_do_not_grow(self):
+        with self.assertNumQueries(3):  # session, user, page with enrollments
+            self.client.get(self.url, {'limit': 2})
+        with self.assertNumQueries(3):
+            self.client.get(self.url, {'limit': 50})
+
+    def test_rejects_bad_parameters_and_non_admins(self):
+        with self.assertLogs('django.request', 'WARNING'):
+            self.assertEqual(self.fetch(sort='password')[0], 400)
+            self.assertEqual(self.fetch(role='root')[0], 400)
+            self.assertEqual(self.fetch(after='garbage')[0], 400)
+            self.assertEqual(self.fetch(sort='email', after=encode_cursor(['x', 1, 2]))[0], 400)
+        self.client.force_login(self.instructor)
+        with self.assertLogs('django.request', 'WARNING'):
+            self.assertEqual(self.fetch()[0], 403)
+
+    def test_cursor_round_trip(self):
+        joined = self.admin.date_joined
+        self.assertEqual(decode_cursor(encode_cursor([joined, 7])), [joined.isoformat(), 7])
@@ -0,0 +1,126 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from unittest import mock
+from course.models import CustomUserModel, Course, Module, Lesson, ChunkedUpload
+from course.utils.uploads import claim_upload, create_upload, staging_path
+from django.core.exceptions import ValidationError
+import base64
+import os
+import shutil
+import tempfile
+
+
+class ChunkedUploadTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.override = override_settings(
+            STORAGES={
+                'default': {
+                    'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                    'OPTIONS': {'location': self.root, 'base_url': '/data/'},
+                },
+                'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+            },
+            RESUMABLE_UPLOAD_DIR=os.path.join(self.root, 'tmp', 'resumable'),
+            RESUMABLE_CHUNK_SIZE=4,
+        )
+        self.override.enable()
+        self.instructor = CustomUserModel.objects.create_user(
+            'instructor@test.com', 'Test', 'Instructor',
+            password='testpass123', username='instructor', is_instructor=True
+        )
+        course = Course.objects.create(title='Test Course', instructor=self.instructor)
+        module = Module.objects.create(course=course, instructor=self.instructor, title='Module', order=1)
+        self.lesson = Lesson.objects.create(module=module, title='Video', order=1, lesson_type='video')
+        self.client.force_login(self.instructor)
+        self.content = b'0123456789'
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.root)
+
+    def _create(self):
+        response = self.client.post(
+            reverse('course:create_chunked_upload'),
+            headers={
+                'Upload-Length': str(len(self.content)),
+                'Upload-Metadata': 'filename ' + base64.b64encode(b'lecture.mp4').decode(),
+            },
+        )
+        self.assertEqual(response.status_code, 201)
+        return response['Location']
+
+    def _patch(self, url, offset):
+        return self.client.patch(
+            url, self.content[offset:offset + 4],
+            content_type='application/offset+octet-stream',
+            headers={'Upload-Offset': str(offset)},
+        )
+
+    def test_out_of_order_chunks_and_resume(self):
+        url = self._create()
+        self.assertEqual(self._patch(url, 8).status_code, 204)
+        head = self.client.head(url)
+        self.assertEqual(head['Upload-Offset'], '0')
+        self.assertEqual(head['Upload-Received'], '2')
+
+        self.assertEqual(self._patch(url, 0)['Upload-Offset'], '4')
+        self.assertEqual(self._patch(url, 3).status_code, 409)  # not on a chunk boundary
+        self.assertEqual(self._patch(url, 4)['Upload-Offset'], '10')
+
+    def test_finished_upload_is_moved_onto_lesson(self):
+        url = self._create()
+        for offset in (0, 4, 8):
+            self._patch(url, offset)
+        upload_id = url.rstrip('/').split('/')[-1]
+
+        with mock.patch('course.views.start_video_transcode'), \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('course:save_lesson', args=[self.lesson.id]),
+                {'title': 'Video', 'lesson_type': 'video', 'video_upload_id': upload_id},
+            )
+        self.assertTrue(response.json()['success'])
+
+        self.lesson.refresh_from_db()
+        self.assertEqual(self.lesson.video_file.name, f'media/lecture_{upload_id.replace("-", "")[:8]}.mp4')
+        with open(self.lesson.video_file.path, 'rb') as fh:
+            self.assertEqual(fh.read(), self.content)
+        self.assertFalse(ChunkedUpload.objects.exists())
+        self.assertEqual(os.listdir(os.path.join(self.root, 'tmp', 'resumable')), [])
+
+    def test_incomplete_upload_cannot_be_attached(self):
+        url = self._create()
+        self._patch(url, 0)
+        response = self.client.post(
+            reverse('course:save_lesson', args=[self.lesson.id]),
+            {'title': 'Video', 'lesson_type': 'video', 'video_upload_id': url.rstrip('/').split('/')[-1]},
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_upload_can_only_be_claimed_once(self):
+        url = self._create()
+        for offset in (0, 4, 8):
+            self._patch(url, offset)
+        upload_id = url.rstrip('/').split('/')[-1]
+
+        claim_upload(upload_id, self.instructor)
+        with self.assertRaisesMessage(ValidationError, 'bereits verwendet'):
+            claim_upload(upload_id, self.instructor)
+
+    def test_claimed_upload_rejects_chunks(self):
+        url = self._create()
+        for offset in (0, 4, 8):
+            self._patch(url, offset)
+        upload = claim_upload(url.rstrip('/').split('/')[-1], self.instructor)
+        self.assertEqual(self._patch(url, 4).status_code, 409)
+
+        # Claimed after the view loaded the upload: the staging file is already gone
+        ChunkedUpload.objects.filter(pk=upload.pk).update(claimed_at=None)
+        os.remove(staging_path(upload))
+        self.assertEqual(self._patch(url, 4).status_code, 409)
+
+    def test_empty_file_is_complete_immediately(self):
+        upload = create_upload(self.instructor, 'empty.txt', 0)
+        self.assertTrue(upload.is_complete)
+        self.assertEqual(claim_upload(upload.id, self.instructor), upload)
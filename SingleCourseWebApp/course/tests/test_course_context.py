@@ -0,0 +1,49 @@
+from django.db import connection
+from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from course.context import CourseContext
+from course.models import CustomUserModel, Course, Module, Lesson, Enrollment, Group
+
+
+class CourseContextTests(TestCase):
+    def setUp(self):
+        self.instructor = CustomUserModel.objects.create_user(
+            'instructor@test.com', 'Test', 'Instructor',
+            password='testpass123', username='instructor', is_instructor=True
+        )
+        self.student = CustomUserModel.objects.create_user(
+            'student@test.com', 'Test', 'Student',
+            password='testpass123', username='student', is_student=True
+        )
+        self.course = Course.objects.create(title='Test Course', instructor=self.instructor, is_published=True)
+        module = Module.objects.create(course=self.course, instructor=self.instructor, title='Module', order=1)
+        self.lesson = Lesson.objects.create(
+            module=module, title='Reading', order=1, lesson_type='reading', lesson_content='Hello'
+        )
+        Enrollment.objects.create(student=self.student, course=self.course)
+        Group.objects.create(course=self.course).members.add(self.student, through_defaults={'course': self.course})
+
+    def test_facts_are_lazy_and_memoised(self):
+        request = RequestFactory().get('/')
+        request.user = self.student
+        with self.assertNumQueries(0):
+            ctx = CourseContext(request)
+        with self.assertNumQueries(1):  # lesson, module and course in one join
+            ctx.lesson(self.lesson.id)
+            self.assertEqual(ctx.course, self.course)
+        with self.assertNumQueries(2):
+            for _ in range(3):
+                self.assertTrue(ctx.is_enrolled)
+                self.assertIsNotNone(ctx.group)
+                self.assertFalse(ctx.is_instructor)
+
+    def test_lesson_detail_fetches_each_fact_once(self):
+        self.client.force_login(self.student)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('course:lesson_detail', args=[self.lesson.id]))
+        self.assertEqual(response.status_code, 200)
+        sql = [q['sql'] for q in queries.captured_queries]
+        self.assertEqual(len([q for q in sql if 'FROM "course_enrollment"' in q]), 1)
+        self.assertEqual(len([q for q in sql if q.startswith('SELECT') and 'FROM "course_group"' in q]), 1)
+        self.assertEqual(len([q for q in sql if 'FROM "course_course"' in q or 'JOIN "course_course"' in q]), 1)
@@ -0,0 +1,76 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from course.models import (
+    CustomUserModel, Course, Module, Lesson, Exercise, Enrollment, Group, LessonProgress,
+)
+from course.utils.outline import get_course_outline
+import json
+
+
+class CourseOutlineTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.instructor = CustomUserModel.objects.create_user(
+            'instructor@test.com', 'Test', 'Instructor',
+            password='testpass123', username='instructor', is_instructor=True
+        )
+        self.course = Course.objects.create(title='Python', instructor=self.instructor, is_published=True)
+        self.second = Module.objects.create(course=self.course, instructor=self.instructor, title='Zwei', order=2)
+        self.first = Module.objects.create(course=self.course, instructor=self.instructor, title='Eins', order=1)
+        self.intro = Lesson.objects.create(module=self.first, title='Intro', order=1, duration=timedelta(minutes=25))
+        self.task = Lesson.objects.create(module=self.first, title='Aufgabe', order=2, lesson_type='exercise')
+        self.outro = Lesson.objects.create(module=self.second, title='Outro', order=1)
+        self.exercise = Exercise.objects.create(lesson=self.task, exercise_type='jupyter')
+
+    def test_outline_is_ordered_and_cached(self):
+        outline = get_course_outline(self.course.id)
+        self.assertEqual([m['title'] for m in outline['modules']], ['Eins', 'Zwei'])
+        self.assertEqual([l['title'] for l in outline['sequence']], ['Intro', 'Aufgabe', 'Outro'])
+        self.assertEqual(outline['sequence'][0]['minutes'], 25)
+        self.assertEqual(outline['sequence'][1]['exercise_id'], self.exercise.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_course_outline(self.course.id), outline)
+
+    def test_changes_invalidate_the_outline(self):
+        get_course_outline(self.course.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.outro.title = 'Abschluss'
+            self.outro.save()
+        self.assertEqual(get_course_outline(self.course.id)['sequence'][-1]['title'], 'Abschluss')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.exercise.delete()
+        self.assertIsNone(get_course_outline(self.course.id)['sequence'][1]['exercise_id'])
+
+        self.client.force_login(self.instructor)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('course:reorder_lessons', args=[self.first.id]),
+                json.dumps({'lessons': [{'lesson_id': self.intro.id, 'order': 3}]}),
+                content_type='application/json',
+            )
+        self.assertEqual([l['title'] for l in get_course_outline(self.course.id)['sequence']],
+                         ['Aufgabe', 'Intro', 'Abschluss'])
+
+    def test_views_overlay_the_students_progress(self):
+        student = CustomUserModel.objects.create_user(
+            'student@test.com', 'Test', 'Student', password='testpass123', username='student', is_student=True
+        )
+        Enrollment.objects.create(student=student, course=self.course)
+        Group.objects.create(course=self.course).members.add(student, through_defaults={'course': self.course})
+        LessonProgress.objects.create(student=student, lesson=self.intro, is_completed=True)
+        self.client.force_login(student)
+
+        response = self.client.get(reverse('course:course_overview', args=[self.course.id]))
+        self.assertEqual(response.context['completed_lessons'], 1)
+        self.assertEqual(response.context['total_lessons'], 3)
+        self.assertEqual(response.context['continue_lesson']['id'], self.task.id)
+        data = json.loads(response.context['debug_data_json'])
+        self.assertEqual([l['is_completed'] for l in data['modules'][0]['lessons']], [True, False])
+
+        response = self.client.get(reverse('course:lesson_detail', args=[self.task.id]))
+        lessons = response.context['modules_data'][0]['lessons']
+        self.assertEqual([(l['title'], l['is_completed']) for l in lessons], [('Intro', True), ('Aufgabe', False)])
+        self.assertContains(response, 'fa-check-circle')
@@ -0,0 +1,90 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from unittest import mock
+from course.models import CustomUserModel, Course, Module, Lesson, Enrollment, LessonProgress
+from course.utils.progress import recompute_progress
+
+
+class EnrollmentProgressTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.instructor = CustomUserModel.objects.create_user(
+            'instructor@test.com', 'Test', 'Instructor',
+            password='testpass123', username='instructor', is_instructor=True
+        )
+        self.student = CustomUserModel.objects.create_user(
+            'student@test.com', 'Test', 'Student', password='testpass123', username='student', is_student=True
+        )
+        self.course = Course.objects.create(title='Python', instructor=self.instructor, is_published=True)
+        self.module = Module.objects.create(course=self.course, instructor=self.instructor, title='Eins', order=1)
+        self.lessons = [
+            Lesson.objects.create(module=self.module, title=f'Lektion {i}', order=i) for i in range(1, 5)
+        ]
+        self.enrollment = Enrollment.objects.create(student=self.student, course=self.course)
+        self.client.force_login(self.student)
+
+    def complete(self, lesson):
+        return self.client.post(reverse('course:complete_lesson', args=[lesson.id])).json()
+
+    def test_toggling_updates_the_counters(self):
+        data = self.complete(self.lessons[0])
+        self.assertEqual(data, {'success': True, 'is_completed': True, 'next_lesson_id': self.lessons[1].id})
+        self.complete(self.lessons[1])
+        self.enrollment.refresh_from_db()
+        self.assertEqual((self.enrollment.completed_lessons, self.enrollment.total_lessons), (2, 4))
+        self.assertEqual(self.enrollment.progress, 50.0)
+        self.assertIsNotNone(LessonProgress.objects.get(student=self.student, lesson=self.lessons[0]).completed_at)
+
+        data = self.complete(self.lessons[0])
+        self.assertFalse(data['is_completed'])
+        self.enrollment.refresh_from_db()
+        self.assertEqual((self.enrollment.completed_lessons, self.enrollment.progress), (1, 25.0))
+
+    def test_last_lesson_points_to_itself(self):
+        self.assertEqual(self.complete(self.lessons[-1])['next_lesson_id'], self.lessons[-1].id)
+
+    def test_double_click_counts_once(self):
+        stale = LessonProgress.objects.create(student=self.student, lesson=self.lessons[0])
+        self.complete(self.lessons[0])  # the first click wins the race
+        with mock.patch.object(LessonProgress.objects, 'get_or_create', return_value=(stale, False)):
+            data = self.complete(self.lessons[0])  # the second read the row before the first saved
+        self.assertTrue(data['is_completed'])
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.completed_lessons, 1)
+
+    def test_adding_and_removing_lessons_recomputes(self):
+        self.complete(self.lessons[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            Lesson.objects.create(module=self.module, title='Lektion 5', order=5)
+        self.enrollment.refresh_from_db()
+        self.assertEqual((self.enrollment.completed_lessons, self.enrollment.total_lessons), (1, 5))
+        self.assertEqual(self.enrollment.progress, 20.0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lessons[0].delete()
+        self.enrollment.refresh_from_db()
+        self.assertEqual((self.enrollment.completed_lessons, self.enrollment.total_lessons, self.enrollment.progress),
+                         (0, 4, 0.0))
+
+    def test_recompute_matches_the_progress_rows(self):
+        for lesson in self.lessons[:3]:
+            LessonProgress.objects.create(student=self.student, lesson=lesson, is_completed=True)
+        self.assertEqual(recompute_progress(self.course.id), 1)
+        self.enrollment.refresh_from_db()
+        self.assertEqual((self.enrollment.completed_lessons, self.enrollment.progress), (3, 75.0))
+
+    def test_cascades_queue_one_recompute(self):
+        self.complete(self.lessons[0])
+        second = Module.objects.create(course=self.course, instructor=self.instructor, title='Zwei', order=2)
+        Lesson.objects.create(module=second, title='Lektion 5', order=5)
+        for delete in (self.module.delete, Lesson.objects.filter(module=second).delete):
+            with mock.patch('course.signals.recompute_progress') as recompute, \
+                    self.captureOnCommitCallbacks(execute=True):
+                delete()
+            recompute.assert_called_once_with(self.course.id)
+
+        with mock.patch('course.signals.recompute_progress') as recompute, \
+                self.captureOnCommitCallbacks(execute=True):
+            self.course.delete()
+        recompute.assert_not_called()
@@ -0,0 +1,94 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from course.models import (
+    CustomUserModel, Course, Module, Lesson, Exercise, Group, Submission, SubmissionFile,
+)
+
+
+class ExerciseSubmissionsTests(TestCase):
+    """The JSON list of exercise_submissions: newest submission per group, filtered and paged."""
+
+    def setUp(self):
+        self.admin = CustomUserModel.objects.create_user(
+            'admin@test.com', 'Course', 'Admin', password='testpass123', username='admin',
+            is_instructor=True, is_superuser=True, is_student=False,
+        )
+        self.course = Course.objects.create(title='Python', instructor=self.admin, is_published=True)
+        module = Module.objects.create(course=self.course, instructor=self.admin, title='Eins', order=1)
+        lesson = Lesson.objects.create(module=module, title='Aufgabe', order=1, lesson_type='exercise')
+        self.exercise = Exercise.objects.create(lesson=lesson, exercise_type='jupyter', maximum_points=10, pass_points=5)
+        self.url = reverse('course:exercise_submissions', args=[self.exercise.id])
+        self.client.force_login(self.admin)
+
+        # Five groups of two; every group submits twice, the newest submission decides
+        start = timezone.now() - timedelta(days=1)
+        self.latest = {}
+        for g in range(5):
+            group = Group.objects.create(course=self.course)
+            students = []
+            for i in range(2):
+                student = CustomUserModel.objects.create_user(
+                    f's{g}{i}@test.com', 'Student', f'{g}{i}', password='x', username=f's{g}{i}', is_student=True
+                )
+                group.members.add(student, through_defaults={'course': self.course})
+                students.append(student)
+            for attempt, student in enumerate(students):
+                submission = Submission.objects.create(exercise=self.exercise, student=student)
+                # All groups share one timestamp per attempt, so pages must break ties by id
+                Submission.objects.filter(id=submission.id).update(submitted_at=start + timedelta(hours=attempt))
+                SubmissionFile.objects.create(submission=submission, file=f'exercise_submissions/{g}_{attempt}.ipynb')
+            self.latest[group.id] = submission
+        graded = list(self.latest.values())
+        graded[0].score = 8
+        graded[0].save()  # passed
+        graded[1].score = 2
+        graded[1].save()  # failed
+
+    def fetch(self, **params):
+        response = self.client.get(self.url, params, HTTP_ACCEPT='application/json')
+        return response.status_code, response.json()
+
+    def test_lists_the_latest_submission_of_each_group(self):
+        status, data = self.fetch()
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            {row['id'] for row in data['submissions']},
+            {submission.id for submission in self.latest.values()},
+        )
+        self.assertEqual(
+            {row['group'] for row in data['submissions']},
+            {f'Group {group_id}' for group_id in self.latest},
+        )
+        self.assertIsNone(data['next'])
+        self.assertEqual(len(data['submissions'][0]['files']), 1)
+
+    def test_status_filters(self):
+        counts = {status: len(self.fetch(status=status)[1]['submissions']) for status in ('graded', 'ungraded', 'passed')}
+        self.assertEqual(counts, {'graded': 2, 'ungraded': 3, 'passed': 1})
+        with self.assertLogs('django.request', 'WARNING'):
+            self.assertEqual(self.fetch(status='bogus')[0], 400)
+
+    def test_keyset_pages_cover_every_group_once(self):
+        seen, after = [], None
+        while True:
+            params = {'limit': 2}
+            if after:
+                params['after'] = after
+            status, data = self.fetch(**params)
+            self.assertEqual(status, 200)
+            self.assertLessEqual(len(data['submissions']), 2)
+            seen.extend(row['id'] for row in data['submissions'])
+            after = data['next']
+            if not after:
+                break
+        self.assertEqual(sorted(seen), sorted(submission.id for submission in self.latest.values()))
+        with self.assertLogs('django.request', 'WARNING'):
+            self.assertEqual(self.fetch(after='not-a-cursor')[0], 400)
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        with self.assertNumQueries(5):  # session, user, exercise, page, files
+            self.client.get(self.url, {'limit': 1}, HTTP_ACCEPT='application/json')
+        with self.assertNumQueries(5):
+            self.client.get(self.url, {'limit': 50}, HTTP_ACCEPT='application/json')
@@ -0,0 +1,115 @@
+from django.test import SimpleTestCase, RequestFactory
+from course.utils.serving import serve_file, serve_static, parse_range_header
+import gzip
+import os
+import shutil
+import tempfile
+
+
+class RangeServingTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.root = tempfile.mkdtemp()
+        self.content = bytes(range(256)) * 40  # 10240 bytes
+        with open(os.path.join(self.root, 'video.mp4'), 'wb') as f:
+            f.write(self.content)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _get(self, **headers):
+        request = self.factory.get('/data/video.mp4', **headers)
+        return serve_file(request, 'video.mp4', document_root=self.root)
+
+    def test_parse_range_header(self):
+        self.assertIsNone(parse_range_header(None, 100))
+        self.assertIsNone(parse_range_header('items=0-1', 100))
+        self.assertEqual(parse_range_header('bytes=0-9', 100), [(0, 9)])
+        self.assertEqual(parse_range_header('bytes=-10', 100), [(90, 99)])
+        self.assertEqual(parse_range_header('bytes=95-', 100), [(95, 99)])
+        self.assertEqual(parse_range_header('bytes=0-9,5-19,50-59', 100), [(0, 19), (50, 59)])
+        self.assertEqual(parse_range_header('bytes=200-300', 100), [])
+
+    def test_full_response_has_validators(self):
+        response = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+
+    def test_single_range(self):
+        response = self._get(HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 100-199/10240')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(b''.join(response.streaming_content), self.content[100:200])
+
+    def test_multi_range(self):
+        response = self._get(HTTP_RANGE='bytes=0-9,1000-1009')
+        self.assertEqual(response.status_code, 206)
+        self.assertTrue(response['Content-Type'].startswith('multipart/byteranges'))
+        body = b''.join(response.streaming_content)
+        self.assertEqual(len(body), int(response['Content-Length']))
+        self.assertIn(b'Content-Range: bytes 0-9/10240', body)
+        self.assertIn(self.content[1000:1010], body)
+
+    def test_unsatisfiable_range(self):
+        response = self._get(HTTP_RANGE='bytes=20000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10240')
+
+    def test_conditional_get(self):
+        etag = self._get()['ETag']
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        last_modified = self._get()['Last-Modified']
+        self.assertEqual(self._get(HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+    def test_stale_if_range_returns_full_body(self):
+        response = self._get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+
+class StaticServingTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.root = tempfile.mkdtemp()
+        self.content = b'console.log("hello");\n' * 100
+        with open(os.path.join(self.root, 'app.js'), 'wb') as f:
+            f.write(self.content)
+        with open(os.path.join(self.root, 'app.js.gz'), 'wb') as f:
+            f.write(gzip.compress(self.content))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _get(self, **headers):
+        request = self.factory.get('/static/app.js', **headers)
+        return serve_static(request, 'app.js', document_root=self.root)
+
+    def test_negotiates_gzip_sibling(self):
+        response = self._get(HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), self.content)
+
+    def test_ranges_are_not_advertised(self):
+        response = self._get(HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'none')
+
+        # The same for encoded data files, which serve_file always sends whole
+        request = self.factory.get('/data/app.js.gz', HTTP_RANGE='bytes=0-9')
+        response = serve_file(request, 'app.js.gz', document_root=self.root)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Accept-Ranges'], 'none')
+
+    def test_identity_without_accept_encoding(self):
+        response = self._get()
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+
+    def test_unhashed_names_must_revalidate(self):
+        response = self._get(HTTP_ACCEPT_ENCODING='gzip')
+        self.assertIn('must-revalidate', response['Cache-Control'])
+        self.assertEqual(self._get(HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
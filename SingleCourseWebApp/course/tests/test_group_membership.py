@@ -0,0 +1,70 @@
+import json
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from django.urls import reverse
+from course.models import CustomUserModel, Course, Enrollment, Group, GroupMembership
+
+
+class GroupMembershipTests(TestCase):
+    def setUp(self):
+        instructor = CustomUserModel.objects.create_user(
+            'instructor@test.com', 'Test', 'Instructor', password='x', username='instructor', is_instructor=True,
+        )
+        self.course = Course.objects.create(title='Kurs', instructor=instructor, is_published=True, max_members=2)
+        self.students = []
+        for i in range(3):
+            student = CustomUserModel.objects.create_user(
+                f'student{i}@test.com', 'Test', f'Student{i}', password='x', username=f'student{i}', is_student=True,
+            )
+            Enrollment.objects.create(student=student, course=self.course)
+            self.students.append(student)
+        self.group = Group.objects.create(course=self.course)
+        self.other = Group.objects.create(course=self.course)
+
+    def test_database_allows_one_group_per_course(self):
+        self.group.members.add(self.students[0], through_defaults={'course': self.course})
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.other.members.add(self.students[0], through_defaults={'course': self.course})
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            GroupMembership.objects.create(group=self.other, course=self.course, student=self.students[0])
+
+    def test_add_member(self):
+        with self.assertNumQueries(6):  # enrollment, locked group, count, insert, savepoint + release
+            self.group.add_member(self.students[0])
+        self.assertEqual(list(self.group.members.all()), [self.students[0]])
+
+        with self.assertRaisesMessage(ValidationError, 'already in another group'):
+            self.other.add_member(self.students[0])
+        self.group.add_member(self.students[1])
+        with self.assertRaisesMessage(ValidationError, 'Group is full'):
+            self.group.add_member(self.students[2])
+        outsider = CustomUserModel.objects.create_user(
+            'outsider@test.com', 'Test', 'Outsider', password='x', username='outsider', is_student=True,
+        )
+        with self.assertRaisesMessage(ValidationError, 'not enrolled'):
+            self.other.add_member(outsider)
+        self.assertEqual(GroupMembership.objects.count(), 2)
+
+        self.group.remove_member(self.students[0])
+        self.other.add_member(self.students[0])
+        with self.assertRaisesMessage(ValidationError, 'not a member'):
+            self.group.remove_member(self.students[0])
+
+    def test_join_group(self):
+        self.client.force_login(self.students[0])
+        url = reverse('course:join_group', args=[self.course.id])
+        response = self.client.post(url, json.dumps({'group_id': self.group.id}), content_type='application/json')
+        self.assertEqual(response.json(), {'success': True})
+
+        with self.assertLogs('django.request', 'WARNING'):
+            response = self.client.post(url, json.dumps({'group_id': self.other.id}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'You are already in a group for this course')
+        self.assertEqual(list(self.students[0].course_groups.all()), [self.group])
+
+        self.group.add_member(self.students[1])
+        self.client.force_login(self.students[2])
+        with self.assertLogs('django.request', 'WARNING'):
+            response = self.client.post(url, json.dumps({'group_id': self.group.id}), content_type='application/json')
+        self.assertEqual(response.json()['error'], 'This group is full')
@@ -2,7 +2,7 @@ from django.test import TestCase, override_settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.exceptions import ValidationError
 from django.conf import settings
-from .models import (
+from course.models import (
     CustomUserModel, Course, Module, Lesson, Exercise,
     ExerciseMaterial, JupyterLabImage, Group
 )
@@ -144,7 +144,7 @@ class JupyterExerciseTests(TestCase):
 
         # Create group and add member
         group = Group.objects.create(course=self.course)
-        group.members.add(self.student)
+        group.members.add(self.student, through_defaults={'course': self.course})
 
         # Check if files were copied to the group directory
         group_dir = os.path.join(TEMP_MEDIA_ROOT, 'user_directories', f'group_{group.id}', exercise.lesson.title)
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from unittest import mock
+import time
+from course.models import CustomUserModel, Course, Group
+from course.utils import activity
+from course.utils.activity import record_activity, flush_last_seen, last_seen_key
+
+
+class LastSeenTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        activity._recorded.clear()
+        activity._pruned_at = float('-inf')
+        self.instructor = CustomUserModel.objects.create_user(
+            'instructor@test.com', 'Test', 'Instructor',
+            password='testpass123', username='instructor', is_instructor=True
+        )
+        self.student = CustomUserModel.objects.create_user(
+            'student@test.com', 'Test', 'Student',
+            password='testpass123', username='student', is_student=True
+        )
+        course = Course.objects.create(title='Test Course', instructor=self.instructor)
+        self.group = Group.objects.create(course=course)
+        self.group.members.add(self.student, through_defaults={'course': course})
+
+    def test_activity_is_buffered_and_flushed_in_one_update(self):
+        with mock.patch.object(activity, 'run_in_background') as background:
+            with self.assertNumQueries(0):
+                for _ in range(5):
+                    record_activity(self.student.id)
+                record_activity(self.instructor.id)
+        background.assert_called_once()  # one flush per interval, not per request
+
+        with self.assertNumQueries(3):  # savepoint, UPDATE ... FROM (VALUES ...), release
+            self.assertEqual(flush_last_seen(), 2)
+        self.student.refresh_from_db()
+        self.assertIsNotNone(self.student.last_seen)
+
+        # Activity later in the same interval is written by the next flush
+        seen = self.student.last_seen
+        cache.set(last_seen_key(self.student.id), seen.timestamp() + 60)
+        flush_last_seen()
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.last_seen, seen + timedelta(seconds=60))
+
+        # Once an interval has ended and been read in full, it is not read again
+        interval = activity._interval()
+        with mock.patch.object(activity, '_interval', return_value=interval + 1):
+            self.assertEqual(flush_last_seen(), 2)
+        with mock.patch.object(activity, '_interval', return_value=interval + 2), self.assertNumQueries(0):
+            self.assertEqual(flush_last_seen(), 0)
+
+    def test_flush_only_reads_active_users(self):
+        for i in range(3):
+            CustomUserModel.objects.create_user(
+                f'idle{i}@test.com', 'Idle', str(i), password='x', username=f'idle{i}'
+            )
+        with mock.patch.object(activity, 'run_in_background'):
+            record_activity(self.student.id)
+        with mock.patch.object(activity, 'buffered_last_seen', wraps=activity.buffered_last_seen) as buffered:
+            self.assertEqual(flush_last_seen(), 1)
+        self.assertEqual(list(buffered.call_args.args[0]), [self.student.id])
+
+    def test_old_entries_are_pruned(self):
+        activity._recorded[self.instructor.id] = time.monotonic() - 2 * settings.LAST_SEEN_RESOLUTION
+        with mock.patch.object(activity, 'run_in_background'):
+            record_activity(self.student.id)
+        self.assertEqual(list(activity._recorded), [self.student.id])
+
+    def test_flush_never_moves_last_seen_backwards(self):
+        recent = datetime.now(dt_timezone.utc).replace(microsecond=0)
+        CustomUserModel.objects.filter(pk=self.student.pk).update(last_seen=recent)
+        cache.set(last_seen_key(self.student.id), (recent - timedelta(hours=1)).timestamp())
+        activity._mark_dirty(self.student.id)
+        flush_last_seen()
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.last_seen, recent)
+
+    def test_requests_are_tracked_and_members_show_buffered_activity(self):
+        self.client.force_login(self.student)
+        with mock.patch.object(activity, 'run_in_background'):
+            self.client.get(reverse('course:get_group_members', args=[self.group.id]))  # 403 still counts
+        self.assertIsNotNone(cache.get(last_seen_key(self.student.id)))
+
+        self.client.force_login(self.instructor)
+        with mock.patch.object(activity, 'run_in_background'):
+            members = self.client.get(reverse('course:get_group_members', args=[self.group.id])).json()
+        self.assertNotEqual(members[0]['last_active'], 'Never')
@@ -0,0 +1,76 @@
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from unittest import mock
+from course.log import JsonFormatter, SamplingFilter, QueueFileHandler
+from course.models import CustomUserModel
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+
+def make_record(name='course.views', level=logging.INFO, msg='hello %s', args=('world',), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class StructuredLoggingTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def test_json_lines_with_extra_fields(self):
+        entry = json.loads(JsonFormatter().format(make_record(lesson_id=7)))
+        self.assertEqual(entry['message'], 'hello world')
+        self.assertEqual(entry['level'], 'INFO')
+        self.assertEqual(entry['lesson_id'], 7)
+
+    def test_sampling_is_per_logger_and_spares_warnings(self):
+        sampler = SamplingFilter({'course': 0.0, 'course.views': 1.0})
+        self.assertTrue(sampler.filter(make_record('course.views.detail')))
+        self.assertFalse(sampler.filter(make_record('course.shib_middleware')))
+        self.assertTrue(sampler.filter(make_record('course.shib_middleware', logging.ERROR)))
+        self.assertTrue(sampler.filter(make_record('django.request')))
+
+    def test_records_are_written_by_the_listener(self):
+        path = os.path.join(self.root, 'logs', 'app.log')
+        handler = QueueFileHandler(path, max_bytes=200, backup_count=2)
+        try:
+            handler.handle(make_record(request=object()))
+        finally:
+            handler.close()
+        with open(path) as fh:
+            entry = json.loads(fh.readline())
+        self.assertEqual(entry['message'], 'hello world')
+        self.assertTrue(entry['request'].startswith('<object'))  # stringified on the request thread
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = QueueFileHandler(os.path.join(self.root, 'app.log'), queue_size=2)
+        handler.listener.stop()  # nothing drains the queue any more
+        handler.listener = None
+        self.addCleanup(handler.close)
+        with mock.patch.object(handler.queue, 'put', wraps=handler.queue.put) as put:
+            for _ in range(5):
+                handler.handle(make_record())
+        self.assertEqual(handler.dropped, 3)
+        self.assertTrue(all(call.kwargs.get('block') is False for call in put.call_args_list))
+
+
+class MassEmailLoggingTests(TestCase):
+    def test_subject_body_and_addresses_are_not_logged(self):
+        admin = CustomUserModel.objects.create_superuser(
+            'admin@test.com', 'Test', 'Admin', password='x', username='admin'
+        )
+        self.client.force_login(admin)
+        with self.assertLogs('course.views', logging.INFO) as logs, \
+                mock.patch('course.utils.activity.run_in_background'):
+            response = self.client.post(reverse('course:admin_send_email'), {
+                'subject': 'Geheimer Betreff', 'content': 'Geheimer Text', 'recipients': 'all',
+            })
+        self.assertTrue(response.json()['success'])
+        output = '\n'.join(logs.output)
+        self.assertIn('1 recipients (group: all)', output)
+        for secret in ('Geheimer', 'admin@test.com'):
+            self.assertNotIn(secret, output)
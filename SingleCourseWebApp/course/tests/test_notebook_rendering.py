@@ -0,0 +1,104 @@
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from course.models import (
+    CustomUserModel, Course, Module, Lesson, Exercise, Group, Submission, SubmissionFile,
+)
+from course.utils import notebooks
+import json
+import os
+import shutil
+import tempfile
+
+NOTEBOOK = {
+    "cells": [
+        {"cell_type": "markdown", "source": ["# Title\n", "<script>alert(1)</script>"]},
+        {"cell_type": "code", "source": "print('<b>')", "outputs": [
+            {"output_type": "stream", "name": "stdout", "text": ["<b>\n"]},
+        ]},
+    ],
+    "metadata": {}, "nbformat": 4, "nbformat_minor": 5,
+}
+
+
+class NotebookRenderingTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        storages = {
+            'default': {
+                'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                'OPTIONS': {'location': self.root, 'base_url': '/data/'},
+            },
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+        }
+        self.override = override_settings(
+            STORAGES=storages, NOTEBOOK_CACHE_ROOT=os.path.join(self.root, 'cache')
+        )
+        self.override.enable()
+
+        self.instructor = CustomUserModel.objects.create_user(
+            'instructor@test.com', 'Test', 'Instructor',
+            password='testpass123', username='instructor', is_instructor=True
+        )
+        self.student = CustomUserModel.objects.create_user(
+            'student@test.com', 'Test', 'Student',
+            password='testpass123', username='student', is_student=True
+        )
+        course = Course.objects.create(title='Test Course', instructor=self.instructor)
+        module = Module.objects.create(course=course, instructor=self.instructor, title='Module', order=1)
+        lesson = Lesson.objects.create(module=module, title='Exercise', order=1, lesson_type='exercise')
+        self.exercise = Exercise.objects.create(lesson=lesson)
+        Group.objects.create(course=course).members.add(self.student, through_defaults={'course': course})
+        submission = Submission.objects.create(exercise=self.exercise, student=self.student)
+        self.file = SubmissionFile(submission=submission)
+        self.file.file.save('solution.ipynb', ContentFile(json.dumps(NOTEBOOK)))
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.root)
+
+    def test_render_escapes_and_sanitizes(self):
+        html = notebooks.render_notebook(NOTEBOOK)
+        self.assertNotIn('<script>', html)
+        self.assertIn('print(&#x27;&lt;b&gt;&#x27;)', html)
+        self.assertIn('<pre class="output-stream">&lt;b&gt;\n</pre>', html)
+
+    def test_rendered_html_is_cached_by_file_and_mtime(self):
+        cache.set(notebooks.PRUNE_LOCK_KEY, True)  # no background pruning during the test
+        html, etag = notebooks.notebook_html(self.file.file.path)
+        key = notebooks.file_key(self.file.file.path)
+        cache_file = os.path.join(self.root, 'cache', f'v{notebooks.RENDER_VERSION}', key[:2], f'{key}.html')
+        self.assertTrue(os.path.exists(cache_file))
+        with open(cache_file, 'w') as fh:
+            fh.write('cached')
+        self.assertEqual(notebooks.notebook_html(self.file.file.path), ('cached', etag))
+
+        # A changed file gets a new entry; entries unused for the max age and old versions are pruned
+        os.utime(self.file.file.path, ns=(0, 0))
+        self.assertNotEqual(notebooks.notebook_html(self.file.file.path)[1], etag)
+        old_version = os.path.join(self.root, 'cache', 'v0')
+        os.makedirs(old_version)
+        os.utime(cache_file, (0, 0))
+        self.assertEqual(notebooks.prune_notebook_cache(), 1)
+        self.assertFalse(os.path.exists(cache_file))
+        self.assertFalse(os.path.exists(old_version))
+
+    def test_endpoint_requires_instructor_and_supports_etag(self):
+        url = reverse('course:render_submission_file', args=[self.file.id])
+        self.client.force_login(self.student)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_login(self.instructor)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'notebook-cell', response.content)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_compare_with_reference(self):
+        self.exercise.reference_solution.save('reference.ipynb', ContentFile(json.dumps(NOTEBOOK)))
+        self.client.force_login(self.instructor)
+        url = reverse('course:render_submission_file', args=[self.file.id])
+        response = self.client.get(url, {'compare': 'reference'})
+        self.assertContains(response, 'notebook-diff')
+        self.assertContains(response, 'diff-unchanged')
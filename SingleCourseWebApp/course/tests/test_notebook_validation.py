@@ -0,0 +1,129 @@
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from unittest import mock
+from course.models import CustomUserModel, Course, Module, Lesson, Exercise, Group, Submission
+from course.utils import notebook_validation
+from course.utils.notebook_validation import validate_notebook
+import json
+import os
+import shutil
+import tempfile
+
+
+def notebook(*cells, nbformat=4):
+    return {"cells": list(cells), "metadata": {}, "nbformat": nbformat, "nbformat_minor": 5}
+
+
+def code_cell(output_text=""):
+    return {"cell_type": "code", "source": "print(1)", "metadata": {}, "outputs": [
+        {"output_type": "stream", "name": "stdout", "text": [output_text]},
+    ]}
+
+
+def upload(content, name='solution.ipynb'):
+    if not isinstance(content, bytes):
+        content = json.dumps(content).encode()
+    return SimpleUploadedFile(name, content)
+
+
+@override_settings(NOTEBOOK_MAX_BYTES=10_000, NOTEBOOK_MAX_OUTPUT_BYTES=1_000, NOTEBOOK_MAX_CELLS=5)
+class ValidateNotebookTests(SimpleTestCase):
+    def assertRejected(self, content, message):
+        with self.assertRaisesMessage(ValidationError, message):
+            validate_notebook(upload(content))
+
+    def test_valid_notebook_returns_cell_count_and_rewinds(self):
+        file = upload(notebook(code_cell('x'), {"cell_type": "markdown", "source": ["# Hi"]}))
+        self.assertEqual(validate_notebook(file), 2)
+        self.assertEqual(file.tell(), 0)
+
+    def test_structure_is_checked(self):
+        self.assertRejected(b'{"cells": [', 'kein gültiges JSON')
+        self.assertRejected([1, 2], 'kein Jupyter-Notebook')
+        self.assertRejected(notebook(nbformat=3), 'nbformat 4')
+        self.assertRejected({"nbformat": 4}, 'keine Zellen-Liste')
+        self.assertRejected(notebook({"cell_type": "widget", "source": ""}), 'Zelle 1 ist ungültig')
+        self.assertRejected(notebook({"cell_type": "code"}), 'Zelle 1 ist ungültig')
+
+    def test_size_caps(self):
+        self.assertRejected(notebook(*[code_cell()] * 6), 'mehr als 5 Zellen')
+        self.assertRejected(notebook(code_cell('x' * 400), code_cell('x' * 1_200)), 'Zelle 2')
+        # Many small outputs are fine as long as each one stays under the cap
+        self.assertEqual(validate_notebook(upload(notebook(*[code_cell('x' * 900)] * 5))), 5)
+        self.assertRejected(notebook(code_cell(' ' * 20_000)), 'größer als')
+
+    def test_oversized_stream_stops_early(self):
+        # No size attribute: the bounded reader has to catch it mid-parse
+        path = os.path.join(tempfile.mkdtemp(), 'big.ipynb')
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        with open(path, 'wb') as fh:
+            fh.write(b'{"cells": [' + b'{"cell_type": "raw", "source": ""},' * 5_000 + b'{}]}')
+        with mock.patch.object(notebook_validation.os.path, 'getsize', return_value=0), \
+                self.assertRaisesMessage(ValidationError, 'größer als'):
+            validate_notebook(path)
+
+    def test_json_fallback_without_ijson(self):
+        with mock.patch.object(notebook_validation, 'ijson', None):
+            self.assertEqual(validate_notebook(upload(notebook(code_cell('x')))), 1)
+            with self.assertRaisesMessage(ValidationError, 'Zelle 1'):
+                validate_notebook(upload(notebook(code_cell('x' * 2_000))))
+
+
+@override_settings(NOTEBOOK_MAX_OUTPUT_BYTES=1_000)
+class NotebookEntryPointTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.override = override_settings(
+            STORAGES={
+                'default': {
+                    'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                    'OPTIONS': {'location': self.root, 'base_url': '/data/'},
+                },
+                'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+            },
+            DATA_ROOT=self.root, MEDIA_ROOT=self.root,
+            USER_FILES_ROOT=os.path.join(self.root, 'user_files'),
+        )
+        self.override.enable()
+        self.instructor = CustomUserModel.objects.create_user(
+            'instructor@test.com', 'Test', 'Instructor',
+            password='testpass123', username='instructor', is_instructor=True
+        )
+        self.student = CustomUserModel.objects.create_user(
+            'student@test.com', 'Test', 'Student',
+            password='testpass123', username='student', is_student=True
+        )
+        course = Course.objects.create(title='Test Course', instructor=self.instructor)
+        module = Module.objects.create(course=course, instructor=self.instructor, title='Module', order=1)
+        self.lesson = Lesson.objects.create(module=module, title='Exercise', order=1, lesson_type='exercise')
+        self.exercise = Exercise.objects.create(lesson=self.lesson)
+        self.group = Group.objects.create(course=course)
+        self.group.members.add(self.student, through_defaults={'course': course})
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.root)
+
+    def test_reference_solution_with_huge_output_is_rejected(self):
+        self.client.force_login(self.instructor)
+        response = self.client.post(
+            reverse('course:upload_reference_solution', args=[self.exercise.id]),
+            {'file': upload(notebook(code_cell('x' * 2_000)))},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Ausgaben löschen', response.json()['error'])
+        self.exercise.refresh_from_db()
+        self.assertFalse(self.exercise.reference_solution)
+
+    def test_malformed_submission_is_not_recorded(self):
+        work_dir = os.path.join(self.root, 'user_files', f'group_{self.group.id}', self.lesson.title)
+        os.makedirs(work_dir)
+        with open(os.path.join(work_dir, 'solution.ipynb'), 'w') as fh:
+            fh.write('{"cells": [')
+        self.client.force_login(self.student)
+        response = self.client.post(reverse('course:submit_exercise', args=[self.lesson.id]))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('solution.ipynb', response.json()['error'])
+        self.assertFalse(Submission.objects.exists())
@@ -0,0 +1,79 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from course.models import CustomUserModel, Course, Module, Lesson, Enrollment, LessonProgress
+from course.utils.outline import get_course_outline
+from course.utils.progress import get_progress_matrix
+
+
+def completed(hex_bits, count):
+    bits = int(hex_bits, 16)
+    return [bool(bits >> i & 1) for i in range(count)]
+
+
+class ProgressMatrixTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.instructor = CustomUserModel.objects.create_user(
+            'instructor@test.com', 'Test', 'Instructor',
+            password='testpass123', username='instructor', is_instructor=True
+        )
+        self.course = Course.objects.create(title='Python', instructor=self.instructor, is_published=True)
+        module = Module.objects.create(course=self.course, instructor=self.instructor, title='Eins', order=1)
+        self.lessons = [Lesson.objects.create(module=module, title=f'Lektion {i}', order=i) for i in range(6)]
+        self.students = []
+        for name in ('Berg', 'Adler'):
+            student = CustomUserModel.objects.create_user(
+                f'{name.lower()}@test.com', 'Test', name, password='x', username=name.lower(), is_student=True
+            )
+            Enrollment.objects.create(student=student, course=self.course)
+            self.students.append(student)
+        berg, adler = self.students
+        for lesson in (self.lessons[0], self.lessons[5]):
+            LessonProgress.objects.create(student=berg, lesson=lesson, is_completed=True,
+                                          completed_at=timezone.now(), time_spent=timedelta(minutes=3))
+        LessonProgress.objects.create(student=adler, lesson=self.lessons[1], time_spent=timedelta(seconds=40))
+
+    def test_bitsets_follow_the_lesson_order(self):
+        matrix = get_progress_matrix(self.course.id)
+        self.assertEqual([l['id'] for l in matrix['lessons']], [l.id for l in self.lessons])
+        adler, berg = matrix['students']  # sorted by last name
+        self.assertEqual((adler['name'], adler['completed'], adler['count']), ('Test Adler', '0', 0))
+        self.assertEqual(completed(berg['completed'], 6), [True, False, False, False, False, True])
+        self.assertEqual(berg['count'], 2)
+        self.assertNotIn('details', berg)
+
+    def test_details_include_time_spent(self):
+        adler, berg = get_progress_matrix(self.course.id, details=True)['students']
+        self.assertEqual(adler['details'], [[1, None, 40]])
+        self.assertEqual(sorted(d[0] for d in berg['details']), [0, 5])
+        self.assertTrue(all(d[1] and d[2] == 180 for d in berg['details']))
+
+    def test_cached_until_the_next_completion(self):
+        get_course_outline(self.course.id)
+        with self.assertNumQueries(2):  # enrollments and progress rows
+            get_progress_matrix(self.course.id)
+        with self.assertNumQueries(0):
+            get_progress_matrix(self.course.id)
+
+        self.client.force_login(self.students[1])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('course:complete_lesson', args=[self.lessons[2].id]))
+        adler = get_progress_matrix(self.course.id)['students'][0]
+        self.assertEqual(completed(adler['completed'], 6), [False, False, True, False, False, False])
+
+    def test_api_is_for_instructors(self):
+        url = reverse('course:progress_matrix')
+        self.client.force_login(self.students[0])
+        self.assertEqual(self.client.get(url).status_code, 403)
+        with self.assertLogs('django.request', 'WARNING'):
+            self.assertEqual(self.client.get(reverse('course:progress_heatmap')).status_code, 403)
+
+        self.client.force_login(self.instructor)
+        data = self.client.get(url, {'details': '1'}).json()
+        self.assertTrue(data['success'])
+        self.assertEqual(data['encoding'], 'hex-bitset')
+        self.assertEqual(len(data['students']), 2)
+        self.assertContains(self.client.get(reverse('course:progress_heatmap')), 'progress-heatmap.js')
@@ -0,0 +1,108 @@
+from unittest import mock, skipUnless
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+from course.db_router import PIN_COOKIE, ReplicaPinMiddleware, on_primary, use_replica
+from course.models import CustomUserModel, Ticket
+import time
+
+
+@use_replica
+def probe(request):
+    """Report where reads of a course model and of sessions would go."""
+    with on_primary():
+        primary = router.db_for_read(Ticket)
+    return HttpResponse(f'{router.db_for_read(Ticket)} {router.db_for_read(Session)} {primary}')
+
+
+@mock.patch('course.db_router.replica_alias', return_value='replica')
+class ReplicaRouterTests(SimpleTestCase):
+    """Routing decisions; no query runs, so no second database is needed."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_reads_of_get_requests_go_to_the_replica(self, _):
+        self.assertEqual(probe(self.factory.get('/')).content, b'replica default default')
+        self.assertEqual(router.db_for_read(Ticket), 'default')  # outside the view
+
+    def test_writes_and_pinned_users_stay_on_the_primary(self, _):
+        self.assertEqual(probe(self.factory.post('/')).content, b'default default default')
+        pinned = self.factory.get('/')
+        pinned.COOKIES[PIN_COOKIE] = str(time.time() + 5)
+        self.assertEqual(probe(pinned).content, b'default default default')
+        expired = self.factory.get('/')
+        expired.COOKIES[PIN_COOKIE] = str(time.time() - 1)
+        self.assertEqual(probe(expired).content, b'replica default default')
+
+    def test_a_write_pins_the_user(self, _):
+        def writes(request):
+            router.db_for_write(Ticket)
+            return probe(request)  # the same request now reads its own write
+
+        response = ReplicaPinMiddleware(writes)(self.factory.get('/'))
+        self.assertEqual(response.content, b'default default default')
+        self.assertGreater(float(response.cookies[PIN_COOKIE].value), time.time())
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], settings.REPLICA_PIN_SECONDS)
+
+        # Reads and session saves do not pin
+        def saves_session(request):
+            router.db_for_write(Session)
+            return probe(request)
+
+        for view in (probe, saves_session):
+            self.assertNotIn(PIN_COOKIE, ReplicaPinMiddleware(view)(self.factory.get('/')).cookies)
+
+    def test_everything_on_the_primary_without_a_replica(self, replica_alias):
+        replica_alias.return_value = None
+        self.assertEqual(probe(self.factory.get('/')).content, b'default default default')
+        response = ReplicaPinMiddleware(lambda request: (router.db_for_write(Ticket), HttpResponse())[1])(
+            self.factory.get('/')
+        )
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+
+@skipUnless(
+    'replica' in settings.DATABASES and not settings.DATABASES['replica'].get('TEST', {}).get('MIRROR'),
+    'needs a second, writable database configured as "replica"',
+)
+class TwoDatabaseTests(TestCase):
+    """Against two real databases: reporting views read the replica until the user writes."""
+
+    # The runner sets up every alias named here, even for skipped classes
+    databases = {'default', 'replica'} if 'replica' in settings.DATABASES else {'default'}
+
+    def setUp(self):
+        self.admin = CustomUserModel.objects.create_user(
+            'admin@test.com', 'Ada', 'Admin', password='x', username='admin', is_superuser=True,
+        )
+        self.student = CustomUserModel.objects.create_user(
+            'student@test.com', 'Stu', 'Dent', password='x', username='student',
+        )
+        # Only on the replica, so the responses show which database was read
+        CustomUserModel.objects.using('replica').create(
+            email='replica-only@test.com', first_name='Rita', last_name='Replica', username='replica-only',
+        )
+        self.client.force_login(self.admin)
+
+    def emails(self):
+        response = self.client.get(reverse('course:admin_users'))
+        return {user['email'] for user in response.json()['users']}
+
+    def test_reads_follow_the_replica_until_the_user_writes(self):
+        self.assertEqual(self.emails(), {'replica-only@test.com'})
+
+        response = self.client.post(
+            reverse('course:admin_change_role'),
+            {'user_id': self.student.id, 'new_role': 'instructor'}, content_type='application/json',
+        )
+        self.assertTrue(response.json()['success'])
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(self.emails(), {'admin@test.com', 'student@test.com'})
+
+        # Once the pin expires, reads go back to the replica
+        self.client.cookies[PIN_COOKIE] = str(time.time() - 1)
+        self.assertEqual(self.emails(), {'replica-only@test.com'})
@@ -0,0 +1,67 @@
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory, override_settings
+from course.models import CustomUserModel
+from course.shib_middleware import CustomShibbolethMiddleware, IDENTITY_SESSION_KEY
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cache')
+class ShibbolethIdentityCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = CustomUserModel.objects.create_user(
+            'student@test.com', 'Test', 'Student',
+            password='testpass123', username='student', is_student=True
+        )
+        self.session = None
+
+    def _request(self, email='student@test.com'):
+        request = self.factory.get('/course/home/', HTTP_MAIL=email)
+        SessionMiddleware(lambda r: None).process_request(request)
+        if self.session:
+            request.session = self.session
+        AuthenticationMiddleware(lambda r: None).process_request(request)
+        CustomShibbolethMiddleware(lambda r: HttpResponse()).process_request(request)
+        self.session = request.session
+        return request
+
+    def test_steady_state_needs_no_queries(self):
+        with self.assertNumQueries(1):
+            self._request()
+        self.assertEqual(self.session[IDENTITY_SESSION_KEY][1], self.user.pk)
+        with self.assertNumQueries(0):
+            request = self._request()
+        with self.assertNumQueries(1):  # only the user row, when the view needs it
+            self.assertEqual(request.user.pk, self.user.pk)
+
+    def test_shared_cache_serves_new_sessions(self):
+        self._request()
+        self.session = None
+        with self.assertNumQueries(0):
+            self._request()
+
+    def test_user_changes_invalidate_the_cache(self):
+        self._request()
+        self.session = None
+        self.user.email = 'renamed@test.com'
+        self.user.save()
+        other = CustomUserModel.objects.create_user(
+            'student@test.com', 'New', 'Student', password='testpass123', username='new'
+        )
+        self.assertEqual(self._request().user.pk, other.pk)
+
+        self.session = None
+        other.delete()
+        # Falls through to user creation, which needs the full attribute set
+        with self.assertLogs('course.shib_middleware', 'ERROR'):
+            request = self._request()
+        self.assertNotIn(IDENTITY_SESSION_KEY, request.session)
+
+    def test_stale_session_identity_gives_anonymous_user(self):
+        self._request()
+        CustomUserModel.objects.filter(pk=self.user.pk).delete()  # no signal
+        self.assertFalse(self._request().user.is_authenticated)
+        self.assertNotIn(IDENTITY_SESSION_KEY, self.session)
@@ -0,0 +1,85 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from course.models import CustomUserModel, Course, Module, Lesson, Exercise, Group, Submission
+from course.utils.submission_stats import get_submission_statistics, _percentile
+
+
+class SubmissionStatisticsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = CustomUserModel.objects.create_user(
+            'admin@test.com', 'Course', 'Admin', password='testpass123', username='admin',
+            is_instructor=True, is_superuser=True, is_student=False,
+        )
+        self.course = Course.objects.create(
+            title='Python', instructor=self.admin, is_published=True,
+            end_date=timezone.now().date() - timedelta(days=1),
+        )
+        module = Module.objects.create(course=self.course, instructor=self.admin, title='Eins', order=1)
+        self.exercises = [
+            Exercise.objects.create(
+                lesson=Lesson.objects.create(module=module, title=f'Aufgabe {i}', order=i, lesson_type='exercise'),
+                exercise_type='jupyter', maximum_points=10, pass_points=5,
+            )
+            for i in range(2)
+        ]
+        self.groups = []
+        for g in range(3):
+            group = Group.objects.create(course=self.course)
+            for i in range(2):
+                group.members.add(CustomUserModel.objects.create_user(
+                    f's{g}{i}@test.com', 'Student', f'{g}{i}', password='x', username=f's{g}{i}', is_student=True
+                ), through_defaults={'course': self.course})
+            self.groups.append(group)
+        # Group 0: 4 and 8 on the first exercise, 10 on the second; group 1: 6 ungraded + 2; group 2: nothing
+        self.submit(0, 0, 4)
+        self.submit(0, 0, 8)
+        self.submit(0, 1, 10)
+        self.submit(1, 0, None)
+        self.submit(1, 0, 2)
+        self.client.force_login(self.admin)
+
+    def submit(self, group, exercise, score):
+        return Submission.objects.create(
+            exercise=self.exercises[exercise], student=self.groups[group].members.first(), score=score
+        )
+
+    def test_per_group_and_per_exercise_aggregates(self):
+        with self.assertNumQueries(4):  # aggregates, scores, groups with members, exercises
+            statistics = get_submission_statistics(self.course.id)
+        groups = {stat['group']['id']: stat for stat in statistics['groups']}
+        self.assertEqual(
+            [groups[group.id]['submission_count'] for group in self.groups], [3, 1, 0]
+        )
+        self.assertEqual(groups[self.groups[0].id]['avg_score'], round(22 / 3, 2))
+        self.assertEqual(groups[self.groups[0].id]['max_score'], 10)
+        self.assertEqual(len(groups[self.groups[2].id]['group']['members']), 2)
+        self.assertEqual(statistics['total_submissions'], 4)
+
+        first, second = statistics['exercises']
+        self.assertEqual((first['submission_count'], first['groups'], first['avg_score']), (3, 2, round(14 / 3, 2)))
+        self.assertEqual(first['histogram'], [0, 0, 1, 0, 1, 0, 0, 0, 1, 0])
+        self.assertEqual(first['percentiles'], {'25': 3.0, '50': 4.0, '75': 6.0, '90': 7.2})
+        self.assertEqual(second['histogram'][-1], 1)  # full marks land in the last bin
+        self.assertEqual(statistics['distribution']['counts'], [0, 0, 1, 0, 1, 0, 0, 0, 1, 1])
+
+    def test_percentile_matches_linear_interpolation(self):
+        ordered = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.assertEqual([_percentile(ordered, q) for q in (0, 25, 50, 90, 100)], [1.0, 2.0, 3.0, 4.6, 5.0])
+        self.assertEqual(_percentile([7.0], 90), 7.0)
+
+    def test_cached_until_the_next_grade(self):
+        url = reverse('course:submission_statistics')
+        self.client.get(url)
+        with self.assertNumQueries(2):  # session and user; course and statistics come from the cache
+            response = self.client.get(url)
+        self.assertEqual(response.context['total_submissions'], 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ungraded = Submission.objects.get(score__isnull=True)
+            ungraded.score = 6
+            ungraded.save()
+        self.assertEqual(self.client.get(url).context['total_submissions'], 5)
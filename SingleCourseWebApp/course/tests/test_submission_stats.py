@@ -0,0 +1,99 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from course.models import (
+    CustomUserModel, Course, Module, Lesson, Exercise, Enrollment, Group, ExerciseSubmissionStats,
+)
+import io
+import json
+import os
+import shutil
+import tempfile
+
+NOTEBOOK = json.dumps({'nbformat': 4, 'nbformat_minor': 5, 'metadata': {}, 'cells': [
+    {'cell_type': 'code', 'source': 'print(1)', 'metadata': {}, 'outputs': [], 'execution_count': None},
+]})
+
+
+class SubmissionStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        overrides = override_settings(USER_FILES_ROOT=self.root, DATA_ROOT=self.root, MEDIA_ROOT=self.root)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.instructor = CustomUserModel.objects.create_user(
+            'instructor@test.com', 'Test', 'Instructor', password='testpass123', username='instructor',
+            is_instructor=True, is_superuser=True,
+        )
+        self.course = Course.objects.create(
+            title='Python', instructor=self.instructor, is_published=True,
+            end_date=timezone.now().date() + timedelta(days=7),
+        )
+        module = Module.objects.create(course=self.course, instructor=self.instructor, title='Eins', order=1)
+        self.lesson = Lesson.objects.create(module=module, title='Aufgabe', order=1, lesson_type='exercise')
+        self.exercise = Exercise.objects.create(
+            lesson=self.lesson, exercise_type='jupyter', maximum_points=10, pass_points=5
+        )
+        self.students = []
+        for i in range(2):
+            student = CustomUserModel.objects.create_user(
+                f'student{i}@test.com', 'Test', f'Student{i}', password='x', username=f'student{i}', is_student=True
+            )
+            Enrollment.objects.create(student=student, course=self.course)
+            group = Group.objects.create(course=self.course)
+            group.members.add(student, through_defaults={'course': self.course})
+            notebook_dir = os.path.join(self.root, f'group_{group.id}', self.lesson.title)
+            os.makedirs(notebook_dir)
+            with open(os.path.join(notebook_dir, 'loesung.ipynb'), 'w') as f:
+                f.write(NOTEBOOK)
+            self.students.append(student)
+
+    def submit(self, student):
+        self.client.force_login(student)
+        response = self.client.post(reverse('course:submit_exercise', args=[self.lesson.id]))
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['submission_id']
+
+    def grade(self, submission_id, score):
+        self.client.force_login(self.instructor)
+        self.client.post(reverse('course:grade_submission', args=[submission_id]),
+                         json.dumps({'score': score, 'feedback': ''}), content_type='application/json')
+
+    def stats(self):
+        stats = ExerciseSubmissionStats.objects.get(exercise=self.exercise)
+        return stats.groups_submitted, stats.groups_pending, stats.groups_passed
+
+    def test_counters_follow_each_groups_latest_submission(self):
+        first = self.submit(self.students[0])
+        self.submit(self.students[1])
+        self.assertEqual(self.stats(), (2, 2, 0))
+
+        self.grade(first, 8)
+        self.assertEqual(self.stats(), (2, 1, 1))
+
+        self.submit(self.students[0])  # resubmission reopens the group
+        self.assertEqual(self.stats(), (2, 2, 0))
+
+        self.grade(first, 9)  # grading an older submission changes nothing
+        self.assertEqual(self.stats(), (2, 2, 0))
+        self.assertIsNotNone(ExerciseSubmissionStats.objects.get(exercise=self.exercise).last_submission_at)
+
+        ExerciseSubmissionStats.objects.all().delete()
+        out = io.StringIO()
+        call_command('rebuild_submission_stats', stdout=out)
+        self.assertIn('1 exercises', out.getvalue())
+        self.assertEqual(self.stats(), (2, 2, 0))
+
+    def test_dashboard_reads_the_counters(self):
+        self.submit(self.students[0])
+        self.client.force_login(self.instructor)
+        with self.assertNumQueries(4):  # session, user, course, exercises with their counters
+            response = self.client.get(reverse('course:submissions_dashboard'))
+        self.assertContains(response, 'Bestanden')
+        self.assertEqual(response.context['exercises'][0].submission_stats.groups_pending, 1)
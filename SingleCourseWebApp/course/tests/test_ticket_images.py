@@ -0,0 +1,67 @@
+from django.core import mail
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from unittest import mock
+from PIL import Image
+from course.models import CustomUserModel, Ticket
+from course.utils import images
+import io
+import shutil
+import tempfile
+
+
+def _png(width, height):
+    out = io.BytesIO()
+    Image.new('RGBA', (width, height), (200, 30, 30, 128)).save(out, 'PNG')
+    return ContentFile(out.getvalue(), name='screenshot.png')
+
+
+class TicketImageVariantTests(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.override = override_settings(STORAGES={
+            'default': {
+                'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                'OPTIONS': {'location': self.root, 'base_url': '/data/'},
+            },
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+        })
+        self.override.enable()
+        user = CustomUserModel.objects.create_user(
+            'student@test.com', 'Test', 'Student', password='testpass123', username='student'
+        )
+        self.ticket = Ticket.objects.create(user=user, subject='Bug', description='Broken', image=_png(2400, 1200))
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.root)
+
+    def test_variants_are_downscaled(self):
+        preview_name = images.create_ticket_image_variants(self.ticket.id)
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.image_preview.name, preview_name)
+
+        with Image.open(self.ticket.image_thumbnail.path) as thumb:
+            self.assertEqual(thumb.format, 'WEBP')
+            self.assertEqual(thumb.size, (images.THUMBNAIL_EDGE, images.THUMBNAIL_EDGE // 2))
+        with Image.open(self.ticket.image_preview.path) as preview:
+            self.assertEqual(preview.format, 'JPEG')
+            self.assertEqual(max(preview.size), images.PREVIEW_EDGE)
+
+    def test_replaced_image_is_not_overwritten(self):
+        def replace_during_processing(image):
+            Ticket.objects.filter(pk=self.ticket.id).update(image='ticket_images/newer.png')
+            return image
+
+        with mock.patch('PIL.ImageOps.exif_transpose', side_effect=replace_during_processing):
+            self.assertIsNone(images.create_ticket_image_variants(self.ticket.id))
+        self.ticket.refresh_from_db()
+        self.assertFalse(self.ticket.image_thumbnail)
+
+    def test_notification_attaches_compressed_preview(self):
+        with mock.patch.object(images, 'connection'):
+            images._process_new_ticket(self.ticket.id, {'subject': 'Ticket', 'body': 'x', 'to': ['support@test.com']})
+        self.assertEqual(len(mail.outbox), 1)
+        (filename, content, mimetype), = mail.outbox[0].attachments
+        self.assertEqual(mimetype, 'image/jpeg')
+        self.assertLess(len(content), self.ticket.image.size)
@@ -0,0 +1,103 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from course.models import CustomUserModel, Ticket
+
+
+class TicketListTests(TestCase):
+    """Paging, filters and conditional responses of the ticket list API."""
+
+    def setUp(self):
+        self.staff = CustomUserModel.objects.create_user(
+            'staff@test.com', 'Sam', 'Staff', password='x', username='staff', is_staff=True, is_student=False,
+        )
+        self.student = CustomUserModel.objects.create_user(
+            'student@test.com', 'Stu', 'Dent', password='x', username='student',
+        )
+        other = CustomUserModel.objects.create_user('other@test.com', 'Otto', 'Other', password='x', username='other')
+        now = timezone.now()
+        self.tickets = []
+        for i in range(7):
+            ticket = Ticket.objects.create(
+                user=self.student if i % 2 else other,
+                subject=f'Problem {i}',
+                description='...',
+                status=['open', 'in_progress', 'closed'][i % 3],
+                assigned_to=self.staff if i < 3 else None,
+            )
+            # Days 0..6 ago; tickets 5 and 6 share a timestamp, so pages need the id tie-breaker
+            Ticket.objects.filter(pk=ticket.pk).update(created_at=now - timedelta(days=min(i, 5)))
+            self.tickets.append(ticket)
+        self.url = reverse('course:ticket_list')
+        self.client.force_login(self.staff)
+
+    def fetch(self, **params):
+        response = self.client.get(self.url, params)
+        return response.status_code, response.json()
+
+    def ids(self, **params):
+        ids, after = [], None
+        while True:
+            if after:
+                params['after'] = after
+            status, data = self.fetch(limit=3, **params)
+            self.assertEqual(status, 200)
+            ids.extend(ticket['id'] for ticket in data['tickets'])
+            after = data['next']
+            if not after:
+                return ids
+
+    def test_pages_run_newest_first(self):
+        expected = list(Ticket.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(self.ids(), expected)
+
+    def test_filters(self):
+        ids = lambda **params: sorted(self.ids(**params))
+        tickets = self.tickets
+        self.assertEqual(ids(status='open'), sorted(t.id for t in tickets[0::3]))
+        self.assertEqual(ids(assigned_to='me'), sorted(t.id for t in tickets[:3]))
+        self.assertEqual(ids(assigned_to='none'), sorted(t.id for t in tickets[3:]))
+        self.assertEqual(ids(assigned_to=self.staff.id, status='closed'), [tickets[2].id])
+        today = timezone.localdate()
+        self.assertEqual(
+            ids(created_from=(today - timedelta(days=2)).isoformat(), created_to=today.isoformat()),
+            sorted(t.id for t in tickets[:3]),
+        )
+        self.assertEqual(ids(q='problem 4'), [tickets[4].id])
+        self.assertEqual(ids(q='student@'), sorted(t.id for t in tickets[1::2]))
+        with self.assertLogs('django.request', 'WARNING'):
+            self.assertEqual(self.fetch(status='done')[0], 400)
+            self.assertEqual(self.fetch(created_from='yesterday')[0], 400)
+            self.assertEqual(self.fetch(after='nope')[0], 400)
+
+    def test_students_see_only_their_own_tickets(self):
+        self.client.force_login(self.student)
+        self.assertEqual(sorted(self.ids()), sorted(t.id for t in self.tickets[1::2]))
+
+    def test_unchanged_list_answers_304_without_the_page_query(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        with self.assertNumQueries(3):  # session, user, max(updated_at)/count
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        # A change, a new ticket and a deletion each produce a new ETag
+        ticket = self.tickets[0]
+        ticket.status = 'closed'
+        ticket.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        Ticket.objects.order_by('updated_at').first().delete()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        # Other filters are other resources
+        self.assertNotEqual(self.client.get(self.url, {'status': 'open'})['ETag'], etag)
+
+    def test_page_queries_do_not_grow(self):
+        with self.assertNumQueries(4):  # session, user, ETag aggregate, page with users
+            self.client.get(self.url, {'limit': 1})
+        with self.assertNumQueries(4):
+            self.client.get(self.url, {'limit': 50})
@@ -0,0 +1,94 @@
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import InMemoryUploadedFile, TemporaryUploadedFile
+from django.core.files.uploadhandler import load_handler
+from django.test import SimpleTestCase, RequestFactory, override_settings
+from unittest import mock
+from course import upload_handlers
+from course.upload_handlers import UploadProgressHandler, progress_cache_key
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from course.views import check_upload_progress
+
+MB = 1024 * 1024
+
+
+class UploadProgressHandlerTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        cache.clear()
+
+    def _poll(self, upload_id=None, **headers):
+        request = self.factory.get('/', {'upload_id': upload_id} if upload_id else {}, **headers)
+        request.user = mock.Mock(is_authenticated=True)
+        return request
+
+    def _handler(self, progress_id, total):
+        handler = UploadProgressHandler(self.factory.post('/'))
+        handler.handle_raw_input(None, {'HTTP_X_PROGRESS_ID': progress_id}, total, b'boundary')
+        return handler
+
+    def test_updates_are_throttled(self):
+        handler = self._handler('abc-123', 10 * MB)
+        with mock.patch.object(upload_handlers.cache, 'set') as cache_set, \
+                mock.patch.object(upload_handlers.time, 'monotonic', return_value=handler.reported_at):
+            for _ in range(160):  # 10 MB in 64 KB chunks, all "at the same instant"
+                handler.receive_data_chunk(b'x' * 64 * 1024, 0)
+        self.assertEqual(cache_set.call_count, 10)
+
+    def test_progress_is_visible_to_the_polling_view(self):
+        handler = self._handler('abc-123', 4 * MB)
+        handler.receive_data_chunk(b'x' * (2 * MB), 0)
+        response = check_upload_progress(self._poll(HTTP_X_PROGRESS_ID='abc-123'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'"uploaded": 2097152', response.content)
+
+        handler.upload_complete()
+        self.assertEqual(cache.get(progress_cache_key('abc-123'))['done'], True)
+
+    def test_requests_without_valid_id_are_not_tracked(self):
+        self._handler('../../etc', MB)
+        self._handler(None, MB)
+        self.assertEqual(check_upload_progress(self._poll(upload_id='../../etc')).status_code, 404)
+
+
+class UploadSpoolingTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.factory = RequestFactory()
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def _upload(self, content):
+        upload = io.BytesIO(content)
+        upload.name = 'lecture.mp4'
+        request = self.factory.post('/', {'video_file': upload})
+        request.upload_handlers = [
+            load_handler('course.upload_handlers.HashingMemoryFileUploadHandler', request),
+            load_handler('course.upload_handlers.HashingTemporaryFileUploadHandler', request),
+        ]
+        return request.FILES['video_file']
+
+    def test_small_uploads_stay_in_memory_and_are_hashed(self):
+        content = b'small' * 100
+        uploaded = self._upload(content)
+        self.assertIsInstance(uploaded, InMemoryUploadedFile)
+        self.assertEqual(uploaded.sha256, hashlib.sha256(content).hexdigest())
+
+    def test_large_uploads_are_spooled_and_renamed_into_place(self):
+        content = os.urandom(3 * 1024 * 1024)
+        with override_settings(FILE_UPLOAD_TEMP_DIR=self.root):
+            uploaded = self._upload(content)
+        self.assertIsInstance(uploaded, TemporaryUploadedFile)
+        self.assertEqual(uploaded.sha256, hashlib.sha256(content).hexdigest())
+        self.assertEqual(uploaded.size, len(content))
+
+        spooled_inode = os.stat(uploaded.temporary_file_path()).st_ino
+        storage = FileSystemStorage(location=os.path.join(self.root, 'data'))
+        name = storage.save('media/lecture.mp4', uploaded)
+        uploaded.close()  # as at the end of a request; the spool file is already gone
+        self.assertEqual(os.stat(storage.path(name)).st_ino, spooled_inode)
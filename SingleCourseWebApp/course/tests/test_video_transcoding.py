@@ -0,0 +1,66 @@
+from datetime import timedelta
+from django.conf import settings
+from django.test import TestCase
+from django.utils import timezone
+from course.models import CustomUserModel, Course, Module, Lesson
+from course.utils import video
+import os
+import shutil
+import tempfile
+
+
+class VideoTranscodingTests(TestCase):
+    def setUp(self):
+        self.instructor = CustomUserModel.objects.create_user(
+            'instructor@test.com', 'Test', 'Instructor',
+            password='testpass123', username='instructor', is_instructor=True
+        )
+        course = Course.objects.create(title='Test Course', instructor=self.instructor)
+        module = Module.objects.create(course=course, instructor=self.instructor, title='Module', order=1)
+        self.lesson = Lesson.objects.create(
+            module=module, title='Video', order=1, lesson_type='video',
+            video_file='media/lecture.mp4', video_status='pending'
+        )
+        self.hls_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.hls_root, ignore_errors=True)
+        overrides = self.settings(FFMPEG_BINARY='no-such-encoder-binary', HLS_ROOT=self.hls_root)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def test_ladder_never_upscales(self):
+        with self.settings(HLS_LADDER=[(360, '800k', '96k'), (720, '2800k', '128k'), (1080, '5000k', '192k')]):
+            self.assertEqual([r[0] for r in video._ladder_for(720)], [360, 720])
+            self.assertEqual([r[0] for r in video._ladder_for(240)], [360])
+            self.assertEqual([r[0] for r in video._ladder_for(None)], [360, 720, 1080])
+
+    def test_master_playlist(self):
+        path = os.path.join(self.hls_root, 'master.m3u8')
+        video._write_master_playlist(path, [(360, '800k', '96k'), (720, '2800k', '128k')], 1920, 1080)
+        with open(path) as fh:
+            playlist = fh.read()
+        self.assertIn('BANDWIDTH=896000,RESOLUTION=640x360', playlist)
+        self.assertIn('720p/index.m3u8', playlist)
+
+    def test_missing_encoder_marks_lesson_failed(self):
+        video.transcode_lesson_video(self.lesson.id, 'media/lecture.mp4')
+        self.lesson.refresh_from_db()
+        self.assertEqual(self.lesson.video_status, 'failed')
+
+    def test_job_for_replaced_upload_is_ignored(self):
+        video.transcode_lesson_video(self.lesson.id, 'media/older_upload.mp4')
+        self.lesson.refresh_from_db()
+        self.assertEqual(self.lesson.video_status, 'pending')
+
+    def test_stale_jobs_are_found_by_heartbeat(self):
+        Lesson.objects.filter(pk=self.lesson.pk).update(video_status='processing', video_status_at=timezone.now())
+        self.assertFalse(video.stale_transcodes().exists())
+
+        dead = timezone.now() - timedelta(seconds=settings.HLS_ENCODE_TIMEOUT) - video.STALE_GRACE - timedelta(minutes=1)
+        Lesson.objects.filter(pk=self.lesson.pk).update(video_status_at=dead)
+        self.assertEqual(list(video.stale_transcodes()), [self.lesson])
+
+        # The requeued job takes over and ends with a fresh status
+        video.transcode_lesson_video(self.lesson.id, 'media/lecture.mp4')
+        self.lesson.refresh_from_db()
+        self.assertEqual(self.lesson.video_status, 'failed')
+        self.assertFalse(video.stale_transcodes().exists())
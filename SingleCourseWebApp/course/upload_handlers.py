@@ -0,0 +1,120 @@
+import hashlib
+import re
+import time
+
+from django.core.cache import cache
+from django.core.files.uploadhandler import (
+    FileUploadHandler, MemoryFileUploadHandler, TemporaryFileUploadHandler,
+)
+
+PROGRESS_ID_HEADER = 'HTTP_X_PROGRESS_ID'
+_PROGRESS_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+# Write to the shared cache at most every MB or every 250 ms, whichever comes first
+PROGRESS_UPDATE_BYTES = 1024 * 1024
+PROGRESS_UPDATE_INTERVAL = 0.25
+PROGRESS_TIMEOUT = 60 * 60  # seconds an unfinished entry may linger
+FINISHED_TIMEOUT = 60       # keep the final state long enough for the last poll
+
+
+def progress_cache_key(progress_id):
+    return f'upload_progress_{progress_id}'
+
+
+def valid_progress_id(progress_id):
+    return bool(progress_id and _PROGRESS_ID.match(progress_id))
+
+
+class UploadProgressHandler(FileUploadHandler):
+    """Publish multipart upload progress under the client's ``X-Progress-ID``.
+
+    Passes every chunk through unchanged, so it must come before the handlers
+    that actually store the data in ``FILE_UPLOAD_HANDLERS``. Requests without
+    a (valid) progress ID are not tracked.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.progress_id = None
+        self.total = 0
+        self.received = 0
+        self.reported = 0
+        self.reported_at = 0.0
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        progress_id = META.get(PROGRESS_ID_HEADER)
+        if not valid_progress_id(progress_id):
+            return None
+        self.progress_id = progress_id
+        self.total = content_length
+        self._publish(force=True)
+        return None
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.progress_id:
+            self.received += len(raw_data)
+            self._publish()
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+    def upload_complete(self):
+        if self.progress_id:
+            self.received = self.total
+            self._publish(force=True, done=True)
+
+    def upload_interrupted(self):
+        if self.progress_id:
+            cache.delete(progress_cache_key(self.progress_id))
+
+    def _publish(self, force=False, done=False):
+        now = time.monotonic()
+        if not force and (
+            self.received - self.reported < PROGRESS_UPDATE_BYTES
+            and now - self.reported_at < PROGRESS_UPDATE_INTERVAL
+        ):
+            return
+        cache.set(
+            progress_cache_key(self.progress_id),
+            {'total': self.total, 'uploaded': min(self.received, self.total), 'done': done},
+            FINISHED_TIMEOUT if done else PROGRESS_TIMEOUT,
+        )
+        self.reported, self.reported_at = self.received, now
+
+
+class _HashingMixin:
+    """Compute the SHA-256 of each file while it streams through the handler.
+
+    The digest is available as ``uploaded_file.sha256``; the size is the
+    usual ``uploaded_file.size``.
+    """
+
+    def new_file(self, *args, **kwargs):
+        # Set up first: MemoryFileUploadHandler.new_file raises StopFutureHandlers
+        self._sha256 = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if getattr(self, 'activated', True):
+            self._sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file_obj = super().file_complete(file_size)
+        if file_obj is not None:
+            file_obj.sha256 = self._sha256.hexdigest()
+        return file_obj
+
+
+class HashingMemoryFileUploadHandler(_HashingMixin, MemoryFileUploadHandler):
+    """Keeps requests up to ``FILE_UPLOAD_MAX_MEMORY_SIZE`` in memory."""
+
+
+class HashingTemporaryFileUploadHandler(_HashingMixin, TemporaryFileUploadHandler):
+    """Spools to ``FILE_UPLOAD_TEMP_DIR`` in 64 KB chunks.
+
+    The result is a ``TemporaryUploadedFile``, which ``FileSystemStorage``
+    renames into place instead of copying. ``FILE_UPLOAD_TEMP_DIR`` lives
+    under ``DATA_ROOT``, so this is a single rename on the same filesystem.
+    """
@@ -23,6 +23,8 @@ urlpatterns = [
     path('manage/create_lesson/<int:module_id>/', views.create_lesson, name='create_lesson'),
     path('manage/delete_lesson/<int:lesson_id>/', views.delete_lesson, name='delete_lesson'),
     path('manage/save_lesson/<int:lesson_id>/', views.save_lesson, name='save_lesson'),
+    path('manage/uploads/', views.create_chunked_upload, name='create_chunked_upload'),
+    path('manage/uploads/<uuid:upload_id>/', views.chunked_upload, name='chunked_upload'),
     path('api/groups/<int:group_id>/members/', views.get_group_members, name='get_group_members'),
     path('module/<int:module_id>/lesson/<int:lesson_id>/create-jupyter-exercise/', 
          views.create_jupyter_exercise, 
@@ -51,16 +53,23 @@ urlpatterns = [
     path('submissions/', views.submissions_dashboard, name='submissions_dashboard'),
     path('submissions/exercise/<int:exercise_id>/', views.exercise_submissions, name='exercise_submissions'),
     path('submissions/statistics/', views.submission_statistics, name='submission_statistics'),
+    path('submissions/progress/', views.progress_heatmap, name='progress_heatmap'),
+    path('api/progress-matrix/', views.progress_matrix, name='progress_matrix'),
     path('submissions/<int:submission_id>/grade/', views.grade_submission, name='grade_submission'),
+    path('submissions/files/<int:file_id>/render/', views.render_submission_file, name='render_submission_file'),
     path('<int:course_id>/groups/list/', views.list_groups, name='list_groups'),
     path('<int:course_id>/groups/join/', views.join_group, name='join_group'),
     path('admin/dashboard/', views.admin_dashboard, name='admin_dashboard'),
+    path('admin/users/', views.admin_users, name='admin_users'),
     path('admin/change-role/', views.admin_change_role, name='admin_change_role'),
     path('admin/delete-user/', views.admin_delete_user, name='admin_delete_user'),
     path('admin/send-email/', views.admin_send_email, name='admin_send_email'),
     path('exercise/<int:exercise_id>/upload-reference/', 
          views.upload_reference_solution, 
          name='upload_reference_solution'),
+    path('exercise/<int:exercise_id>/reference/render/', 
+         views.render_reference_solution, 
+         name='render_reference_solution'),
     # Ticket System URLs
     path('tickets/create/', views.create_ticket, name='create_ticket'),
     path('tickets/', views.ticket_list, name='ticket_list'),
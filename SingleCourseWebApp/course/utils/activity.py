@@ -0,0 +1,145 @@
+# utils/activity.py
+import logging, time
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from course.models import CustomUserModel
+from .background import run_in_background
+
+logger = logging.getLogger(__name__)
+
+FLUSH_LOCK_KEY = "last_seen_flush_lock"
+FLUSH_CURSOR_KEY = "last_seen_flush_from"
+BATCH_SIZE = 500
+CACHE_TIMEOUT = 24 * 60 * 60  # must outlive several flush intervals
+
+# user id -> monotonic time of this process' last cache write
+_recorded = {}
+_pruned_at = float("-inf")
+
+
+def last_seen_key(user_id) -> str:
+    return f"last_seen_{user_id}"
+
+
+def _interval() -> int:
+    return int(time.time() // settings.LAST_SEEN_FLUSH_INTERVAL)
+
+
+def _dirty_key(interval) -> str:
+    """Number of users listed as active in *interval*; entry ``n`` is stored under ``<key>_<n>``."""
+    return f"last_seen_dirty_{interval}"
+
+
+def _mark_dirty(user_id):
+    """List *user_id* once per flush interval so the flush finds it without scanning all users."""
+    interval = _interval()
+    if not cache.add(f"last_seen_marked_{interval}_{user_id}", 1, CACHE_TIMEOUT):
+        return
+    count_key = _dirty_key(interval)
+    cache.add(count_key, 0, CACHE_TIMEOUT)
+    cache.set(f"{count_key}_{cache.incr(count_key)}", user_id, CACHE_TIMEOUT)
+
+
+def _prune_recorded(now):
+    """Drop entries too old to suppress a write, at most once per flush interval."""
+    global _pruned_at
+    if now - _pruned_at < settings.LAST_SEEN_FLUSH_INTERVAL:
+        return
+    _pruned_at = now
+    cutoff = now - settings.LAST_SEEN_RESOLUTION
+    for user_id in [user_id for user_id, recorded in _recorded.items() if recorded < cutoff]:
+        _recorded.pop(user_id, None)
+
+
+def record_activity(user_id):
+    """
+    Note that *user_id* was active just now.
+
+    Writes to the shared cache at most once per ``LAST_SEEN_RESOLUTION`` per
+    process and never to the database. Also starts a background flush when
+    none has run for ``LAST_SEEN_FLUSH_INTERVAL`` on any worker.
+    """
+    now = time.monotonic()
+    if now - _recorded.get(user_id, float("-inf")) < settings.LAST_SEEN_RESOLUTION:
+        return
+    _prune_recorded(now)
+    _recorded[user_id] = now
+    cache.set(last_seen_key(user_id), time.time(), CACHE_TIMEOUT)
+    _mark_dirty(user_id)
+    # cache.add is atomic, so only one worker per interval wins the flush
+    if cache.add(FLUSH_LOCK_KEY, 1, settings.LAST_SEEN_FLUSH_INTERVAL):
+        run_in_background(_flush_in_background)
+
+
+def buffered_last_seen(user_ids) -> dict:
+    """Return ``{user_id: datetime}`` for users with activity still in the cache."""
+    keys = {last_seen_key(user_id): user_id for user_id in user_ids}
+    return {
+        keys[key]: datetime.fromtimestamp(ts, tz=dt_timezone.utc)
+        for key, ts in cache.get_many(list(keys)).items()
+    }
+
+
+def _bulk_update(rows):
+    """Set last_seen for ``(user_id, datetime)`` rows, never moving it backwards."""
+    table = connection.ops.quote_name(CustomUserModel._meta.db_table)
+    pk = connection.ops.quote_name(CustomUserModel._meta.pk.column)
+    if connection.vendor not in ("postgresql", "sqlite"):
+        for user_id, seen in rows:
+            CustomUserModel.objects.filter(pk=user_id).exclude(last_seen__gte=seen).update(last_seen=seen)
+        return
+    values = ", ".join(["(%s, %s)"] * len(rows))
+    params = []
+    for user_id, seen in rows:
+        params += [user_id, connection.ops.adapt_datetimefield_value(seen)]
+    # Both backends name the VALUES columns column1, column2
+    sql = (
+        f"UPDATE {table} SET last_seen = v.column2 FROM (VALUES {values}) AS v "
+        f"WHERE {table}.{pk} = v.column1 AND ({table}.last_seen IS NULL OR {table}.last_seen < v.column2)"
+    )
+    if connection.vendor == "postgresql":
+        sql = sql.replace("(%s, %s)", "(%s::bigint, %s::timestamptz)")
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def flush_last_seen() -> int:
+    """
+    Write the buffered timestamps to ``CustomUserModel.last_seen``; returns the number of users seen.
+
+    Only users listed by ``_mark_dirty`` since the previous flush are read, so
+    the cost follows recent activity rather than the number of accounts.
+    Intervals still running when a flush starts are read again in full by the
+    next one: their users may be active again after being written, and a slot
+    reserved by ``incr`` may not have been filled yet.
+    """
+    current = _interval()
+    oldest = current - CACHE_TIMEOUT // settings.LAST_SEEN_FLUSH_INTERVAL
+    # first interval that was not yet finished at the previous flush
+    interval = max(cache.get(FLUSH_CURSOR_KEY, oldest), oldest)
+    counts = cache.get_many([_dirty_key(i) for i in range(interval, current + 1)])
+
+    flushed = 0
+    for i in range(interval, current + 1):
+        count = counts.get(_dirty_key(i), 0)
+        for start in range(0, count, BATCH_SIZE):
+            slots = [f"{_dirty_key(i)}_{n}" for n in range(start + 1, min(start + BATCH_SIZE, count) + 1)]
+            rows = list(buffered_last_seen(cache.get_many(slots).values()).items())
+            if rows:
+                with transaction.atomic():
+                    _bulk_update(rows)
+                flushed += len(rows)
+    cache.set(FLUSH_CURSOR_KEY, current, CACHE_TIMEOUT)
+    return flushed
+
+
+def _flush_in_background():
+    try:
+        flushed = flush_last_seen()
+        logger.debug("Flushed last-seen timestamps for %d users", flushed)
+    except Exception as e:
+        logger.error("Flushing last-seen timestamps failed: %s", e)
+    finally:
+        connection.close()
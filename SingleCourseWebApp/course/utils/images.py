@@ -0,0 +1,129 @@
+# utils/images.py
+import io, logging, os
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.mail import EmailMessage
+from django.utils import timezone
+from django.db import connection
+from typing import TYPE_CHECKING
+from course.models import Ticket
+from .background import run_in_background
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Longest edge in pixels. Thumbnails are shown in the ticket list and detail
+# view; the preview is what gets attached to the notification email.
+THUMBNAIL_EDGE = 480
+PREVIEW_EDGE = 1600
+VARIANT_DIR = "ticket_images/variants"
+# Originals that cannot be decoded are still attached if they are this small.
+MAX_ORIGINAL_ATTACHMENT = 5 * 1024 * 1024
+
+
+def _encode(image: "Image.Image", edge: int, fmt: str, **params) -> bytes:
+    from PIL import Image
+
+    variant = image.copy()
+    variant.thumbnail((edge, edge), Image.LANCZOS)
+    if fmt == "JPEG" and variant.mode == "RGBA":
+        # JPEG has no alpha: flatten onto white instead of turning it black
+        background = Image.new("RGB", variant.size, (255, 255, 255))
+        background.paste(variant, mask=variant.getchannel("A"))
+        variant = background
+    out = io.BytesIO()
+    variant.save(out, fmt, **params)
+    return out.getvalue()
+
+
+def create_ticket_image_variants(ticket_id: int):
+    """
+    Write a WebP thumbnail and a compressed JPEG preview for a ticket's image.
+
+    Returns the storage name of the preview, or ``None`` if the ticket has no
+    (decodable) image or the image was replaced in the meantime.
+    """
+    # Imported here so views.py still loads without Pillow; the worker then
+    # logs the ImportError and mails the original instead.
+    from PIL import Image, ImageOps
+
+    ticket = Ticket.objects.only("image").get(pk=ticket_id)
+    if not ticket.image:
+        return None
+    source_name = ticket.image.name
+
+    try:
+        with ticket.image.open("rb") as fh:
+            image = Image.open(fh)
+            image.draft("RGB", (PREVIEW_EDGE, PREVIEW_EDGE))  # cheap JPEG downscale on decode
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except (OSError, Image.DecompressionBombError) as e:
+        logger.warning("Ticket %s image could not be decoded: %s", ticket_id, e)
+        return None
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    base = os.path.join(VARIANT_DIR, f"ticket_{ticket_id}")
+    thumb_name = default_storage.save(
+        f"{base}_thumb.webp", ContentFile(_encode(image, THUMBNAIL_EDGE, "WEBP", quality=80, method=4))
+    )
+    preview_name = default_storage.save(
+        f"{base}_preview.jpg",
+        ContentFile(_encode(image, PREVIEW_EDGE, "JPEG", quality=82, optimize=True, progressive=True)),
+    )
+
+    # Only attach the variants if the ticket still points at the same original.
+    # update() skips auto_now; bump updated_at so ticket_list's ETag changes and pollers see the thumbnail
+    if not Ticket.objects.filter(pk=ticket_id, image=source_name).update(
+        image_thumbnail=thumb_name, image_preview=preview_name, updated_at=timezone.now()
+    ):
+        default_storage.delete(thumb_name)
+        default_storage.delete(preview_name)
+        return None
+    logger.info("✓ Created image variants for ticket %s", ticket_id)
+    return preview_name
+
+
+def remove_ticket_image_variants(ticket: Ticket):
+    for field in (ticket.image_thumbnail, ticket.image_preview):
+        if field:
+            field.delete(save=False)
+
+
+def _process_new_ticket(ticket_id: int, email_kwargs: dict):
+    """(Runs inside background thread) build image variants, then notify support."""
+    try:
+        preview_name = None
+        try:
+            preview_name = create_ticket_image_variants(ticket_id)
+        except Exception as e:
+            logger.error("Creating image variants for ticket %s failed: %s", ticket_id, e)
+
+        email = EmailMessage(**email_kwargs)
+        if preview_name:
+            with default_storage.open(preview_name, "rb") as fh:
+                email.attach(
+                    filename=f"ticket_{ticket_id}.jpg", content=fh.read(), mimetype="image/jpeg"
+                )
+        else:
+            image = Ticket.objects.only("image").get(pk=ticket_id).image
+            if image and image.size <= MAX_ORIGINAL_ATTACHMENT:
+                with image.open("rb") as fh:
+                    email.attach(filename=os.path.basename(image.name), content=fh.read())
+        email.send(fail_silently=False)
+    except Exception as e:
+        logger.error("Sending notification for ticket %s failed: %s", ticket_id, e)
+    finally:
+        connection.close()
+
+
+def start_ticket_processing(ticket_id: int, **email_kwargs):
+    """
+    Queue image variant generation and the support notification for a new ticket.
+    Called AFTER the DB transaction commits.
+    """
+    run_in_background(_process_new_ticket, ticket_id, email_kwargs)
@@ -0,0 +1,144 @@
+# utils/notebook_validation.py
+import json, os
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+try:
+    import ijson
+    PARSE_ERRORS = (ValueError, ijson.JSONError)
+except ImportError:  # fall back to json.load, still bounded by NOTEBOOK_MAX_BYTES
+    ijson = None
+    PARSE_ERRORS = (ValueError,)
+
+CELL_TYPES = {"code", "markdown", "raw"}
+READ_BLOCK = 64 * 1024
+
+
+def _mb(size: int) -> str:
+    return f"{size / (1024 * 1024):g} MB"
+
+
+class _BoundedReader:
+    """Read-only file wrapper that refuses to go past *limit* bytes."""
+
+    def __init__(self, fh, limit: int, name: str):
+        self.fh, self.limit, self.name, self.consumed = fh, limit, name, 0
+
+    def read(self, size: int = READ_BLOCK) -> bytes:
+        data = self.fh.read(READ_BLOCK if size is None or size < 0 else size)
+        self.consumed += len(data)
+        if self.consumed > self.limit:
+            raise ValidationError(f"{self.name} ist größer als {_mb(self.limit)}")
+        return data
+
+
+def _events(value, prefix=""):
+    """Yield ``ijson.parse``-style events for an already parsed value."""
+    if isinstance(value, dict):
+        yield prefix, "start_map", None
+        for key, item in value.items():
+            yield prefix, "map_key", key
+            yield from _events(item, f"{prefix}.{key}" if prefix else key)
+        yield prefix, "end_map", None
+    elif isinstance(value, list):
+        yield prefix, "start_array", None
+        for item in value:
+            yield from _events(item, f"{prefix}.item" if prefix else "item")
+        yield prefix, "end_array", None
+    elif isinstance(value, str):
+        yield prefix, "string", value
+    elif isinstance(value, bool):
+        yield prefix, "boolean", value
+    elif value is None:
+        yield prefix, "null", None
+    else:
+        yield prefix, "number", value
+
+
+def _parse(reader):
+    if ijson is not None:
+        return ijson.parse(reader, buf_size=READ_BLOCK)
+    return _events(json.loads(b"".join(iter(reader.read, b""))))
+
+
+def _check(events, name: str) -> int:
+    max_cells = settings.NOTEBOOK_MAX_CELLS
+    max_output = settings.NOTEBOOK_MAX_OUTPUT_BYTES
+    nbformat, has_cells, cells = None, False, 0
+    cell_type, cell_keys, output_size = None, set(), 0
+
+    for prefix, event, value in events:
+        if prefix == "":
+            if event not in ("start_map", "map_key", "end_map"):
+                raise ValidationError(f"{name} ist kein Jupyter-Notebook")
+        elif prefix == "nbformat":
+            nbformat = value
+        elif prefix == "cells":
+            if event not in ("start_array", "end_array"):
+                raise ValidationError(f"{name}: 'cells' muss eine Liste sein")
+            has_cells = True
+        elif prefix == "cells.item":
+            if event == "start_map":
+                cells += 1
+                if cells > max_cells:
+                    raise ValidationError(f"{name} hat mehr als {max_cells} Zellen")
+                cell_type, cell_keys = None, set()
+            elif event == "map_key":
+                cell_keys.add(value)
+            elif event == "end_map":
+                if cell_type not in CELL_TYPES or "source" not in cell_keys:
+                    raise ValidationError(f"{name}: Zelle {cells} ist ungültig")
+            else:
+                raise ValidationError(f"{name}: Zelle {cells + 1} ist ungültig")
+        elif prefix == "cells.item.cell_type":
+            cell_type = value
+        elif prefix.startswith("cells.item.outputs.item"):
+            if prefix == "cells.item.outputs.item" and event == "start_map":
+                output_size = 0
+            elif event == "string":
+                # Outputs are dominated by text and base64 payloads
+                output_size += len(value)
+                if output_size > max_output:
+                    raise ValidationError(
+                        f"{name}: eine Ausgabe in Zelle {cells} ist größer als {_mb(max_output)}. "
+                        "Bitte Ausgaben löschen und erneut hochladen."
+                    )
+
+    if not isinstance(nbformat, int) or isinstance(nbformat, bool) or nbformat < 4:
+        raise ValidationError(f"{name}: nur Notebooks im Format nbformat 4 werden unterstützt")
+    if not has_cells:
+        raise ValidationError(f"{name} enthält keine Zellen-Liste")
+    return cells
+
+
+def validate_notebook(source, name: str = None) -> int:
+    """
+    Check that *source* is a well-formed nbformat 4 notebook within the size caps.
+
+    *source* is a path or an (uploaded) file object. The JSON is parsed
+    incrementally, so memory use does not grow with the notebook; parsing
+    stops at the first violation of ``NOTEBOOK_MAX_BYTES``,
+    ``NOTEBOOK_MAX_OUTPUT_BYTES`` (per output) or ``NOTEBOOK_MAX_CELLS``.
+    File objects are rewound afterwards.
+
+    Returns the number of cells; raises ``ValidationError`` otherwise.
+    """
+    is_path = isinstance(source, (str, os.PathLike))
+    name = name or os.path.basename(str(source) if is_path else source.name)
+    max_bytes = settings.NOTEBOOK_MAX_BYTES
+
+    size = os.path.getsize(source) if is_path else getattr(source, "size", None)
+    if size is not None and size > max_bytes:
+        raise ValidationError(f"{name} ist größer als {_mb(max_bytes)}")
+
+    fh = open(source, "rb") if is_path else source
+    try:
+        fh.seek(0)
+        return _check(_parse(_BoundedReader(fh, max_bytes, name)), name)
+    except PARSE_ERRORS:
+        raise ValidationError(f"{name} ist kein gültiges JSON-Notebook")
+    finally:
+        if is_path:
+            fh.close()
+        else:
+            fh.seek(0)
@@ -0,0 +1,201 @@
+# utils/notebooks.py
+import hashlib, json, logging, os, shutil, tempfile, time
+from html import escape
+from django.conf import settings
+from django.core.cache import cache
+from .background import run_in_background
+
+try:
+    import markdown
+    import nh3
+except ImportError:  # without both, markdown cells are shown as escaped text
+    markdown = nh3 = None
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the generated markup changes; older versions are pruned.
+RENDER_VERSION = 2
+PRUNE_LOCK_KEY = "notebook_cache_pruned"
+PRUNE_INTERVAL = 60 * 60
+TOUCH_AFTER = 24 * 60 * 60  # refresh an entry's mtime (its "last used") at most daily
+
+
+def file_key(path: str) -> str:
+    """Cache key of the file's current version: its path, size and modification time."""
+    st = os.stat(path)
+    return hashlib.sha256(f"{os.path.abspath(path)}\0{st.st_size}\0{st.st_mtime_ns}".encode()).hexdigest()
+
+
+def prune_notebook_cache() -> int:
+    """
+    Delete cached renderings unused for NOTEBOOK_CACHE_MAX_AGE seconds and
+    every older RENDER_VERSION. Returns the number of deleted entries.
+
+    An entry's mtime is its last use (see :func:`_cached`). Replaced or
+    deleted notebooks are never looked up again, so they age out.
+    """
+    root = settings.NOTEBOOK_CACHE_ROOT
+    current = f"v{RENDER_VERSION}"
+    cutoff = time.time() - settings.NOTEBOOK_CACHE_MAX_AGE
+    removed = 0
+    try:
+        entries = list(os.scandir(root))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        if entry.is_dir() and entry.name != current:
+            shutil.rmtree(entry.path, ignore_errors=True)
+    for dirpath, _, filenames in os.walk(os.path.join(root, current)):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            try:
+                if os.stat(path).st_mtime < cutoff:
+                    os.unlink(path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def _source(value) -> str:
+    return "".join(value) if isinstance(value, list) else (value or "")
+
+
+def _render_markdown(text: str) -> str:
+    if markdown is None:
+        return f"<pre>{escape(text)}</pre>"
+    return nh3.clean(markdown.markdown(text, extensions=["fenced_code", "tables"]))
+
+
+def _render_outputs(outputs) -> str:
+    parts = []
+    for output in outputs or []:
+        if not isinstance(output, dict):
+            continue
+        kind = output.get("output_type")
+        if kind == "stream":
+            parts.append(f'<pre class="output-stream">{escape(_source(output.get("text")))}</pre>')
+        elif kind in ("execute_result", "display_data"):
+            text = (output.get("data") or {}).get("text/plain")
+            if text:
+                parts.append(f'<pre class="output-result">{escape(_source(text))}</pre>')
+        elif kind == "error":
+            parts.append(f'<pre class="output-error">{escape(output.get("ename", ""))}: {escape(output.get("evalue", ""))}</pre>')
+    return f'<div class="cell-output">{"".join(parts)}</div>' if parts else ""
+
+
+def _render_cell_content(cell, with_outputs=True) -> str:
+    source = _source(cell.get("source"))
+    if cell.get("cell_type") == "code":
+        html = f'<pre><code class="python">{escape(source)}</code></pre>'
+        if with_outputs:
+            html += _render_outputs(cell.get("outputs"))
+    elif cell.get("cell_type") == "markdown":
+        html = _render_markdown(source)
+    else:
+        html = f"<pre>{escape(source)}</pre>"
+    return f'<div class="cell-content">{html}</div>'
+
+
+def _cells(notebook):
+    cells = notebook.get("cells") if isinstance(notebook, dict) else None
+    if not isinstance(cells, list):
+        raise ValueError("not a Jupyter notebook (missing 'cells')")
+    return [cell for cell in cells if isinstance(cell, dict)]
+
+
+def render_notebook(notebook) -> str:
+    """Render a parsed notebook to the same markup nbviewer.js produces."""
+    html = []
+    for index, cell in enumerate(_cells(notebook), start=1):
+        html.append(
+            f'<div class="notebook-cell"><div class="cell-number">[{index}]:</div>'
+            f"{_render_cell_content(cell)}</div>"
+        )
+    return "".join(html)
+
+
+def render_notebook_diff(reference, submission) -> str:
+    """Side-by-side cell comparison of a reference and a submitted notebook (outputs dropped)."""
+    ref_cells, sub_cells = _cells(reference), _cells(submission)
+
+    def cell(c, status):
+        return f'<div class="notebook-cell diff-{status}">{_render_cell_content(c, with_outputs=False)}</div>'
+
+    html = [
+        '<div class="notebook-diff"><div class="comparison-header">'
+        '<div class="comparison-title">Referenzlösung</div>'
+        '<div class="comparison-title">Studentenlösung</div></div>'
+    ]
+    for i in range(max(len(ref_cells), len(sub_cells))):
+        ref = ref_cells[i] if i < len(ref_cells) else None
+        sub = sub_cells[i] if i < len(sub_cells) else None
+        if ref is None:
+            html.append(f'<div class="cell-comparison"><div></div>{cell(sub, "added")}</div>')
+        elif sub is None:
+            html.append(f'<div class="cell-comparison">{cell(ref, "removed")}<div></div></div>')
+        elif _source(ref.get("source")) == _source(sub.get("source")):
+            html.append(f'<div class="cell-single">{cell(ref, "unchanged")}</div>')
+        else:
+            html.append(f'<div class="cell-comparison">{cell(ref, "removed")}{cell(sub, "added")}</div>')
+    html.append("</div>")
+    return "".join(html)
+
+
+def _load(path: str):
+    with open(path, "rb") as fh:
+        try:
+            return json.load(fh)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"invalid notebook JSON: {e}") from e
+
+
+def _cached(key: str, build):
+    cache_path = os.path.join(settings.NOTEBOOK_CACHE_ROOT, f"v{RENDER_VERSION}", key[:2], f"{key}.html")
+    try:
+        with open(cache_path, "r", encoding="utf-8") as fh:
+            html = fh.read()
+        if os.stat(cache_path).st_mtime < time.time() - TOUCH_AFTER:
+            os.utime(cache_path)
+        return html
+    except FileNotFoundError:
+        pass
+
+    html = build()
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    # Write-then-rename so concurrent readers never see a partial file.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(html)
+        os.replace(tmp, cache_path)
+    except OSError as e:
+        logger.warning("Could not cache rendered notebook %s: %s", key, e)
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+    # At most one pruning walk per interval across all workers
+    if cache.add(PRUNE_LOCK_KEY, True, PRUNE_INTERVAL):
+        run_in_background(prune_notebook_cache)
+    return html
+
+
+def notebook_html(path: str):
+    """
+    Return ``(html, etag)`` for the notebook at *path*.
+
+    The rendered HTML is cached on disk under the file's path, size and
+    mtime, so an unchanged notebook is rendered once and afterwards served
+    with a single file read. Raises ``ValueError`` for files that are not
+    valid notebooks.
+    """
+    key = file_key(path)
+    return _cached(key, lambda: render_notebook(_load(path))), f'"v{RENDER_VERSION}-{key}"'
+
+
+def notebook_diff_html(reference_path: str, submission_path: str):
+    """Like :func:`notebook_html`, for the reference/submission comparison view."""
+    key = f"{file_key(reference_path)[:32]}-{file_key(submission_path)[:32]}"
+    return (
+        _cached(key, lambda: render_notebook_diff(_load(reference_path), _load(submission_path))),
+        f'"v{RENDER_VERSION}-{key}"',
+    )
@@ -0,0 +1,68 @@
+# utils/outline.py
+from django.core.cache import cache
+from django.utils.duration import duration_iso_string
+from course.models import Module, Lesson
+from course.db_router import on_primary
+from .versioning import current_version, bump_version
+
+OUTLINE_VERSION_KEY = "course_outline_version"
+OUTLINE_TIMEOUT = 24 * 60 * 60  # upper bound for a missed invalidation
+
+
+def invalidate_course_outline():
+    """Drop every cached outline. Called after Module/Lesson/Exercise changes (see course/signals.py)."""
+    bump_version(OUTLINE_VERSION_KEY)
+
+
+def _build(course_id) -> dict:
+    modules = {
+        module["id"]: {**module, "lessons": []}
+        for module in Module.objects.filter(course_id=course_id)
+        .order_by("order", "id")
+        .values("id", "title", "order", "difficulty_level")
+    }
+    sequence = []
+    lessons = (
+        Lesson.objects.filter(module__course_id=course_id)
+        .order_by("module__order", "module_id", "order", "id")
+        .values("id", "module_id", "title", "order", "lesson_type", "duration", "lesson_exercise__id")
+    )
+    for row in lessons:
+        duration = row["duration"]
+        lesson = {
+            "id": row["id"],
+            "module_id": row["module_id"],
+            "title": row["title"],
+            "order": row["order"],
+            "lesson_type": row["lesson_type"],
+            "duration": duration_iso_string(duration) if duration else None,
+            "minutes": duration.seconds // 60 if duration else 0,
+            "exercise_id": row["lesson_exercise__id"],
+        }
+        modules[row["module_id"]]["lessons"].append(lesson)
+        sequence.append(lesson)
+    return {"course_id": course_id, "modules": list(modules.values()), "sequence": sequence}
+
+
+def get_course_outline(course_id) -> dict:
+    """
+    Return the module/lesson tree of a course as plain data.
+
+    ``{"course_id", "modules": [{"id", "title", "order", "difficulty_level",
+    "lessons": [...]}], "sequence": [...]}``, where each lesson is
+    ``{"id", "module_id", "title", "order", "lesson_type", "duration",
+    "minutes", "exercise_id"}`` and ``sequence`` lists the same lesson dicts
+    in course order. Cached until the next Module, Lesson or Exercise change.
+    """
+    key = f"course_outline_{course_id}_v{current_version(OUTLINE_VERSION_KEY)}"
+    outline = cache.get(key)
+    if outline is None:
+        with on_primary():  # a lagging replica must not be cached as current
+            outline = _build(course_id)
+        cache.set(key, outline, OUTLINE_TIMEOUT)
+    return outline
+
+
+def outline_module(outline: dict, module_id):
+    """Return the module dict with id *module_id* from *outline*, or None."""
+    return next((module for module in outline["modules"] if module["id"] == module_id), None)
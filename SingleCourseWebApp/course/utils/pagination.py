@@ -0,0 +1,71 @@
+# utils/pagination.py
+import base64, json
+from datetime import date
+from django.db.models import Q
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def _json_default(value):
+    # Full precision; DjangoJSONEncoder cuts datetimes to milliseconds, which breaks ties
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(values) -> str:
+    """Opaque, URL-safe cursor for the sort key *values* of a row."""
+    raw = json.dumps(list(values), default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Inverse of :func:`encode_cursor`; ValueError if *cursor* was not made by it."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+    if not isinstance(values, list):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return values
+
+
+def parse_limit(value, default=PAGE_SIZE) -> int:
+    """Page size from a query parameter, clamped to 1..MAX_PAGE_SIZE; ValueError if not a number."""
+    return min(max(int(value or default), 1), MAX_PAGE_SIZE)
+
+
+def _after(ordering, values):
+    """Q for rows that sort after *values* under *ordering* (a row-value comparison spelled out)."""
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip("-")
+        lookup = f"{name}__lt" if field.startswith("-") else f"{name}__gt"
+        condition |= equal & Q(**{lookup: value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+def paginate_keyset(queryset, ordering, after=None, limit=PAGE_SIZE):
+    """
+    Return ``(rows, next_cursor)`` for the page of *queryset* after the cursor *after*.
+
+    *ordering* lists field names (``-`` for descending) and must end in a
+    unique field such as ``"id"``; the sort columns must not be null. Each
+    page is a range scan from the previous page's last row, so its cost does
+    not grow with the page number. ``next_cursor`` is None on the last page.
+    """
+    queryset = queryset.order_by(*ordering)
+    if after:
+        values = decode_cursor(after)
+        if len(values) != len(ordering):
+            raise ValueError(f"Invalid cursor: {after!r}")
+        queryset = queryset.filter(_after(ordering, values))
+    rows = list(queryset[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, field.lstrip("-")) for field in ordering)
@@ -0,0 +1,142 @@
+# utils/progress.py
+from datetime import timedelta
+from django.core.cache import cache
+from django.db.models import Count, F, FloatField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, Greatest
+from course.models import Enrollment, Lesson, LessonProgress
+from course.db_router import on_primary
+from .outline import OUTLINE_VERSION_KEY, get_course_outline
+from .versioning import current_version, bump_version
+
+MATRIX_VERSION_KEY = "progress_matrix_version"
+MATRIX_TIMEOUT = 60 * 60  # upper bound for a missed invalidation
+
+
+def _percent(completed, total: int):
+    if not total:
+        return Value(0.0)
+    return Cast(completed, FloatField()) * 100.0 / total
+
+
+def record_lesson_completion(student_id, course_id, delta: int, total_lessons: int) -> int:
+    """
+    Add *delta* (+1 or -1) to the student's completed lesson count in one UPDATE.
+
+    *total_lessons* is the current number of lessons in the course; it is
+    stored as well, so the percentage is always relative to the live course.
+    Returns the number of updated enrollments (0 if the student is not enrolled).
+    """
+    completed = Greatest(F("completed_lessons") + delta, 0)
+    return Enrollment.objects.filter(student_id=student_id, course_id=course_id).update(
+        completed_lessons=completed,
+        total_lessons=total_lessons,
+        progress=_percent(completed, total_lessons),
+    )
+
+
+def recompute_progress(course_id) -> int:
+    """
+    Recount completed lessons for every enrollment in the course in one UPDATE.
+
+    Used when lessons are added or removed and by the migration that
+    introduced the counters. Returns the number of updated enrollments.
+    """
+    total = Lesson.objects.filter(module__course_id=course_id).count()
+    completed = Coalesce(
+        Subquery(
+            LessonProgress.objects.filter(
+                student_id=OuterRef("student_id"),
+                lesson__module__course_id=course_id,
+                is_completed=True,
+            )
+            .order_by()
+            .values("student_id")
+            .annotate(count=Count("id"))
+            .values("count")
+        ),
+        0,
+    )
+    return Enrollment.objects.filter(course_id=course_id).update(
+        completed_lessons=completed,
+        total_lessons=total,
+        progress=_percent(completed, total),
+    )
+
+
+def invalidate_progress_matrix():
+    """Drop every cached matrix. Called after complete_lesson and enrollment changes."""
+    bump_version(MATRIX_VERSION_KEY)
+
+
+def _build_matrix(course_id, details: bool) -> dict:
+    outline = get_course_outline(course_id)
+    index = {lesson["id"]: i for i, lesson in enumerate(outline["sequence"])}
+
+    students = {}
+    for student_id, first_name, last_name, email in (
+        Enrollment.objects.filter(course_id=course_id)
+        .order_by("student__last_name", "student__first_name", "student_id")
+        .values_list("student_id", "student__first_name", "student__last_name", "student__email")
+    ):
+        students[student_id] = {
+            "id": student_id, "name": f"{first_name} {last_name}", "email": email, "completed": 0, "count": 0,
+        }
+        if details:
+            students[student_id]["details"] = []
+
+    # One pass over the course's progress rows; without details only the completed ones
+    rows = LessonProgress.objects.filter(lesson_id__in=list(index))  # the outline has the ids; no joins
+    if details:
+        rows = rows.filter(Q(is_completed=True) | Q(time_spent__gt=timedelta(0)))
+        fields = ("student_id", "lesson_id", "is_completed", "completed_at", "time_spent")
+    else:
+        rows = rows.filter(is_completed=True)
+        fields = ("student_id", "lesson_id")
+    for row in rows.order_by().values_list(*fields).iterator(chunk_size=5000):
+        student, position = students.get(row[0]), index.get(row[1])
+        if student is None or position is None:
+            continue
+        if not details or row[2]:
+            student["completed"] |= 1 << position
+            student["count"] += 1
+        if details:
+            completed_at, time_spent = row[3], row[4]
+            student["details"].append([
+                position,
+                int(completed_at.timestamp()) if completed_at and row[2] else None,
+                int(time_spent.total_seconds()) if time_spent else 0,
+            ])
+
+    for student in students.values():
+        student["completed"] = format(student["completed"], "x")
+    return {
+        "encoding": "hex-bitset",
+        "lessons": [
+            {"id": lesson["id"], "title": lesson["title"], "module_id": lesson["module_id"]}
+            for lesson in outline["sequence"]
+        ],
+        "modules": [{"id": module["id"], "title": module["title"]} for module in outline["modules"]],
+        "students": list(students.values()),
+    }
+
+
+def get_progress_matrix(course_id, details: bool = False) -> dict:
+    """
+    Return the student x lesson completion matrix of a course.
+
+    ``lessons`` lists the lessons in course order; lesson *i* is bit *i* of
+    each student's ``completed``, a hex string (bit 0 is the last digit's
+    lowest bit). With *details*, every student also gets ``details``, a list
+    of ``[lesson index, completed_at (unix time or null), time_spent (s)]``.
+    Cached until the next completion toggle, enrollment or outline change.
+    """
+    key = (
+        f"progress_matrix_{course_id}_{int(details)}"
+        f"_v{current_version(MATRIX_VERSION_KEY)}_{current_version(OUTLINE_VERSION_KEY)}"
+    )
+    matrix = cache.get(key)
+    if matrix is None:
+        with on_primary():  # a lagging replica must not be cached as current
+            matrix = _build_matrix(course_id, details)
+        cache.set(key, matrix, MATRIX_TIMEOUT)
+    return matrix
@@ -0,0 +1,281 @@
+# utils/serving.py
+import mimetypes
+import posixpath
+import re
+import uuid
+from pathlib import Path
+
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe, parse_etags
+
+CHUNK_SIZE = 64 * 1024
+MAX_RANGES = 16                 # more than this is treated as abuse → full response
+
+_RANGE_SPEC = re.compile(r"^\s*(\d*)\s*-\s*(\d*)\s*$")
+
+
+def file_etag(statobj) -> str:
+    """Strong ETag derived from file size and modification time (ns)."""
+    return f'"{statobj.st_size:x}-{statobj.st_mtime_ns:x}"'
+
+
+def parse_range_header(header, size):
+    """
+    Parse an RFC 7233 ``Range: bytes=...`` header against a file of *size* bytes.
+
+    Returns ``None`` when the header should be ignored (missing, malformed,
+    other unit, too many ranges), ``[]`` when no range is satisfiable, and
+    otherwise a sorted list of coalesced inclusive ``(start, end)`` tuples.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+
+    parts = spec.split(",")
+    if len(parts) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for part in parts:
+        match = _RANGE_SPEC.match(part)
+        if not match:
+            return None
+        first, last = match.groups()
+        if first == "" and last == "":
+            return None
+        if first == "":                         # suffix range: last N bytes
+            length = int(last)
+            if length == 0:
+                continue
+            start, end = max(size - length, 0), size - 1
+        else:
+            start = int(first)
+            end = int(last) if last else size - 1
+            if last and end < start:
+                return None
+            if start >= size:
+                continue
+            end = min(end, size - 1)
+        ranges.append((start, end))
+
+    ranges.sort()
+    merged = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _etag_matches(header, etag, weak=True):
+    etags = parse_etags(header)
+    if "*" in etags:
+        return True
+    if weak:
+        strip = lambda tag: tag[2:] if tag.startswith("W/") else tag
+        return strip(etag) in {strip(tag) for tag in etags}
+    return etag in etags
+
+
+def _read_range(path, start, end):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = fh.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _multipart_body(path, ranges, size, content_type, boundary):
+    for start, end in ranges:
+        yield (
+            f"\r\n--{boundary}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode("ascii")
+        yield from _read_range(path, start, end)
+    yield f"\r\n--{boundary}--\r\n".encode("ascii")
+
+
+def _multipart_length(ranges, size, content_type, boundary):
+    total = len(f"\r\n--{boundary}--\r\n")
+    for start, end in ranges:
+        total += len(
+            f"\r\n--{boundary}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        )
+        total += end - start + 1
+    return total
+
+
+def _validators(response, etag, statobj, accept_ranges=True):
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(statobj.st_mtime)
+    # Only advertise ranges where the Range header is honoured
+    response.headers["Accept-Ranges"] = "bytes" if accept_ranges else "none"
+    return response
+
+
+def serve_file(request, path, document_root=None, show_indexes=False):
+    """
+    Drop-in replacement for ``django.views.static.serve`` that understands
+    byte ranges and conditional requests.
+
+    Supports single and multipart ``Range`` responses (RFC 7233),
+    ``If-Range``, ``If-None-Match`` and ``If-Modified-Since`` (RFC 7232),
+    so browsers can seek in lesson videos and revalidate large materials
+    without re-downloading them. ``show_indexes`` is accepted for URLconf
+    compatibility but directory listings are never served.
+    """
+    path = posixpath.normpath(path).lstrip("/")
+    fullpath = Path(safe_join(document_root, path))
+    if fullpath.is_dir() or not fullpath.exists():
+        raise Http404(f"“{path}” does not exist")
+
+    statobj = fullpath.stat()
+    size = statobj.st_size
+    etag = file_etag(statobj)
+
+    # Conditional GET: If-None-Match takes precedence over If-Modified-Since.
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    content_type, encoding = mimetypes.guess_type(str(fullpath))
+    content_type = content_type or "application/octet-stream"
+    # Encoded files (.gz, .br, ...) are always sent whole
+    accept_ranges = not encoding
+
+    if if_none_match:
+        if _etag_matches(if_none_match, etag):
+            return _validators(HttpResponseNotModified(), etag, statobj, accept_ranges)
+    else:
+        since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE") or "")
+        if since is not None and int(statobj.st_mtime) <= since:
+            return _validators(HttpResponseNotModified(), etag, statobj, accept_ranges)
+
+    ranges = None
+    if request.method in ("GET", "HEAD") and accept_ranges:
+        ranges = parse_range_header(request.META.get("HTTP_RANGE"), size)
+        if_range = request.META.get("HTTP_IF_RANGE")
+        if ranges is not None and if_range:
+            if if_range.startswith('"') or if_range.startswith("W/"):
+                fresh = _etag_matches(if_range, etag, weak=False)
+            else:
+                fresh = parse_http_date_safe(if_range) == int(statobj.st_mtime)
+            if not fresh:
+                ranges = None
+
+    if ranges is None:
+        response = FileResponse(fullpath.open("rb"), content_type=content_type)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        return _validators(response, etag, statobj, accept_ranges)
+
+    if not ranges:
+        response = HttpResponse(status=416)
+        response.headers["Content-Range"] = f"bytes */{size}"
+        return _validators(response, etag, statobj)
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        response = StreamingHttpResponse(
+            _read_range(fullpath, start, end), status=206, content_type=content_type,
+        )
+        response.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response.headers["Content-Length"] = str(end - start + 1)
+        return _validators(response, etag, statobj)
+
+    boundary = uuid.uuid4().hex
+    response = StreamingHttpResponse(
+        _multipart_body(fullpath, ranges, size, content_type, boundary),
+        status=206,
+        content_type=f"multipart/byteranges; boundary={boundary}",
+    )
+    response.headers["Content-Length"] = str(
+        _multipart_length(ranges, size, content_type, boundary)
+    )
+    return _validators(response, etag, statobj)
+
+
+# Precompressed variants written by course.storage.CompressedManifestStaticFilesStorage,
+# in order of preference.
+STATIC_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+def _accepted_encodings(header):
+    accepted = set()
+    for item in (header or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+_hashed_static_names = None
+
+
+def _is_hashed_static_name(name):
+    """True if *name* is a content-hashed filename from the staticfiles manifest."""
+    global _hashed_static_names
+    if _hashed_static_names is None:
+        from django.contrib.staticfiles.storage import staticfiles_storage
+
+        # The manifest only changes on collectstatic, which is followed by a restart.
+        _hashed_static_names = frozenset(getattr(staticfiles_storage, "hashed_files", {}).values())
+    return name in _hashed_static_names
+
+
+def serve_static(request, path, document_root=None):
+    """
+    Serve collected static files, negotiating precompressed ``.br``/``.gz``
+    siblings via ``Accept-Encoding``.
+
+    Content-hashed names from the manifest are served with
+    ``Cache-Control: immutable``; everything else must revalidate against
+    its ETag. Only routed with ``DEBUG`` (see app/urls.py); in production the
+    web server serves STATIC_ROOT.
+    """
+    path = posixpath.normpath(path).lstrip("/")
+    fullpath = Path(safe_join(document_root, path))
+    if fullpath.is_dir() or not fullpath.exists():
+        raise Http404(f"“{path}” does not exist")
+
+    content_type, encoding = mimetypes.guess_type(str(fullpath))
+    content_type = content_type or "application/octet-stream"
+
+    chosen, content_encoding = fullpath, encoding
+    if not encoding:
+        accepted = _accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING"))
+        for coding, suffix in STATIC_ENCODINGS:
+            candidate = fullpath.with_name(fullpath.name + suffix)
+            if coding in accepted and candidate.exists():
+                chosen, content_encoding = candidate, coding
+                break
+
+    statobj = chosen.stat()
+    etag = file_etag(statobj)
+    cache_control = (
+        IMMUTABLE_CACHE_CONTROL if _is_hashed_static_name(path) else REVALIDATE_CACHE_CONTROL
+    )
+
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = FileResponse(chosen.open("rb"), content_type=content_type)
+        if content_encoding:
+            response.headers["Content-Encoding"] = content_encoding
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Vary"] = "Accept-Encoding"
+    return _validators(response, etag, statobj, accept_ranges=False)
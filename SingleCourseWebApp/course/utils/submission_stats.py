@@ -0,0 +1,223 @@
+# utils/submission_stats.py
+from collections import defaultdict
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max
+from django.db.models.functions import Greatest
+from course.models import Exercise, ExerciseSubmissionStats, Group, GroupMembership, Submission
+from course.db_router import on_primary
+from .versioning import current_version, bump_version
+
+STATISTICS_VERSION_KEY = "submission_statistics_version"
+STATISTICS_TIMEOUT = 60 * 60  # upper bound for a missed invalidation
+HISTOGRAM_BINS = 10
+PERCENTILES = (25, 50, 75, 90)
+
+
+def lock_group_latest(exercise_id, group_id):
+    """
+    Lock the exercise's counter row and return the group's latest submission.
+
+    Returns ``{"id", "score", "passed"}`` or None. Must run inside
+    ``transaction.atomic()``; the lock serialises submissions and grading of
+    one exercise, so the state read here is still current when the counters
+    are updated in the same transaction.
+    """
+    ExerciseSubmissionStats.objects.get_or_create(exercise_id=exercise_id)
+    ExerciseSubmissionStats.objects.select_for_update().filter(exercise_id=exercise_id).exists()
+    return (
+        Submission.objects.filter(exercise_id=exercise_id, student__course_groups__id=group_id)
+        .order_by("-submitted_at", "-id")
+        .values("id", "score", "passed")
+        .first()
+    )
+
+
+def count_submission(exercise_id, previous, submitted_at):
+    """Count a new, ungraded submission of a group whose latest submission was *previous*."""
+    graded = previous is not None and previous["score"] is not None
+    ExerciseSubmissionStats.objects.filter(exercise_id=exercise_id).update(
+        groups_submitted=F("groups_submitted") + (1 if previous is None else 0),
+        groups_pending=F("groups_pending") + (1 if previous is None or graded else 0),
+        groups_passed=Greatest(F("groups_passed") - (1 if graded and previous["passed"] else 0), 0),
+        last_submission_at=submitted_at,
+    )
+
+
+def count_grade(exercise_id, before, submission):
+    """Count the grading of a group's latest *submission*; *before* is its state from ``lock_group_latest``."""
+    pending = -1 if before["score"] is None and submission.score is not None else 0
+    passed = int(bool(submission.passed)) - int(bool(before["passed"]))
+    if pending or passed:
+        ExerciseSubmissionStats.objects.filter(exercise_id=exercise_id).update(
+            groups_pending=Greatest(F("groups_pending") + pending, 0),
+            groups_passed=Greatest(F("groups_passed") + passed, 0),
+        )
+
+
+def rebuild_submission_stats(exercise_ids=None) -> int:
+    """
+    Recount the counters of the given exercises (default: all) from the submissions.
+
+    Returns the number of counter rows written.
+    """
+    exercises = Exercise.objects.all()
+    if exercise_ids is not None:
+        exercises = exercises.filter(id__in=exercise_ids)
+    exercise_ids = list(exercises.values_list("id", flat=True))
+
+    group_of = dict(GroupMembership.objects.values_list("student_id", "group_id"))
+    latest = {}  # (exercise_id, group_id) -> (submitted_at, id, score, passed)
+    for row in (
+        Submission.objects.filter(exercise_id__in=exercise_ids)
+        .order_by()
+        .values_list("exercise_id", "student_id", "submitted_at", "id", "score", "passed")
+        .iterator(chunk_size=5000)
+    ):
+        group_id = group_of.get(row[1])
+        if group_id is None:
+            continue
+        key = (row[0], group_id)
+        if key not in latest or row[2:4] > latest[key][:2]:
+            latest[key] = row[2:]
+
+    stats = {exercise_id: ExerciseSubmissionStats(exercise_id=exercise_id) for exercise_id in exercise_ids}
+    for (exercise_id, _), (submitted_at, _, score, passed) in latest.items():
+        row = stats[exercise_id]
+        row.groups_submitted += 1
+        row.groups_pending += score is None
+        row.groups_passed += bool(score is not None and passed)
+        if row.last_submission_at is None or submitted_at > row.last_submission_at:
+            row.last_submission_at = submitted_at
+
+    with transaction.atomic():
+        ExerciseSubmissionStats.objects.filter(exercise_id__in=exercise_ids).delete()
+        ExerciseSubmissionStats.objects.bulk_create(stats.values(), batch_size=500)
+    return len(stats)
+
+
+def invalidate_submission_statistics():
+    """Drop every cached statistics page. Called after grades and group changes (see course/signals.py)."""
+    bump_version(STATISTICS_VERSION_KEY)
+
+
+def _percentile(ordered, q):
+    """The *q*-th percentile of the sorted list *ordered*, interpolated linearly between ranks."""
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _histogram(scores, maximum):
+    """Counts of *scores* in HISTOGRAM_BINS equal bins from 0 to *maximum* (the last bin includes it)."""
+    counts = [0] * HISTOGRAM_BINS
+    if maximum:
+        for score in scores:
+            counts[min(max(int(score * HISTOGRAM_BINS / maximum), 0), HISTOGRAM_BINS - 1)] += 1
+    return counts
+
+
+def _rollup(rows):
+    """Combine per-(group, exercise) aggregates into avg, max and count."""
+    count = sum(row["count"] for row in rows)
+    if not count:
+        return {"avg_score": 0, "max_score": 0, "submission_count": 0}
+    return {
+        "avg_score": round(sum(row["avg"] * row["count"] for row in rows) / count, 2),
+        "max_score": max(row["max"] for row in rows),
+        "submission_count": count,
+    }
+
+
+def _build_statistics(course_id) -> dict:
+    graded = Submission.objects.filter(
+        exercise__lesson__module__course_id=course_id,
+        score__isnull=False,
+        student__group_memberships__course_id=course_id,  # only group members, attributed to their group
+    ).order_by()
+
+    # One GROUP BY over submissions and group membership
+    by_group, by_exercise = defaultdict(list), defaultdict(list)
+    for row in graded.values("student__group_memberships__group_id", "exercise_id").annotate(
+        avg=Avg("score"), max=Max("score"), count=Count("id")
+    ):
+        by_group[row["student__group_memberships__group_id"]].append(row)
+        by_exercise[row["exercise_id"]].append(row)
+
+    # One fetch of the raw scores for the distributions
+    scores = defaultdict(list)
+    for exercise_id, score in graded.values_list("exercise_id", "score").iterator(chunk_size=5000):
+        scores[exercise_id].append(score)
+
+    groups = {}
+    for group_id, first_name, last_name in (
+        Group.objects.filter(course_id=course_id)
+        .order_by("group_number", "id", "members__id")
+        .values_list("id", "members__first_name", "members__last_name")
+    ):
+        members = groups.setdefault(group_id, [])
+        if first_name is not None:
+            members.append({"name": f"{first_name} {last_name}"})
+    group_stats = [
+        {"group": {"id": group_id, "members": members}, **_rollup(by_group.get(group_id, []))}
+        for group_id, members in groups.items()
+    ]
+
+    exercise_stats = []
+    overall = [0] * HISTOGRAM_BINS
+    for exercise_id, title, maximum in (
+        Exercise.objects.filter(lesson__module__course_id=course_id)
+        .order_by("lesson__module__order", "lesson__order", "id")
+        .values_list("id", "lesson__title", "maximum_points")
+    ):
+        ordered = sorted(scores.get(exercise_id, []))
+        histogram = _histogram(ordered, maximum)
+        overall = [a + b for a, b in zip(overall, histogram)]
+        exercise_stats.append({
+            "id": exercise_id,
+            "title": title,
+            "maximum_points": maximum,
+            **_rollup(by_exercise.get(exercise_id, [])),
+            "groups": len(by_exercise.get(exercise_id, [])),
+            "histogram": histogram,
+            "percentiles": {
+                str(q): round(_percentile(ordered, q), 2) if ordered else None for q in PERCENTILES
+            },
+        })
+
+    return {
+        "groups": group_stats,
+        "exercises": exercise_stats,
+        # All exercises together, each score as a share of its exercise's maximum
+        "distribution": {
+            "labels": [
+                f"{i * 100 // HISTOGRAM_BINS}-{(i + 1) * 100 // HISTOGRAM_BINS} %" for i in range(HISTOGRAM_BINS)
+            ],
+            "counts": overall,
+        },
+        "total_submissions": sum(stat["submission_count"] for stat in group_stats),
+        "average_score": (
+            sum(stat["avg_score"] for stat in group_stats) / len(group_stats) if group_stats else 0
+        ),
+    }
+
+
+def get_submission_statistics(course_id) -> dict:
+    """
+    Return the graded-submission statistics of a course.
+
+    ``groups`` holds per-group ``avg_score``, ``max_score`` and
+    ``submission_count`` with the members' names; ``exercises`` the same per
+    exercise plus a score ``histogram`` (HISTOGRAM_BINS bins from 0 to the
+    maximum points) and ``percentiles``; ``distribution`` is the histogram
+    of all scores as a percentage of their maximum. Cached until the next
+    grade, submission or group membership change.
+    """
+    key = f"submission_statistics_{course_id}_v{current_version(STATISTICS_VERSION_KEY)}"
+    statistics = cache.get(key)
+    if statistics is None:
+        with on_primary():  # a lagging replica must not be cached as current
+            statistics = _build_statistics(course_id)
+        cache.set(key, statistics, STATISTICS_TIMEOUT)
+    return statistics
@@ -0,0 +1,43 @@
+# utils/submissions.py
+from django.db import connection
+from django.db.models import F, OuterRef, Q, Subquery, Window
+from django.db.models.functions import RowNumber
+from course.models import GroupMembership, Submission
+
+STATUS_FILTERS = {
+    "graded": Q(score__isnull=False),
+    "ungraded": Q(score__isnull=True),
+    "passed": Q(passed=True),
+}
+
+
+def _group_of_student(course_id):
+    # At most one row per (course, student), found through the unique index
+    return Subquery(
+        GroupMembership.objects.filter(course_id=course_id, student_id=OuterRef("student_id")).values("group_id")
+    )
+
+
+def latest_group_submissions(exercise_id, course_id):
+    """
+    Return the newest submission of each group for an exercise, annotated with ``group_id``.
+
+    The selection runs in the database: ``DISTINCT ON`` where the backend
+    supports it (PostgreSQL), otherwise a ``ROW_NUMBER()`` window. Students
+    without a group share one bucket (``group_id`` None). The result is a
+    plain queryset, so filters, ordering and slicing apply to the latest
+    submissions only.
+    """
+    group_id = _group_of_student(course_id)
+    submissions = Submission.objects.filter(exercise_id=exercise_id).annotate(group_id=group_id)
+    if connection.features.can_distinct_on_fields:
+        latest = submissions.order_by("group_id", "-submitted_at", "-id").distinct("group_id")
+    else:
+        latest = submissions.annotate(
+            rank=Window(
+                RowNumber(),
+                partition_by=F("group_id"),
+                order_by=[F("submitted_at").desc(), F("id").desc()],
+            )
+        ).filter(rank=1)
+    return Submission.objects.filter(id__in=latest.values("id")).annotate(group_id=group_id)
@@ -0,0 +1,157 @@
+# utils/uploads.py
+import logging, os, shutil
+from datetime import timedelta
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from course.models import ChunkedUpload
+
+logger = logging.getLogger(__name__)
+
+TUS_VERSION = "1.0.0"
+STREAM_BLOCK = 64 * 1024
+
+
+def staging_path(upload: ChunkedUpload) -> str:
+    return os.path.join(settings.RESUMABLE_UPLOAD_DIR, f"{upload.id}.part")
+
+
+def create_upload(user, filename: str, size: int) -> ChunkedUpload:
+    """Register a new resumable upload and preallocate its (sparse) staging file."""
+    if size < 0 or size > settings.MAX_UPLOAD_SIZE:
+        raise ValidationError("Ungültige Dateigröße")
+    purge_stale_uploads()
+
+    chunk_size = settings.RESUMABLE_CHUNK_SIZE
+    upload = ChunkedUpload.objects.create(
+        user=user,
+        filename=os.path.basename(filename)[:255] or "upload",
+        size=size,
+        chunk_size=chunk_size,
+        received="0" * -(-size // chunk_size),
+    )
+    os.makedirs(settings.RESUMABLE_UPLOAD_DIR, exist_ok=True)
+    with open(staging_path(upload), "wb") as fh:
+        fh.truncate(size)
+    return upload
+
+
+def write_chunk(upload: ChunkedUpload, offset: int, stream, length: int) -> ChunkedUpload:
+    """
+    Write one chunk from *stream* at *offset* into the staging file.
+
+    Chunks must start on a chunk boundary and be exactly one chunk long (the
+    last one may be shorter). Returns the refreshed upload. Claimed uploads
+    take no more chunks; their staging file may already have been moved.
+    """
+    if upload.claimed_at:
+        raise ValidationError("Upload wurde bereits verwendet")
+    if offset % upload.chunk_size or not 0 <= offset < upload.size:
+        raise ValidationError("Upload-Offset liegt nicht auf einer Chunk-Grenze")
+    expected = min(upload.chunk_size, upload.size - offset)
+    if length != expected:
+        raise ValidationError(f"Chunk muss {expected} Bytes lang sein")
+
+    # Each chunk owns a disjoint byte range, so parallel writers never overlap.
+    written = 0
+    with open(staging_path(upload), "r+b") as fh:
+        fh.seek(offset)
+        while written < length:
+            block = stream.read(min(STREAM_BLOCK, length - written))
+            if not block:
+                break
+            fh.write(block)
+            written += len(block)
+    if written != length:
+        raise ValidationError("Chunk unvollständig übertragen")
+
+    index = offset // upload.chunk_size
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+        if upload.claimed_at:
+            raise ValidationError("Upload wurde bereits verwendet")
+        upload.received = upload.received[:index] + "1" + upload.received[index + 1:]
+        upload.save(update_fields=["received", "updated_at"])
+    return upload
+
+
+def received_ranges(upload: ChunkedUpload) -> str:
+    """Compact list of received chunk indices, e.g. ``"0-12,15,17-20"``."""
+    ranges, start = [], None
+    for i, flag in enumerate(upload.received + "0"):
+        if flag == "1" and start is None:
+            start = i
+        elif flag == "0" and start is not None:
+            ranges.append(str(start) if start == i - 1 else f"{start}-{i - 1}")
+            start = None
+    return ",".join(ranges)
+
+
+def discard_upload(upload: ChunkedUpload):
+    try:
+        os.unlink(staging_path(upload))
+    except FileNotFoundError:
+        pass
+    upload.delete()
+
+
+def purge_stale_uploads():
+    cutoff = timezone.now() - timedelta(hours=settings.RESUMABLE_UPLOAD_EXPIRY_HOURS)
+    for upload in ChunkedUpload.objects.filter(updated_at__lt=cutoff):
+        logger.info("Discarding stale upload %s (%s)", upload.id, upload.filename)
+        discard_upload(upload)
+
+
+def claim_upload(upload_id, user) -> ChunkedUpload:
+    """
+    Claim the finished upload *upload_id* of *user* or raise ``ValidationError``.
+
+    The claim is a conditional UPDATE, so of two saves racing for the same
+    upload exactly one wins; the other blocks on the row lock and then finds
+    it claimed. Rolling back the claiming save releases the upload again.
+    """
+    uploads = ChunkedUpload.objects.filter(pk=upload_id, user=user)
+    try:
+        now = timezone.now()
+        claimed = uploads.filter(claimed_at__isnull=True).exclude(received__contains="0").update(
+            claimed_at=now, updated_at=now
+        )
+        upload = uploads.get()
+    except (ChunkedUpload.DoesNotExist, ValueError, ValidationError):
+        raise ValidationError("Upload nicht gefunden")
+    if not upload.is_complete:
+        raise ValidationError(f"Upload von {upload.filename} ist noch nicht abgeschlossen")
+    if not claimed:
+        raise ValidationError(f"Upload von {upload.filename} wurde bereits verwendet")
+    return upload
+
+
+def attach_upload(upload: ChunkedUpload, instance, field_name: str):
+    """
+    Point ``instance.<field_name>`` at a finished upload without copying it.
+
+    The storage name is assigned now; the staging file is renamed into place
+    once the surrounding transaction commits, so a rolled-back save leaves the
+    upload intact for another attempt. The caller still saves *instance*.
+
+    Since the file only exists after commit, ``get_available_name`` cannot see
+    names reserved by concurrent saves; the upload id in the name keeps them
+    apart.
+    """
+    field = instance._meta.get_field(field_name)
+    stem, ext = os.path.splitext(upload.filename)
+    name = default_storage.get_available_name(
+        field.generate_filename(instance, f"{stem}_{upload.id.hex[:8]}{ext}"), max_length=field.max_length
+    )
+    setattr(instance, field_name, name)
+
+    def move_into_place():
+        src, dst = staging_path(upload), default_storage.path(name)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        shutil.move(src, dst)  # a plain rename: staging and storage share DATA_ROOT
+        ChunkedUpload.objects.filter(pk=upload.pk).delete()
+
+    transaction.on_commit(move_into_place)
+    return name
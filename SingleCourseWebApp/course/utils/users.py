@@ -0,0 +1,48 @@
+# utils/users.py
+from django.db.models import Q
+from course.models import CustomUserModel
+
+# Keyset orderings of the admin user directory; each ends in the unique id
+USER_SORTS = {
+    "name": ("first_name", "last_name", "id"),
+    "email": ("email", "id"),
+    "joined": ("date_joined", "id"),
+}
+
+ROLE_FILTERS = {
+    "admin": Q(is_superuser=True),
+    "instructor": Q(is_superuser=False, is_instructor=True),
+    "student": Q(is_superuser=False, is_instructor=False),
+}
+
+ENROLLMENT_FILTERS = {
+    "enrolled": Q(enrollment__isnull=False),
+    "not_enrolled": Q(enrollment__isnull=True),
+}
+
+
+def user_ordering(sort: str):
+    """Keyset ordering for ``?sort=`` (``name``, ``email``, ``joined``; ``-`` prefix for descending)."""
+    descending = sort.startswith("-")
+    fields = USER_SORTS[sort.lstrip("-")]  # KeyError for unknown sorts
+    return tuple(f"-{field}" for field in fields) if descending else fields
+
+
+def user_directory(search="", role="", enrollment=""):
+    """
+    Users matching *search* and the role/enrollment filters, with their enrollment.
+
+    Every whitespace-separated term of *search* must occur (case-insensitive)
+    in the first name, last name or email. On PostgreSQL these substring
+    matches use the trigram indexes from migration 0034; elsewhere they scan.
+    """
+    users = CustomUserModel.objects.select_related("enrollment")
+    for term in search.split():
+        users = users.filter(
+            Q(first_name__icontains=term) | Q(last_name__icontains=term) | Q(email__icontains=term)
+        )
+    if role:
+        users = users.filter(ROLE_FILTERS[role])
+    if enrollment:
+        users = users.filter(ENROLLMENT_FILTERS[enrollment])
+    return users
@@ -0,0 +1,21 @@
+# utils/versioning.py
+import time
+from django.core.cache import cache
+
+
+def current_version(key: str) -> int:
+    """Return the version counter stored under *key*, creating it if needed."""
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock so an evicted counter never revives old entries
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key: str):
+    """Move the counter under *key* on, orphaning every entry cached under the old version."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
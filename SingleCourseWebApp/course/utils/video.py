@@ -0,0 +1,173 @@
+# utils/video.py
+import json, logging, os, shutil, subprocess, uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from course.models import Lesson
+
+logger = logging.getLogger(__name__)
+
+# Transcoding is CPU-bound, so it gets its own single worker instead of the
+# shared IO pool in utils/background.py.
+_transcode_executor = ThreadPoolExecutor(max_workers=1)
+
+# A job whose heartbeat is older than one encoder run plus this grace died with its worker
+STALE_GRACE = timedelta(minutes=15)
+
+
+def lesson_hls_dir(lesson_id: int) -> str:
+    return os.path.join(settings.HLS_ROOT, f"lesson_{lesson_id}")
+
+
+def remove_hls_output(lesson_id: int):
+    """Delete every generated rendition and poster of a lesson."""
+    shutil.rmtree(lesson_hls_dir(lesson_id), ignore_errors=True)
+
+
+def _probe_dimensions(src: str):
+    """Return (width, height) of the first video stream, or (None, None)."""
+    try:
+        out = subprocess.run(
+            [settings.FFPROBE_BINARY, "-v", "error", "-select_streams", "v:0",
+             "-show_entries", "stream=width,height", "-of", "json", src],
+            capture_output=True, check=True, text=True, timeout=60,
+        ).stdout
+        stream = json.loads(out)["streams"][0]
+        return int(stream["width"]), int(stream["height"])
+    except Exception as e:
+        logger.warning("ffprobe failed for %s: %s", src, e)
+        return None, None
+
+
+def _ladder_for(src_height):
+    ladder = settings.HLS_LADDER
+    if not src_height:
+        return ladder
+    fitting = [rung for rung in ladder if rung[0] <= src_height]
+    return fitting or ladder[:1]
+
+
+def _bits(rate: str) -> int:
+    rate = rate.lower()
+    if rate.endswith("k"):
+        return int(float(rate[:-1]) * 1000)
+    if rate.endswith("m"):
+        return int(float(rate[:-1]) * 1000 * 1000)
+    return int(rate)
+
+
+def _encode_rendition(src: str, out_dir: str, height: int, v_rate: str, a_rate: str):
+    os.makedirs(out_dir, exist_ok=True)
+    seg = settings.HLS_SEGMENT_SECONDS
+    subprocess.run(
+        [settings.FFMPEG_BINARY, "-y", "-v", "error", "-i", src,
+         "-vf", f"scale=-2:{height}",
+         "-c:v", "libx264", "-preset", "veryfast", "-profile:v", "main",
+         "-b:v", v_rate, "-maxrate", v_rate, "-bufsize", f"{2 * _bits(v_rate)}",
+         "-force_key_frames", f"expr:gte(t,n_forced*{seg})", "-sc_threshold", "0",
+         "-c:a", "aac", "-b:a", a_rate, "-ac", "2",
+         "-hls_time", str(seg), "-hls_playlist_type", "vod",
+         "-hls_segment_filename", os.path.join(out_dir, "seg_%04d.ts"),
+         os.path.join(out_dir, "index.m3u8")],
+        check=True, capture_output=True, timeout=settings.HLS_ENCODE_TIMEOUT,
+    )
+
+
+def _extract_poster(src: str, dest: str):
+    subprocess.run(
+        [settings.FFMPEG_BINARY, "-y", "-v", "error", "-ss", "1", "-i", src,
+         "-frames:v", "1", "-vf", "scale=-2:720", dest],
+        check=True, capture_output=True, timeout=120,
+    )
+
+
+def _write_master_playlist(path: str, renditions, src_w, src_h):
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for height, v_rate, a_rate in renditions:
+        attrs = f"BANDWIDTH={_bits(v_rate) + _bits(a_rate)}"
+        if src_w and src_h:
+            width = int(round(src_w * height / src_h / 2)) * 2
+            attrs += f",RESOLUTION={width}x{height}"
+        lines += [f"#EXT-X-STREAM-INF:{attrs}", f"{height}p/index.m3u8"]
+    with open(path, "w") as fh:
+        fh.write("\n".join(lines) + "\n")
+
+
+def transcode_lesson_video(lesson_id: int, source_name: str):
+    """Build the HLS ladder and poster for one uploaded video of a lesson."""
+    # Every status write is conditional on the source still being current, so
+    # a job for a replaced upload can never overwrite the newer one.
+    current = Lesson.objects.filter(pk=lesson_id, video_file=source_name)
+    work_dir = os.path.join(lesson_hls_dir(lesson_id), uuid.uuid4().hex[:12])
+    try:
+        if not current.update(video_status="processing", video_status_at=timezone.now()):
+            return
+        if not shutil.which(settings.FFMPEG_BINARY):
+            raise RuntimeError(f"encoder '{settings.FFMPEG_BINARY}' not found")
+
+        src = os.path.join(settings.DATA_ROOT, source_name)
+        src_w, src_h = _probe_dimensions(src)
+        renditions = _ladder_for(src_h)
+        for height, v_rate, a_rate in renditions:
+            current.update(video_status_at=timezone.now())  # heartbeat, see stale_transcodes()
+            _encode_rendition(src, os.path.join(work_dir, f"{height}p"), height, v_rate, a_rate)
+        _extract_poster(src, os.path.join(work_dir, "poster.jpg"))
+        _write_master_playlist(os.path.join(work_dir, "master.m3u8"), renditions, src_w, src_h)
+
+        rel_dir = os.path.relpath(work_dir, settings.DATA_ROOT).replace(os.sep, "/")
+        if not current.update(
+            video_status="ready",
+            video_status_at=timezone.now(),
+            video_playlist=f"{rel_dir}/master.m3u8",
+            video_poster=f"{rel_dir}/poster.jpg",
+        ):
+            shutil.rmtree(work_dir, ignore_errors=True)
+            return
+
+        # Drop renditions of earlier uploads now that the new ladder is live.
+        for entry in os.listdir(lesson_hls_dir(lesson_id)):
+            old = os.path.join(lesson_hls_dir(lesson_id), entry)
+            if old != work_dir:
+                shutil.rmtree(old, ignore_errors=True)
+        logger.info("✓ Transcoded lesson %s into %d renditions", lesson_id, len(renditions))
+    except Exception as e:
+        stderr = getattr(e, "stderr", b"") or b""
+        logger.error("Transcoding lesson %s failed: %s %s", lesson_id, e,
+                     stderr.decode(errors="replace")[-2000:] if isinstance(stderr, bytes) else stderr)
+        shutil.rmtree(work_dir, ignore_errors=True)
+        current.update(video_status="failed", video_status_at=timezone.now())
+
+
+def stale_transcodes():
+    """
+    Lessons whose transcode job died with its process (worker restart, deploy).
+
+    A running job refreshes ``video_status_at`` before every rendition, so a
+    ``processing`` or ``pending`` row that has not been touched for longer
+    than one encoder run can be requeued safely.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.HLS_ENCODE_TIMEOUT) - STALE_GRACE
+    return Lesson.objects.filter(video_status__in=("pending", "processing")).filter(
+        Q(video_status_at__lt=cutoff) | Q(video_status_at__isnull=True)
+    )
+
+
+def _transcode_in_thread(lesson_id: int, source_name: str):
+    try:
+        transcode_lesson_video(lesson_id, source_name)
+    finally:
+        connection.close()
+
+
+def start_video_transcode(lesson_id: int):
+    """
+    Queue HLS transcoding for the lesson's current video.
+    Called AFTER the DB transaction commits.
+    """
+    lesson = Lesson.objects.only("video_file").get(pk=lesson_id)
+    if not lesson.video_file:
+        return
+    _transcode_executor.submit(_transcode_in_thread, lesson_id, lesson.video_file.name)
@@ -22,11 +22,15 @@ from django.contrib.auth import login, authenticate
 from django.conf import settings
 from .models import (
     Course, Enrollment, LessonProgress, Lesson, Exercise, Group, Module,
-    ExerciseMaterial, JupyterLabImage, CustomUserModel, Submission, SubmissionFile, Ticket
+    ExerciseMaterial, JupyterLabImage, CustomUserModel, Submission, SubmissionFile, Ticket,
+    ChunkedUpload
 )
+import base64
+import hashlib
 import json
-from django.core.serializers.json import DjangoJSONEncoder
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponse, Http404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
 from django.views.decorators.http import require_POST, require_http_methods
 from functools import wraps
 from django.core.exceptions import PermissionDenied, ValidationError
@@ -38,6 +42,9 @@ from django.utils import timezone
 from datetime import datetime, timedelta
 from django.core.files.base import ContentFile
 from .forms import JupyterExerciseUploadForm, ExerciseMaterialForm
+from .db_router import use_replica
+from .context import get_course_context
+from .upload_handlers import progress_cache_key, valid_progress_id
 from django.core.cache import cache
 import shutil
 import os
@@ -49,6 +56,21 @@ from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.db import transaction
 from .utils.files import start_group_copies
+from .utils.video import start_video_transcode, remove_hls_output
+from .utils.notebooks import notebook_html, notebook_diff_html
+from .utils.notebook_validation import validate_notebook
+from .utils.images import start_ticket_processing, remove_ticket_image_variants
+from .utils.activity import buffered_last_seen
+from .utils.outline import get_course_outline, outline_module, invalidate_course_outline
+from .utils.progress import record_lesson_completion, get_progress_matrix, invalidate_progress_matrix
+from .utils.submission_stats import lock_group_latest, count_submission, count_grade, get_submission_statistics
+from .utils.pagination import paginate_keyset, parse_limit
+from .utils.users import ROLE_FILTERS, ENROLLMENT_FILTERS, user_directory, user_ordering
+from .utils.submissions import STATUS_FILTERS, latest_group_submissions
+from .utils.uploads import (
+    TUS_VERSION, create_upload, write_chunk, received_ranges, discard_upload, claim_upload,
+    attach_upload
+)
 
 logger = logging.getLogger(__name__)
 
@@ -174,11 +196,7 @@ def course_context_processor(request):
     Returns:
         dict: A dictionary containing the course object if it exists.
     """
-    try:
-        course = Course.objects.first()
-    except Course.DoesNotExist:
-        course = None
-    return {'course': course}
+    return {'course': get_course_context(request).course}
 
 def require_enrollment_and_group(view_func):
     """Decorator to check if user is enrolled in course and belongs to a group.
@@ -191,20 +209,21 @@ def require_enrollment_and_group(view_func):
     """
     @wraps(view_func)
     def _wrapped_view(request, *args, **kwargs):
-        # Extract course_id from kwargs, or from lesson_id if present
-        course_id = kwargs.get('course_id')
-        if not course_id and 'lesson_id' in kwargs:
-            lesson = get_object_or_404(Lesson, id=kwargs['lesson_id'])
-            course_id = lesson.module.course.id
-            
-        course = get_object_or_404(Course, id=course_id)
+        # Pin the request's course context to course_id, or to the lesson's course
+        ctx = get_course_context(request)
+        if kwargs.get('course_id'):
+            ctx.use_course(kwargs['course_id'])
+        elif 'lesson_id' in kwargs:
+            ctx.lesson(kwargs['lesson_id'])
+        else:
+            ctx.require_course()
         
         # Check enrollment
-        if not Enrollment.objects.filter(student=request.user, course=course).exists():
+        if not ctx.is_enrolled:
             return redirect('course:home')
             
         # Check group membership
-        if not Group.objects.filter(course=course, members=request.user).exists():
+        if ctx.group is None:
             return redirect('course:home')
             
         return view_func(request, *args, **kwargs)
@@ -248,26 +267,22 @@ def home(request):
     Returns:
         HttpResponse: The rendered home template with course context.
     """
-    course = Course.objects.first()
+    ctx = get_course_context(request)
+    course = ctx.course
     if not course:
         return render(request, 'course/course_not_published.html')
     
-    is_enrolled = False
-    user_group = None
+    is_enrolled = ctx.is_enrolled
+    user_group = ctx.group
+    is_instructor = ctx.is_instructor
     available_groups = []
-    is_instructor = False
     
-    if request.user.is_authenticated:
-        is_enrolled = Enrollment.objects.filter(student=request.user, course=course).exists()
-        user_group = Group.objects.filter(course=course, members=request.user).first()
-        is_instructor = course.instructor == request.user or request.user.is_instructor
-
-        # Get available groups (not full and user not already in them)
-        if is_enrolled and not user_group:
-            available_groups = Group.objects.filter(course=course)\
-                .annotate(members_count=models.Count('members'))\
-                .filter(members_count__lt=course.max_members)\
-                .exclude(members=request.user)
+    # Get available groups (not full and user not already in them)
+    if is_enrolled and not user_group:
+        available_groups = Group.objects.filter(course=course)\
+            .annotate(members_count=models.Count('members'))\
+            .filter(members_count__lt=course.max_members)\
+            .exclude(members=request.user)
     
     context = {
         'course': course,
@@ -291,43 +306,29 @@ def course_enroll(request, course_id):
     """
     course = get_object_or_404(Course, id=course_id)
     
-    # Debug information
-    logger.info(f"Course enrollment request for course ID: {course_id}")
-    logger.info(f"Course enrollment key: {course.enrollment_key}")
-    logger.info(f"Request method: {request.method}")
-    logger.info(f"Request headers: {dict(request.headers)}")
-    
     # If using AJAX request to check enrollment key
     if request.method == 'POST' and request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         try:
-            # Debug the request body
-            request_body = request.body.decode('utf-8')
-            logger.info(f"Request body: {request_body}")
-            
-            data = json.loads(request_body)
+            data = json.loads(request.body.decode('utf-8'))
             entered_key = data.get('enrollment_key', '').strip()
-            logger.info(f"Entered enrollment key: {entered_key}")
             
             # Check if the course requires an enrollment key
             if course.enrollment_key:
-                logger.info(f"Comparing keys: '{entered_key}' vs '{course.enrollment_key}'")
                 # Verify the enrollment key
                 if entered_key != course.enrollment_key:
-                    logger.info("Enrollment key verification failed")
+                    logger.info("Wrong enrollment key from user %s for course %s", request.user.id, course_id)
                     return JsonResponse({
                         'success': False,
                         'message': 'Der eingegebene Einschreibeschlüssel ist falsch. Bitte versuchen Sie es erneut.'
                     })
-                logger.info("Enrollment key verification successful")
-            else:
-                logger.info("No enrollment key required for this course")
             
             # Create enrollment
             enrollment, created = Enrollment.objects.get_or_create(
                 student=request.user,
                 course=course
             )
-            logger.info(f"Enrollment created: {created}")
+            if created:
+                logger.info("User %s enrolled in course %s", request.user.id, course_id)
             
             # Return success with available groups for the next step
             available_groups = Group.objects.filter(course=course)\
@@ -342,8 +343,6 @@ def course_enroll(request, course_id):
             } for group in available_groups]
             
             requires_group = course.max_members > 1 and not Group.objects.filter(course=course, members=request.user).exists()
-            logger.info(f"Requires group: {requires_group}")
-            logger.info(f"Available groups: {len(groups_data)}")
                 
             return JsonResponse({
                 'success': True,
@@ -390,87 +389,46 @@ def course_overview(request, course_id):
     Returns:
         HttpResponse: The rendered course overview template.
     """
-    course = get_object_or_404(Course, id=course_id)
+    course = get_course_context(request).use_course(course_id)
     
     # Check if course is published or user is instructor
     if not course.is_published and not request.user.is_instructor:
         return render(request, 'course/course_not_published.html')
     
-    # Get all modules with their lessons, ordered by their respective order fields
-    modules = course.modules.prefetch_related('lessons').all()
-    
-    # Get the user's progress for all lessons in the course
-    lesson_progress = LessonProgress.objects.filter(
+    # The module/lesson tree is cached; only the student's completions are per request
+    outline = get_course_outline(course.id)
+    completed = set(LessonProgress.objects.filter(
         student=request.user,
-        lesson__module__course=course
-    ).select_related('lesson')
-    
-    # Create a progress lookup dictionary for quick access
-    progress_lookup = {
-        progress.lesson_id: progress 
-        for progress in lesson_progress
-    }
-    
-    # Prepare module data with lessons and progress
-    modules_data = []
-    for module in modules:
-        lessons_data = [{
-            'lesson': lesson,
-            'progress': progress_lookup.get(lesson.id)
-        } for lesson in module.lessons.all()]
-        
-        modules_data.append({
-            'module': module,
-            'lessons': lessons_data
-        })
+        lesson__module__course=course,
+        is_completed=True
+    ).values_list('lesson_id', flat=True))
 
-    # Calculate total and completed lessons
-    total_lessons = sum(len(module.lessons.all()) for module in modules)
-    completed_lessons = len([p for p in lesson_progress if p.is_completed])
-    
-    # Update debug data to include the counts
-    debug_data = {
-        'course_title': course.title,
-        'total_lessons': total_lessons,
-        'completed_lessons': completed_lessons,
-        'modules': [{
-            'title': module_data['module'].title,
-            'difficulty_level': module_data['module'].difficulty_level,
-            'lessons': [{
-                'title': lesson_data['lesson'].title,
-                'id': lesson_data['lesson'].id,
-                'order': lesson_data['lesson'].order,
-                'duration': lesson_data['lesson'].duration,
-                'debug_minutes': lesson_data['lesson'].duration.seconds // 60 if lesson_data['lesson'].duration else 0,  # Add debug info
-                'lesson_type': lesson_data['lesson'].lesson_type,  # Add lesson type
-                'is_completed': bool(lesson_data['progress'] and lesson_data['progress'].is_completed)
-            } for lesson_data in module_data['lessons']]
-        } for module_data in modules_data]
-    }
-    
-    # Find the first incomplete lesson
-    first_incomplete_lesson = None
-    for module in modules:
-        for lesson in module.lessons.all():
-            if lesson.id not in progress_lookup or not progress_lookup[lesson.id].is_completed:
-                first_incomplete_lesson = lesson
-                break
-        if first_incomplete_lesson:
-            break
-    
-    # If all lessons are complete, use the last lesson
-    if not first_incomplete_lesson and modules:
-        last_module = modules.last()
-        if last_module:
-            first_incomplete_lesson = last_module.lessons.last()
+    modules_data = [{
+        **module,
+        'lessons': [{**lesson, 'is_completed': lesson['id'] in completed} for lesson in module['lessons']]
+    } for module in outline['modules']]
+
+    sequence = outline['sequence']
+    total_lessons = len(sequence)
+    completed_lessons = sum(1 for lesson in sequence if lesson['id'] in completed)
+
+    # Continue with the first incomplete lesson, or the last one once all are complete
+    continue_lesson = next((lesson for lesson in sequence if lesson['id'] not in completed), None)
+    if continue_lesson is None and sequence:
+        continue_lesson = sequence[-1]
 
     context = {
         'course_title': course.title,
         'modules_data': modules_data,
         'total_lessons': total_lessons,
         'completed_lessons': completed_lessons,
-        'debug_data_json': json.dumps(debug_data, cls=DjangoJSONEncoder),
-        'continue_lesson': first_incomplete_lesson,
+        'debug_data_json': json.dumps({
+            'course_title': course.title,
+            'total_lessons': total_lessons,
+            'completed_lessons': completed_lessons,
+            'modules': modules_data,
+        }),
+        'continue_lesson': continue_lesson,
     }
     return render(request, 'course/learningpage/learn.html', context)
 
@@ -699,9 +657,7 @@ def create_module(request, course_id):
         })
         
     except Exception as e:
-        import traceback
-        print(f"Error creating module: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error creating module")
         return JsonResponse({
             'success': False,
             'error': str(e)
@@ -865,13 +821,14 @@ def update_module_order(request):
     try:
         data = json.loads(request.body)
         modules = data.get('modules', [])
-        print(modules)
+        logger.debug("Reordering %d modules", len(modules))
         if request.user.is_superuser:
             with transaction.atomic():
                 for module_data in modules:
                     Module.objects.filter(
                         id=module_data['id'],
                     ).update(order=module_data['order'])
+                transaction.on_commit(invalidate_course_outline)
         else:
             return JsonResponse({'success': False, 'error': 'You are not authorized to reorder modules, please contact the administrator.'})
         
@@ -902,8 +859,9 @@ def lesson_detail(request, lesson_id):
     Returns:
         HttpResponse: The rendered lesson detail template.
     """
-    lesson = get_object_or_404(Lesson, id=lesson_id)
-    course = lesson.module.course
+    ctx = get_course_context(request)
+    lesson = ctx.lesson(lesson_id)
+    course = ctx.course
     current_module = lesson.module
     
     # Check if course is published or user is instructor
@@ -916,28 +874,16 @@ def lesson_detail(request, lesson_id):
         lesson=lesson
     )
     
-    # Get the user's progress for lessons in the current module
-    lesson_progress = LessonProgress.objects.filter(
+    # Overlay the student's completions onto the cached lessons of the current module
+    completed = set(LessonProgress.objects.filter(
         student=request.user,
-        lesson__module=current_module
-    ).select_related('lesson')
-    
-    # Create a progress lookup dictionary for quick access
-    progress_lookup = {
-        progress.lesson_id: progress 
-        for progress in lesson_progress
-    }
-    
-    # Prepare only the current module's data with lessons and progress
-    lessons_data = [{
-        'lesson_title': lesson.title,
-        'lesson_id': lesson.id,
-        'progress': progress_lookup.get(lesson.id)
-    } for lesson in current_module.lessons.all()]
-    
+        lesson__module=current_module,
+        is_completed=True
+    ).values_list('lesson_id', flat=True))
+    module = outline_module(get_course_outline(course.id), current_module.id) or {'lessons': []}
     modules_data = [{
         'module': current_module,
-        'lessons': lessons_data
+        'lessons': [{**item, 'is_completed': item['id'] in completed} for item in module['lessons']]
     }]
     
     # Base response data
@@ -955,12 +901,16 @@ def lesson_detail(request, lesson_id):
         response_data['lesson_content'] = lesson.lesson_content
     elif lesson.lesson_type == 'video':
         response_data['video_url'] = lesson.video_file.url if lesson.video_file else None
+        # Prefer the adaptive-bitrate ladder once the background transcode is done
+        if lesson.video_status == 'ready' and lesson.video_playlist:
+            response_data['video_playlist_url'] = lesson.video_playlist.url
+            response_data['video_poster_url'] = lesson.video_poster.url if lesson.video_poster else None
     elif lesson.lesson_type == 'exercise':
         # Get the exercise object
         try:
             exercise = lesson.lesson_exercise
             # Get user's group
-            group = Group.objects.filter(course=lesson.module.course, members=request.user).first()
+            group = ctx.group
             
             # Get latest submission for the group
             latest_submission = None
@@ -1034,6 +984,7 @@ def get_lesson(request, lesson_id):
             'lesson_content': lesson.lesson_content,
             'duration': lesson.duration.total_seconds() // 60,  # Convert to minutes
             'video_file': lesson.video_file.url if lesson.video_file else None,
+            'video_status': lesson.video_status,
         }
     }
     
@@ -1138,7 +1089,9 @@ def delete_lesson(request, lesson_id):
                                 logger.error(f"Error deleting group directory {group_path}: {str(e)}")
             
             # Delete the lesson (this will cascade delete the exercise and materials)
+            lesson_pk = lesson.id
             lesson.delete()
+            transaction.on_commit(lambda: remove_hls_output(lesson_pk))
             
             # Clean up exercise files directory after successful lesson deletion
             if exercise_files_path and os.path.exists(exercise_files_path):
@@ -1173,13 +1126,13 @@ def save_lesson(request, lesson_id):
         lesson = get_object_or_404(Lesson, id=lesson_id)
         old_title = lesson.title  # Store old title for directory renaming
         
-        # Log request data for debugging
-        print(f"Saving lesson {lesson_id}")
-        print(f"POST data: {request.POST}")
-        print(f"Files: {request.FILES}")
-        print(f"Files count: {len(request.FILES)}")
+        # Log field names and file metadata only, never the submitted content
+        logger.debug("Saving lesson %s (fields: %s)", lesson_id, ', '.join(request.POST.keys()))
         for key, value in request.FILES.items():
-            print(f"File {key}: {value.name} ({value.size} bytes)")
+            logger.info(
+                "Lesson %s upload %s: %s (%d bytes, sha256 %s)",
+                lesson_id, key, value.name, value.size, getattr(value, 'sha256', '-')
+            )
         
         with transaction.atomic():
             # Update basic lesson info
@@ -1189,17 +1142,28 @@ def save_lesson(request, lesson_id):
             lesson.lesson_type = request.POST.get('lesson_type', lesson.lesson_type)
             lesson.duration = timedelta(minutes=int(request.POST.get('duration', 10)))
 
-            # Handle video file upload
-            if lesson.lesson_type == 'video' and 'video_file' in request.FILES:
-                video_file = request.FILES['video_file']
-                print(f"Uploading video file: {video_file.name}")
+            # Handle video file upload (multipart file or finished resumable upload)
+            video_upload_id = request.POST.get('video_upload_id')
+            if lesson.lesson_type == 'video' and ('video_file' in request.FILES or video_upload_id):
+                video_upload = claim_upload(video_upload_id, request.user) if video_upload_id else None
                 
-                # Delete old video file if exists
+                # Delete old video file and its renditions if they exist
                 if lesson.video_file:
                     lesson.video_file.delete(save=False)
+                lesson.video_playlist = None
+                lesson.video_poster = None
+                lesson.video_status = 'pending'
+                lesson.video_status_at = timezone.now()
                 
                 # Save new video file
-                lesson.video_file = video_file
+                if video_upload:
+                    attach_upload(video_upload, lesson, 'video_file')
+                else:
+                    video_file = request.FILES['video_file']
+                    lesson.video_file = video_file
+                
+                # Build the HLS ladder in the background once the upload is committed
+                transaction.on_commit(lambda: start_video_transcode(lesson.id))
 
             # Update lesson content for all lesson types
             content = request.POST.get('content', '')
@@ -1207,15 +1171,13 @@ def save_lesson(request, lesson_id):
             
             if lesson.lesson_type == 'exercise':
                 exercise_type = request.POST.get('exercise_type')
-                print(f"Exercise type: {exercise_type}")
                 
                 # Get or create exercise object using the correct related name
                 try:
                     exercise = lesson.lesson_exercise
-                    print(f"Found existing exercise: {exercise.id}")
                 except Exercise.DoesNotExist:
                     exercise = Exercise(lesson=lesson)
-                    print("Creating new exercise")
+                    logger.debug("Creating exercise for lesson %s", lesson_id)
                 
                 # Update exercise type
                 exercise.exercise_type = exercise_type
@@ -1234,8 +1196,6 @@ def save_lesson(request, lesson_id):
                 
                 # Handle Jupyter notebook specific files
                 if exercise_type == 'jupyter':
-                    print("Processing Jupyter exercise files")
-                    
                     # Always get groups here
                     course = lesson.module.course
                     groups = course.groups.all()
@@ -1249,7 +1209,7 @@ def save_lesson(request, lesson_id):
                     # Handle notebook file
                     if 'jupyter_file' in request.FILES:
                         jupyter_file = request.FILES['jupyter_file']
-                        print(f"Uploading Jupyter file: {jupyter_file.name}")
+                        validate_notebook(jupyter_file)
                         
                         # Delete old file if exists
                         if exercise.file:
@@ -1265,38 +1225,42 @@ def save_lesson(request, lesson_id):
                         if exercise:
                             transaction.on_commit(lambda: start_group_copies(exercise.id))
                     # Handle materials
-                    if 'materials' in request.FILES:
+                    material_upload_ids = request.POST.getlist('material_upload_ids')
+                    if 'materials' in request.FILES or material_upload_ids:
                         try:
                             # Get list of all material files
                             materials = request.FILES.getlist('materials')
-                            print(f"Processing {len(materials)} material files")
+                            material_uploads = [claim_upload(upload_id, request.user) for upload_id in material_upload_ids]
+                            logger.debug("Processing %d material files", len(materials) + len(material_uploads))
                             
                             # Remove old materials if new ones are being uploaded
-                            if materials:
-                                print("Removing old materials")
+                            if materials or material_uploads:
                                 exercise.materials.all().delete()
                             
+                            # Add resumable uploads by moving their staging files into place
+                            for upload in material_uploads:
+                                material_obj = ExerciseMaterial(
+                                    exercise=exercise,
+                                    description=f"Material: {upload.filename}"
+                                )
+                                attach_upload(upload, material_obj, 'file')
+                                material_obj.save()
+                            
                             # Add new materials
                             for material in materials:
-                                print(f"Adding material: {material.name} ({material.size} bytes)")
-                                try:
-                                    material_obj = ExerciseMaterial.objects.create(
-                                        exercise=exercise,
-                                        file=material,
-                                        description=f"Material: {material.name}"
-                                    )
-                                    print(f"Successfully created material: {material_obj.id}")
-                                except Exception as e:
-                                    print(f"Error creating material {material.name}: {str(e)}")
-                                    raise
+                                ExerciseMaterial.objects.create(
+                                    exercise=exercise,
+                                    file=material,
+                                    description=f"Material: {material.name}"
+                                )
                             
                             # Copy all files to group directories after materials are added
                             #for group in groups:
                             #    copy_exercise_files(group, exercise)
                             if exercise:
                                 transaction.on_commit(lambda: start_group_copies(exercise.id))   
-                        except Exception as e:
-                            print(f"Error processing materials: {str(e)}")
+                        except Exception:
+                            logger.exception("Error processing materials for lesson %s", lesson_id)
                             raise
             
             lesson.save()
@@ -1327,15 +1291,114 @@ def save_lesson(request, lesson_id):
             
             return JsonResponse(response_data)
             
+    except ValidationError as e:
+        return JsonResponse({
+            'success': False,
+            'error': e.messages[0]
+        }, status=400)
     except Exception as e:
-        import traceback
-        print("Error saving lesson:")
-        print(traceback.format_exc())
+        logger.exception("Error saving lesson %s", lesson_id)
         return JsonResponse({
             'success': False,
             'error': str(e)
         }, status=400)
 
+def _tus_response(status=204, upload=None):
+    response = HttpResponse(status=status)
+    response['Tus-Resumable'] = TUS_VERSION
+    if upload is not None:
+        response['Upload-Offset'] = str(upload.offset)
+        response['Upload-Length'] = str(upload.size)
+        response['Upload-Chunk-Size'] = str(upload.chunk_size)
+        response['Upload-Received'] = received_ranges(upload)
+        response['Cache-Control'] = 'no-store'
+    return response
+
+@login_required
+@require_POST
+def create_chunked_upload(request):
+    """Start a resumable upload for a lesson video or exercise material.
+    
+    Follows the tus creation flow: the client announces ``Upload-Length``
+    and the file name in ``Upload-Metadata`` (``filename <base64>``), then
+    PATCHes the chunks to the returned ``Location``.
+    
+    Args:
+        request: The HTTP request object.
+        
+    Returns:
+        HttpResponse: 201 with the upload URL in ``Location``.
+    """
+    if not request.user.is_instructor:
+        return JsonResponse({'success': False, 'error': 'Keine Berechtigung'}, status=403)
+
+    metadata = {}
+    for item in request.headers.get('Upload-Metadata', '').split(','):
+        key, _, value = item.strip().partition(' ')
+        if key:
+            try:
+                metadata[key] = base64.b64decode(value).decode('utf-8')
+            except (ValueError, UnicodeDecodeError):
+                return JsonResponse({'success': False, 'error': 'Ungültige Upload-Metadata'}, status=400)
+
+    try:
+        upload = create_upload(
+            request.user,
+            metadata.get('filename', 'upload'),
+            int(request.headers['Upload-Length'])
+        )
+    except (KeyError, ValueError):
+        return JsonResponse({'success': False, 'error': 'Upload-Length fehlt'}, status=400)
+    except ValidationError as e:
+        return JsonResponse({'success': False, 'error': e.messages[0]}, status=413)
+
+    response = _tus_response(201, upload)
+    response['Location'] = reverse('course:chunked_upload', args=[upload.id])
+    return response
+
+@login_required
+@require_http_methods(['HEAD', 'PATCH', 'DELETE'])
+def chunked_upload(request, upload_id):
+    """Resume (HEAD), append a chunk to (PATCH) or abort (DELETE) an upload.
+    
+    PATCH bodies are raw bytes (``application/offset+octet-stream``) for the
+    chunk starting at ``Upload-Offset``. Chunks may be sent in parallel and
+    in any order; ``Upload-Received`` lists the chunk indices already stored.
+    
+    Args:
+        request: The HTTP request object.
+        upload_id: The UUID of the upload.
+        
+    Returns:
+        HttpResponse: 204 with the current upload state headers.
+    """
+    upload = get_object_or_404(ChunkedUpload, id=upload_id, user=request.user)
+
+    if request.method == 'HEAD':
+        return _tus_response(200, upload)
+
+    if request.method == 'DELETE':
+        discard_upload(upload)
+        return _tus_response(204)
+
+    if request.content_type != 'application/offset+octet-stream':
+        return _tus_response(415, upload)
+    try:
+        offset = int(request.headers['Upload-Offset'])
+        length = int(request.headers['Content-Length'])
+    except (KeyError, ValueError):
+        return _tus_response(400, upload)
+    try:
+        upload = write_chunk(upload, offset, request, length)
+    except ValidationError as e:
+        logger.warning(f"Rejected chunk for upload {upload.id}: {e.messages[0]}")
+        return _tus_response(409, upload)
+    except FileNotFoundError:
+        # Claimed between our lookup and the write: the staging file has been moved
+        logger.warning(f"Rejected chunk for upload {upload.id}: staging file is gone")
+        return _tus_response(409, upload)
+    return _tus_response(204, upload)
+
 @login_required
 @require_POST
 def complete_lesson(request, lesson_id):
@@ -1351,46 +1414,39 @@ def complete_lesson(request, lesson_id):
     Returns:
         JsonResponse: The updated completion status and next lesson ID.
     """
-    lesson = get_object_or_404(Lesson, id=lesson_id)
+    lesson = get_object_or_404(Lesson.objects.select_related('module'), id=lesson_id)
+    course_id = lesson.module.course_id
     progress = LessonProgress.objects.get_or_create(
         student=request.user,
         lesson=lesson
     )[0]
     
-    # Toggle the completion status
-    progress.is_completed = not progress.is_completed
-    progress.save()
+    # Toggle the completion status. The UPDATE only matches the state we read,
+    # so a double click counts once towards Enrollment.completed_lessons.
+    now = timezone.now()
+    is_completed = not progress.is_completed
+    outline = get_course_outline(course_id)
+    with transaction.atomic():
+        toggled = LessonProgress.objects.filter(pk=progress.pk, is_completed=progress.is_completed).update(
+            is_completed=is_completed,
+            completed_at=now if is_completed else None,
+            last_accessed=now,
+        )
+        if toggled:
+            record_lesson_completion(request.user.id, course_id, 1 if is_completed else -1, len(outline['sequence']))
+            transaction.on_commit(invalidate_progress_matrix)
     
     # Only find next lesson if we're marking as complete
-    next_lesson_id = None
-    if progress.is_completed:
-        # Find the next lesson
-        current_module = lesson.module
-        current_course = current_module.course
-        
-        # Try to get next lesson in the same module
-        next_lesson = Lesson.objects.filter(
-            module=current_module,
-            order__gt=lesson.order
-        ).order_by('order').first()
-        
-        # If no next lesson in current module, try first lesson of next module
-        if not next_lesson:
-            next_module = current_course.modules.filter(
-                order__gt=current_module.order
-            ).order_by('order').first()
-            
-            if next_module:
-                next_lesson = next_module.lessons.order_by('order').first()
-            else:
-                next_lesson = lesson
-        
-        next_lesson_id = next_lesson.id if next_lesson else None
+    if is_completed:
+        # The lesson after this one in course order, or this one if it is the last
+        sequence = [item['id'] for item in outline['sequence']]
+        position = sequence.index(lesson.id) if lesson.id in sequence else len(sequence)
+        next_lesson_id = sequence[position + 1] if position + 1 < len(sequence) else lesson.id
     else:
         next_lesson_id = lesson_id
     return JsonResponse({
         'success': True,
-        'is_completed': progress.is_completed,
+        'is_completed': is_completed,
         'next_lesson_id': next_lesson_id
     })
 
@@ -1422,6 +1478,8 @@ def reorder_lessons(request, module_id):
                 id=lesson_id,
                 module_id=module_id
             ).update(order=new_order)
+        # .update() sends no signals
+        transaction.on_commit(invalidate_course_outline)
         
         return JsonResponse({
             'status': 'success',
@@ -1593,20 +1651,25 @@ def edit_jupyter_exercise(request, exercise_id):
 def check_upload_progress(request):
     """Check the progress of a file upload.
     
+    Progress is published by ``course.upload_handlers.UploadProgressHandler``
+    for uploads sent with an ``X-Progress-ID`` header.
+    
     Args:
-        request: The HTTP request object.
+        request: The HTTP request object. The progress ID is taken from the
+            ``X-Progress-ID`` header or the ``upload_id`` query parameter.
         
     Returns:
         JsonResponse: The current upload progress or error.
     """
     if request.method == 'GET':
-        upload_id = request.GET.get('upload_id')
-        if upload_id:
-            progress = cache.get(f'upload_progress_{upload_id}')
+        upload_id = request.headers.get('X-Progress-ID') or request.GET.get('upload_id')
+        if valid_progress_id(upload_id):
+            progress = cache.get(progress_cache_key(upload_id))
             if progress:
                 return JsonResponse({
                     'total': progress['total'],
                     'uploaded': progress['uploaded'],
+                    'done': progress['done'],
                     'progress': (progress['uploaded'] / progress['total']) * 100 if progress['total'] > 0 else 0
                 })
     return JsonResponse({'error': 'No upload progress found'}, status=404)
@@ -1688,15 +1751,15 @@ def manage_groups(request, course_id):
         raise PermissionDenied
     
     groups = Group.objects.filter(course=course).annotate(
-        member_count=Count('members'),
-        last_active=Max('members__last_login')
+        num_members=Count('members'),
+        last_active=Max('members__last_seen')
     ).order_by('-created_at')
     
     students = CustomUserModel.objects.filter(
         is_student=True,
         enrollment__course=course
     ).exclude(
-        groups__course=course
+        course_groups__course=course
     ).order_by('first_name', 'last_name')
     
     context = {
@@ -1884,13 +1947,18 @@ def get_group_members(request, group_id):
         raise PermissionDenied
     
     try:
-        members = group.members.all().order_by('first_name', 'last_name')
-        members_data = [{
-            'id': member.id,
-            'full_name': member.get_full_name(),
-            'email': member.email,  # This is already included
-            'last_active': member.last_login.strftime('%Y-%m-%d %H:%M') if member.last_login else 'Never'
-        } for member in members]
+        members = list(group.members.all().order_by('first_name', 'last_name'))
+        # Activity since the last flush is still in the cache
+        buffered = buffered_last_seen([member.id for member in members])
+        members_data = []
+        for member in members:
+            last_seen = buffered.get(member.id, member.last_seen)
+            members_data.append({
+                'id': member.id,
+                'full_name': member.get_full_name(),
+                'email': member.email,  # This is already included
+                'last_active': timezone.localtime(last_seen).strftime('%Y-%m-%d %H:%M') if last_seen else 'Never'
+            })
         
         return JsonResponse(members_data, safe=False)
     except Exception as e:
@@ -1917,7 +1985,7 @@ def list_groups(request, course_id):
     #    }, status=403)
 
 
-    groups = Group.objects.filter(course=course).order_by('-created_at')
+    groups = Group.objects.filter(course=course).prefetch_related('members').order_by('-created_at')
 
     group_data = [{
         'id': group.id,
@@ -1933,6 +2001,13 @@ def list_groups(request, course_id):
     })
 
 
+# Messages join_group has always shown for the errors of Group.add_member
+JOIN_GROUP_ERRORS = {
+    'in_other_group': 'You are already in a group for this course',
+    'group_full': 'This group is full',
+}
+
+
 @login_required
 def join_group(request, course_id):
     """Join an existing group.
@@ -1957,16 +2032,12 @@ def join_group(request, course_id):
         course = get_object_or_404(Course, id=course_id)
         group = get_object_or_404(Group, id=group_id, course=course)
         
-        # Check if user is already in a group
-        if Group.objects.filter(course=course, members=request.user).exists():
-            return JsonResponse({'success': False, 'error': 'You are already in a group for this course'}, status=400)
-        
-        # Check if group is full
-        if group.members.count() >= course.max_members:
-            return JsonResponse({'success': False, 'error': 'This group is full'}, status=400)
-        
-        # Add user to group
-        group.members.add(request.user)
+        # Enrollment, capacity and "one group per course" are checked by the insert
+        try:
+            group.add_member(request.user)
+        except ValidationError as e:
+            error = JOIN_GROUP_ERRORS.get(e.code, e.messages[0])
+            return JsonResponse({'success': False, 'error': error}, status=400)
         
         return JsonResponse({'success': True})
         
@@ -2068,9 +2139,10 @@ def submit_exercise(request, lesson_id):
     """Handle exercise submission.
     
     This view handles:
-    1. Creating a submission record in the database
-    2. Copying the user's work directory to the submissions directory
-    3. Creating submission file records for each submitted file
+    1. Validating every notebook in the user's work directory
+    2. Creating a submission record in the database
+    3. Copying the notebooks to the submissions directory
+    4. Creating submission file records for each submitted file
     
     Args:
         request: The HTTP request object.
@@ -2115,11 +2187,30 @@ def submit_exercise(request, lesson_id):
                 'error': 'No work found to submit'
             }, status=400)
             
-        # Create submission record
-        submission = Submission.objects.create(
-            exercise=exercise,
-            student=request.user
-        )
+        # Collect and check the notebooks before anything is recorded
+        notebooks = []
+        for root, dirs, files in os.walk(source_dir):
+            for file in files:
+                if file.endswith('.ipynb'):  # Only copy Jupyter notebooks
+                    src_file = os.path.join(root, file)
+                    rel_path = os.path.relpath(src_file, source_dir)
+                    try:
+                        validate_notebook(src_file, name=rel_path)
+                    except ValidationError as e:
+                        return JsonResponse({
+                            'success': False,
+                            'error': e.messages[0]
+                        }, status=400)
+                    notebooks.append((src_file, rel_path))
+            
+        # Create submission record and count it on the dashboard in one transaction
+        with transaction.atomic():
+            previous = lock_group_latest(exercise.id, group.id)
+            submission = Submission.objects.create(
+                exercise=exercise,
+                student=request.user
+            )
+            count_submission(exercise.id, previous, submission.submitted_at)
         
         # Define destination directory
         dest_dir = os.path.join(
@@ -2133,28 +2224,23 @@ def submit_exercise(request, lesson_id):
         # Create destination directory
         os.makedirs(dest_dir, exist_ok=True)
         
-        # Copy all files from source to destination
-        for root, dirs, files in os.walk(source_dir):
-            for file in files:
-                if file.endswith('.ipynb'):  # Only copy Jupyter notebooks
-                    src_file = os.path.join(root, file)
-                    # Get relative path from source_dir
-                    rel_path = os.path.relpath(src_file, source_dir)
-                    dest_file = os.path.join(dest_dir, rel_path)
-                    
-                    # Create subdirectories if needed
-                    os.makedirs(os.path.dirname(dest_file), exist_ok=True)
-                    
-                    # Copy the file
-                    shutil.copy2(src_file, dest_file)
-                    
-                    # Create submission file record
-                    rel_path_from_media = os.path.relpath(dest_file, settings.MEDIA_ROOT)
-                    SubmissionFile.objects.create(
-                        submission=submission,
-                        file=rel_path_from_media,
-                        description=f"Submitted file: {rel_path}"
-                    )
+        # Copy the checked notebooks from source to destination
+        for src_file, rel_path in notebooks:
+            dest_file = os.path.join(dest_dir, rel_path)
+            
+            # Create subdirectories if needed
+            os.makedirs(os.path.dirname(dest_file), exist_ok=True)
+            
+            # Copy the file
+            shutil.copy2(src_file, dest_file)
+            
+            # Create submission file record
+            rel_path_from_media = os.path.relpath(dest_file, settings.MEDIA_ROOT)
+            SubmissionFile.objects.create(
+                submission=submission,
+                file=rel_path_from_media,
+                description=f"Submitted file: {rel_path}"
+            )
         
         # Convert UTC time to local timezone before formatting
         local_time = timezone.localtime(submission.submitted_at)
@@ -2176,6 +2262,7 @@ def submit_exercise(request, lesson_id):
 # Submissions Dashboard Views
 
 @login_required
+@use_replica
 def submissions_dashboard(request):
     """Main view for the submissions dashboard.
     
@@ -2195,7 +2282,7 @@ def submissions_dashboard(request):
         return redirect('course:home')
         
     # Get all exercises for the course
-    course = Course.objects.first()
+    course = get_course_context(request).course
     
     # Check if the course end date has passed
     submission_access_allowed = True
@@ -2223,23 +2310,14 @@ def submissions_dashboard(request):
         }
         return render(request, 'course/submissions/dashboard.html', context)
     
-    # Base query for exercises
+    # Base query for exercises; the counters are maintained per exercise (utils/submission_stats.py)
     exercises_query = Exercise.objects.filter(
         lesson__module__course=course,
         exercise_type='jupyter'
     ).select_related(
         'lesson',
-        'lesson__module'
-    ).annotate(
-        total_groups_submitted=models.Count(
-            'submissions__student__course_groups',
-            distinct=True
-        ),
-        pending_groups=models.Count(
-            'submissions__student__course_groups',
-            filter=models.Q(submissions__score__isnull=True),
-            distinct=True
-        )
+        'lesson__module',
+        'submission_stats'
     )
     
     # Filter exercises based on user role
@@ -2265,6 +2343,7 @@ def submissions_dashboard(request):
     return render(request, 'course/submissions/dashboard.html', context)
 
 @login_required
+@use_replica
 def exercise_submissions(request, exercise_id):
     """View for displaying submissions for a specific exercise.
     
@@ -2279,7 +2358,7 @@ def exercise_submissions(request, exercise_id):
     """
     try:
         # Get the exercise and check permissions
-        exercise = get_object_or_404(Exercise, id=exercise_id)
+        exercise = get_object_or_404(Exercise.objects.select_related('lesson__module__course'), id=exercise_id)
         course = exercise.lesson.module.course
         
         # Check if user has permission to view submissions
@@ -2318,84 +2397,63 @@ def exercise_submissions(request, exercise_id):
                 messages.warning(request, error_message)
                 return redirect('course:submissions_dashboard')
         
-        # Get all submissions
-        all_submissions = Submission.objects.filter(
-            exercise=exercise
-        ).select_related(
-            'student'
-        ).prefetch_related(
-            'files',
-            'student__course_groups'
-        )
-
-        # Create a dictionary to store the latest submission per group
-        latest_submissions = {}
-        for submission in all_submissions:
-            group = submission.student.course_groups.first()
-            group_id = group.id if group else 0  # Use 0 for students without a group
-            
-            if group_id not in latest_submissions or \
-               submission.submitted_at > latest_submissions[group_id].submitted_at:
-                latest_submissions[group_id] = submission
-
-        # Convert back to a list and sort by submission date
-        submissions = sorted(
-            latest_submissions.values(),
-            key=lambda x: x.submitted_at,
-            reverse=True
-        )
+        # For regular requests, render the template; the rows are loaded page by page via AJAX
+        if not (request.headers.get('X-Requested-With') == 'XMLHttpRequest' or request.headers.get('Accept') == 'application/json'):
+            context = {
+                'exercise': exercise,
+                'is_admin': request.user.is_superuser or request.user.is_staff
+            }
+            return render(request, 'course/submissions/exercise_submissions.html', context)
+
+        status = request.GET.get('status', '')
+        if status and status not in STATUS_FILTERS:
+            return JsonResponse({'success': False, 'error': f'Unknown status filter: {status}'}, status=400)
+        # Newest submission per group, selected in the database
+        submissions = latest_group_submissions(exercise.id, course.id).prefetch_related('files')
+        if status:
+            submissions = submissions.filter(STATUS_FILTERS[status])
+        try:
+            submissions, next_cursor = paginate_keyset(
+                submissions, ('-submitted_at', '-id'),
+                after=request.GET.get('after'), limit=parse_limit(request.GET.get('limit'))
+            )
+        except (ValueError, ValidationError):
+            return JsonResponse({'success': False, 'error': 'Invalid after or limit parameter'}, status=400)
+
+        submissions_data = []
+        for submission in submissions:
+            files_data = [{
+                'url': file.file.url,
+                'name': os.path.basename(file.file.name),
+                # Notebooks are previewed as server-rendered HTML
+                'render_url': (
+                    reverse('course:render_submission_file', args=[file.id])
+                    if file.file.name.endswith('.ipynb') else None
+                ),
+            } for file in submission.files.all()]
+
+            # Convert UTC time to local timezone before formatting
+            local_time = timezone.localtime(submission.submitted_at)
+
+            submissions_data.append({
+                'id': submission.id,
+                'group': f'Group {submission.group_id}' if submission.group_id else 'No Group',
+                'submitted_at': local_time.strftime('%Y-%m-%d %H:%M'),
+                'score': submission.score,
+                'passed': submission.passed,
+                'feedback': submission.feedback,
+                'files': files_data
+            })
 
-        # If it's an AJAX request, return JSON
-        if request.headers.get('X-Requested-With') == 'XMLHttpRequest' or request.headers.get('Accept') == 'application/json':
-            try:
-                submissions_data = []
-                for submission in submissions:
-                    # Get the student's group
-                    group = Group.objects.filter(
-                        course=exercise.lesson.module.course,
-                        members=submission.student
-                    ).first()
-                    
-                    files_data = [{
-                        'url': file.file.url,
-                        'name': os.path.basename(file.file.name)
-                    } for file in submission.files.all()]
-                    
-                    # Convert UTC time to local timezone before formatting
-                    local_time = timezone.localtime(submission.submitted_at)
-                    
-                    submissions_data.append({
-                        'id': submission.id,
-                        'group': f'Group {group.id}' if group else 'No Group',
-                        'submitted_at': local_time.strftime('%Y-%m-%d %H:%M'),
-                        'score': submission.score,
-                        'passed': submission.passed,
-                        'feedback': submission.feedback,
-                        'files': files_data
-                    })
-                
-                response_data = {
-                    'success': True,
-                    'exercise_title': exercise.lesson.title,
-                    'exercise_max_points': exercise.maximum_points,
-                    'submissions': submissions_data
-                }
-                print(submissions_data)
-                return JsonResponse(response_data)
-                
-            except Exception as e:
-                return JsonResponse({
-                    'success': False,
-                    'error': str(e)
-                }, status=500)
-        
-        # For regular requests, render the template
-        context = {
-            'exercise': exercise,
-            'submissions': submissions,
-            'is_admin': request.user.is_superuser or request.user.is_staff
+        response_data = {
+            'success': True,
+            'exercise_title': exercise.lesson.title,
+            'exercise_max_points': exercise.maximum_points,
+            'submissions': submissions_data,
+            'next': next_cursor
         }
-        return render(request, 'course/submissions/exercise_submissions.html', context)
+        logger.debug("Returning %d submissions for exercise %s", len(submissions_data), exercise.id)
+        return JsonResponse(response_data)
         
     except Exception as e:
         if request.headers.get('Accept') == 'application/json':
@@ -2454,7 +2512,12 @@ def grade_submission(request, submission_id):
             submission.score = score
             # passed will be auto-calculated in the model's save method
             submission.feedback = data.get('feedback')
-            submission.save()
+            with transaction.atomic():
+                latest = lock_group_latest(exercise.id, group.id) if group else None
+                submission.save()
+                # Only the group's latest submission decides its dashboard state
+                if latest and latest['id'] == submission.id:
+                    count_grade(exercise.id, latest, submission)
             
             return JsonResponse({
                 'success': True,
@@ -2476,26 +2539,78 @@ def grade_submission(request, submission_id):
             'name': os.path.basename(file.file.name)
         } for file in exercise.reference_files.all()]
     
-    # Get reference solution if it exists
-    reference_solution = None
-    if exercise.reference_solution:
-        try:
-            with exercise.reference_solution.open('r') as f:
-                reference_solution = f.read()
-        except Exception as e:
-            logger.error(f"Error reading reference solution: {e}")
-    
+    # Notebooks (and the reference comparison) are rendered lazily by render_submission_file
     context = {
         'submission': submission,
         'exercise': exercise,
         'reference_files': reference_files,
         'group': group.id if group else None,
-        'reference_solution': reference_solution,
         'has_reference_solution': bool(exercise.reference_solution)
     }
     return render(request, 'course/submissions/grade_submission.html', context)
 
+def _notebook_response(request, render):
+    """Serve cached notebook HTML with an ETag so revisits are answered with 304."""
+    try:
+        html, etag = render()
+    except (OSError, ValueError) as e:
+        logger.error(f"Error rendering notebook: {e}")
+        return HttpResponse(
+            '<div class="alert alert-danger">Notebook konnte nicht angezeigt werden</div>',
+            status=422
+        )
+    response = HttpResponse(html, content_type='text/html; charset=utf-8')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return get_conditional_response(request, etag=etag, response=response)
+
+@login_required
+@require_http_methods(["GET"])
+def render_submission_file(request, file_id):
+    """Render a submitted notebook to HTML on the server.
+    
+    Args:
+        request: The HTTP request object. ``?compare=reference`` renders a
+            cell-by-cell comparison against the exercise's reference solution.
+        file_id: The ID of the SubmissionFile to render.
+        
+    Returns:
+        HttpResponse: The sanitized notebook HTML fragment.
+    """
+    if not request.user.is_instructor:
+        raise PermissionDenied
+
+    submission_file = get_object_or_404(
+        SubmissionFile.objects.select_related('submission__exercise'), id=file_id
+    )
+    path = submission_file.file.path
+    reference = submission_file.submission.exercise.reference_solution
+    if request.GET.get('compare') == 'reference' and reference:
+        return _notebook_response(request, lambda: notebook_diff_html(reference.path, path))
+    return _notebook_response(request, lambda: notebook_html(path))
+
 @login_required
+@require_http_methods(["GET"])
+def render_reference_solution(request, exercise_id):
+    """Render an exercise's reference solution notebook to HTML.
+    
+    Args:
+        request: The HTTP request object.
+        exercise_id: The ID of the exercise.
+        
+    Returns:
+        HttpResponse: The sanitized notebook HTML fragment.
+    """
+    if not request.user.is_instructor:
+        raise PermissionDenied
+
+    exercise = get_object_or_404(Exercise, id=exercise_id)
+    if not exercise.reference_solution:
+        raise Http404("No reference solution")
+    return _notebook_response(request, lambda: notebook_html(exercise.reference_solution.path))
+
+@login_required
+@use_replica
 def submission_statistics(request):
     """View for displaying submission statistics.
     
@@ -2508,10 +2623,10 @@ def submission_statistics(request):
     if not request.user.is_instructor:
         raise PermissionDenied
         
-    course = Course.objects.first()
+    course = get_course_context(request).require_course()
     
     # Check if the course end date has passed (superusers are exempt)
-    if not request.user.is_superuser and course and course.end_date:
+    if not request.user.is_superuser and course.end_date:
         current_date = timezone.now().date()
         if current_date <= course.end_date:
             formatted_end_date = course.end_date.strftime('%d.%m.%Y')
@@ -2519,44 +2634,16 @@ def submission_statistics(request):
             messages.warning(request, error_message)
             return redirect('course:submissions_dashboard')
 
-    # Get all groups in the course
-    groups = Group.objects.filter(course=course)
-    
-    # Calculate statistics for each group
-    group_stats = []
-    for group in groups:
-        # Get all submissions from group members
-        submissions = Submission.objects.filter(
-            exercise__lesson__module__course=course,
-            student__in=group.members.all(),
-            score__isnull=False  # Only include graded submissions
-        )
-        
-        if submissions.exists():
-            avg_score = submissions.aggregate(models.Avg('score'))['score__avg']
-            max_score = submissions.aggregate(models.Max('score'))['score__max']
-            submission_count = submissions.count()
-        else:
-            avg_score = 0
-            max_score = 0
-            submission_count = 0
-            
-        group_stats.append({
-            'group': {
-                'id': group.id,
-                'members': [
-                    {'name': member.get_full_name()} 
-                    for member in group.members.all()
-                ]
-            },
-            'avg_score': round(avg_score, 2) if avg_score else 0,
-            'max_score': max_score,
-            'submission_count': submission_count
-        })
-    
+    # Aggregated in a few queries and cached until the next grade
+    statistics = get_submission_statistics(course.id)
+
     context = {
-        'group_stats': json.dumps(group_stats),
-        'group_stats_raw': group_stats,  # For template rendering
+        'group_stats': json.dumps(statistics['groups']),
+        'group_stats_raw': statistics['groups'],  # For template rendering
+        'exercise_stats': statistics['exercises'],
+        'score_distribution': json.dumps(statistics['distribution']),
+        'average_score': statistics['average_score'],
+        'total_submissions': statistics['total_submissions'],
         'active_section': 'statistics'
     }
     return render(request, 'course/submissions/statistics.html', context)
@@ -2564,6 +2651,51 @@ def submission_statistics(request):
 
 
 @login_required
+@use_replica
+def progress_heatmap(request):
+    """Page showing which students completed which lessons as a heatmap.
+
+    The matrix itself is loaded by the page from ``progress_matrix``.
+
+    Args:
+        request: The HTTP request object.
+        
+    Returns:
+        HttpResponse: The rendered heatmap template.
+    """
+    if not (request.user.is_instructor or request.user.is_superuser):
+        raise PermissionDenied
+    course = get_course_context(request).require_course()
+    return render(request, 'course/submissions/progress.html', {
+        'course': course,
+        'active_section': 'progress'
+    })
+
+
+@login_required
+@require_http_methods(['GET'])
+@use_replica
+def progress_matrix(request):
+    """Return the student x lesson completion matrix of the course.
+
+    Completions are encoded per student as a hex bitset over the lesson
+    list (see ``utils.progress.get_progress_matrix``). ``?details=1`` adds
+    completed_at and time_spent per lesson.
+
+    Args:
+        request: The HTTP request object.
+        
+    Returns:
+        JsonResponse: The lessons, modules and per-student bitsets.
+    """
+    if not (request.user.is_instructor or request.user.is_superuser):
+        return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+    course = get_course_context(request).require_course()
+    details = request.GET.get('details') in ('1', 'true')
+    return JsonResponse({'success': True, **get_progress_matrix(course.id, details=details)})
+
+@login_required
+@use_replica
 def admin_dashboard(request):
     """Admin dashboard view for managing users and role requests.
     
@@ -2578,18 +2710,68 @@ def admin_dashboard(request):
     # Get active tab from query parameters, default to 'users'
     active_tab = request.GET.get('tab', 'users')
     
-    # Get all users including superusers
-    users = CustomUserModel.objects.all().select_related(
-        'enrollment'
-    ).order_by('date_joined')
-    
+    # The user lists are loaded page by page from admin_users; only the
+    # ticket tab needs the (few) staff members for its assignment select
     context = {
         'active_tab': active_tab,
-        'users': users,
+        'staff_users': CustomUserModel.objects.filter(
+            Q(is_staff=True) | Q(is_instructor=True)
+        ).order_by('first_name', 'last_name') if active_tab == 'tickets' else [],
     }
     
     return render(request, 'course/adminpage/admin_dashboard.html', context)
 
+@login_required
+@require_http_methods(['GET'])
+@use_replica
+def admin_users(request):
+    """Return one page of the user directory for the admin dashboard.
+
+    Query parameters: ``q`` (search terms matched against name and email),
+    ``role`` (admin, instructor, student), ``enrollment`` (enrolled,
+    not_enrolled), ``sort`` (name, email, joined; ``-`` for descending),
+    ``after`` (the ``next`` cursor of the previous page) and ``limit``.
+
+    Args:
+        request: The HTTP request object.
+        
+    Returns:
+        JsonResponse: The users of the page and the cursor of the next page.
+    """
+    if not request.user.is_superuser:
+        return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+
+    role = request.GET.get('role', '')
+    enrollment = request.GET.get('enrollment', '')
+    if (role and role not in ROLE_FILTERS) or (enrollment and enrollment not in ENROLLMENT_FILTERS):
+        return JsonResponse({'success': False, 'error': 'Unknown role or enrollment filter'}, status=400)
+    try:
+        ordering = user_ordering(request.GET.get('sort', 'name'))
+        limit = parse_limit(request.GET.get('limit'))
+        users, next_cursor = paginate_keyset(
+            user_directory(request.GET.get('q', ''), role, enrollment),
+            ordering, after=request.GET.get('after'), limit=limit
+        )
+    except (KeyError, ValueError, ValidationError):
+        return JsonResponse({'success': False, 'error': 'Invalid sort, after or limit parameter'}, status=400)
+
+    users_data = []
+    for user in users:
+        enrolled = getattr(user, 'enrollment', None)
+        users_data.append({
+            'id': user.id,
+            'name': user.get_full_name(),
+            'email': user.email,
+            'role': 'admin' if user.is_superuser else 'instructor' if user.is_instructor else 'student',
+            'is_self': user.id == request.user.id,
+            'progress': {
+                'percent': enrolled.progress,
+                'completed_lessons': enrolled.completed_lessons,
+                'total_lessons': enrolled.total_lessons,
+            } if enrolled else None,
+        })
+    return JsonResponse({'success': True, 'users': users_data, 'next': next_cursor})
+
 @login_required
 def admin_change_role(request):
     """Handle user role changes.
@@ -2772,6 +2954,13 @@ def upload_reference_solution(request, exercise_id):
                 'success': False,
                 'error': 'File must be a Jupyter notebook (.ipynb)'
             }, status=400)
+        try:
+            validate_notebook(file)
+        except ValidationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': e.messages[0]
+            }, status=400)
             
         # Delete old reference solution if it exists
         if exercise.reference_solution:
@@ -2781,18 +2970,10 @@ def upload_reference_solution(request, exercise_id):
         exercise.reference_solution = file
         exercise.save()
         
-        # Read the newly uploaded file for immediate display
-        reference_solution = None
-        try:
-            with exercise.reference_solution.open('r') as f:
-                reference_solution = f.read()
-        except Exception as e:
-            logger.error(f"Error reading uploaded reference solution: {e}")
-        
         return JsonResponse({
             'success': True,
             'message': 'Reference solution uploaded successfully',
-            'reference_solution': reference_solution
+            'reference_url': reverse('course:render_reference_solution', args=[exercise.id])
         })
         
     except Exception as e:
@@ -2824,16 +3005,11 @@ def admin_send_email(request):
         }, status=403)
 
     try:
-        # Log incoming request data for debugging
-        logger.info(f"Email request data: {request.POST}")
-        
+        # Subject, body and addresses stay out of the log
         subject = request.POST.get('subject')
         content = request.POST.get('content')
         recipient_group = request.POST.get('recipients')
 
-        # Log parsed values
-        logger.info(f"Parsed email data - Subject: {subject}, Recipients: {recipient_group}")
-
         if not all([subject, content, recipient_group]):
             return JsonResponse({
                 'success': False,
@@ -2875,11 +3051,8 @@ def admin_send_email(request):
                 'error': 'Invalid recipient group'
             }, status=400)
 
-        # Log recipient count
-        logger.info(f"Found {users.count()} recipients for group: {recipient_group}")
-
         # Prepare email messages
-        user_emails = [user.email for user in users if user.email]
+        user_emails = [email for email in users.values_list('email', flat=True) if email]
         
         if not user_emails:
             return JsonResponse({
@@ -2887,8 +3060,7 @@ def admin_send_email(request):
                 'error': 'No valid recipients found'
             })
 
-        # Log email sending attempt
-        logger.info(f"Attempting to send email to {len(user_emails)} recipients")
+        logger.info("Sending email to %d recipients (group: %s)", len(user_emails), recipient_group)
 
         try:
             # Send emails in a single operation
@@ -2900,7 +3072,7 @@ def admin_send_email(request):
                 fail_silently=False
             )
             
-            logger.info(f"Successfully sent {send_count} emails")
+            logger.info("Successfully sent %d emails", send_count)
             
             return JsonResponse({
                 'success': True,
@@ -2908,14 +3080,14 @@ def admin_send_email(request):
             })
             
         except Exception as mail_error:
-            logger.error(f"Email sending error: {str(mail_error)}")
+            logger.error("Email sending error: %s", mail_error)
             return JsonResponse({
                 'success': False,
                 'error': f'Error sending emails: {str(mail_error)}'
             }, status=500)
 
     except Exception as e:
-        logger.error(f"General error in admin_send_email: {str(e)}")
+        logger.error("General error in admin_send_email: %s", e)
         return JsonResponse({
             'success': False,
             'error': f'Server error: {str(e)}'
@@ -2953,7 +3125,6 @@ def create_ticket(request):
         )
 
         # Handle image upload if present
-        image_file = None
         if 'image' in request.FILES:
             image_file = request.FILES['image']
             if not image_file.content_type.startswith('image/'):
@@ -2990,26 +3161,16 @@ Mit freundlichen Grüßen,
 Databrix Support
 """
         
-        # Create EmailMessage instance for attachment support
-        email = EmailMessage(
+        # Thumbnails and the email (with a compressed copy of the image) are
+        # produced in the background so the upload returns immediately
+        transaction.on_commit(lambda: start_ticket_processing(
+            ticket.id,
             subject=email_subject,
             body=email_message,
             from_email=settings.DEFAULT_FROM_EMAIL,
             to=[i for i in settings.SUPPORT_EMAIL],
             reply_to=[request.user.email]  # Add reply-to header
-        )
-        
-        # Attach image if present
-        if image_file:
-            image_file.seek(0)
-            email.attach(
-                filename=image_file.name,
-                content=image_file.read(),
-                mimetype=image_file.content_type
-            )
-        
-        # Send email
-        email.send(fail_silently=False)
+        ))
         
         return JsonResponse({
             'success': True,
@@ -3030,13 +3191,73 @@ Databrix Support
         }, status=500)
 
 @login_required
+@require_http_methods(['GET'])
+@use_replica
 def ticket_list(request):
-    """List tickets based on user role."""
-    if request.user.is_staff or request.user.is_instructor:
-        tickets = Ticket.objects.all()
-    else:
-        tickets = Ticket.objects.filter(user=request.user)
-    
+    """List tickets based on user role, one page at a time.
+
+    Staff and instructors see every ticket, everyone else their own.
+    Query parameters: ``status``, ``assigned_to`` (a user id, ``me`` or
+    ``none``), ``created_from`` / ``created_to`` (ISO dates, inclusive),
+    ``q`` (subject or reporter email), ``after`` (the ``next`` cursor of the
+    previous page) and ``limit``.
+
+    The response carries an ETag over the filtered tickets (newest
+    ``updated_at`` and count), so polling clients get a 304 without the page
+    query until a ticket is created, changed or deleted.
+
+    Args:
+        request: The HTTP request object.
+        
+    Returns:
+        JsonResponse: The tickets of the page and the cursor of the next page.
+    """
+    tickets = Ticket.objects.select_related('user', 'assigned_to')
+    if not (request.user.is_staff or request.user.is_instructor):
+        tickets = tickets.filter(user=request.user)
+
+    try:
+        status = request.GET.get('status', '')
+        if status:
+            if status not in dict(Ticket.STATUS_CHOICES):
+                raise ValueError(status)
+            tickets = tickets.filter(status=status)
+        assigned_to = request.GET.get('assigned_to', '')
+        if assigned_to == 'me':
+            tickets = tickets.filter(assigned_to=request.user)
+        elif assigned_to == 'none':
+            tickets = tickets.filter(assigned_to__isnull=True)
+        elif assigned_to:
+            tickets = tickets.filter(assigned_to_id=int(assigned_to))
+        # Whole local days as created_at ranges, so the created_at index applies
+        for param, lookup, offset in (('created_from', 'created_at__gte', 0), ('created_to', 'created_at__lt', 1)):
+            if request.GET.get(param):
+                day = datetime.strptime(request.GET[param], '%Y-%m-%d') + timedelta(days=offset)
+                tickets = tickets.filter(**{lookup: timezone.make_aware(day)})
+        for term in request.GET.get('q', '').split():
+            tickets = tickets.filter(Q(subject__icontains=term) | Q(user__email__icontains=term))
+        limit = parse_limit(request.GET.get('limit'))
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid filter or limit parameter'}, status=400)
+
+    # Changes to any matching ticket move the newest updated_at; deletions change the count
+    state = tickets.aggregate(latest=Max('updated_at'), count=Count('id'))
+    etag = '"%s"' % hashlib.md5(
+        f"{request.user.id}|{request.get_full_path()}|{state['latest']}|{state['count']}".encode()
+    ).hexdigest()
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        not_modified['Cache-Control'] = 'private, no-cache'
+        return not_modified
+
+    try:
+        tickets, next_cursor = paginate_keyset(
+            tickets, ('-created_at', '-id'), after=request.GET.get('after'), limit=limit
+        )
+    except (ValueError, ValidationError):
+        return JsonResponse({'success': False, 'error': 'Invalid after parameter'}, status=400)
+
     tickets_data = [{
         'id': ticket.id,
         'subject': ticket.subject,
@@ -3044,13 +3265,18 @@ def ticket_list(request):
         'created_at': ticket.created_at.strftime('%d.%m.%Y %H:%M'),
         'assigned_to': ticket.assigned_to.get_full_name() if ticket.assigned_to else None,
         'resolution_notes': ticket.resolution_notes if ticket.resolution_notes else None,
-        'user': ticket.user.email
+        'user': ticket.user.email,
+        'image_thumbnail': ticket.image_thumbnail.url if ticket.image_thumbnail else None
     } for ticket in tickets]
     
-    return JsonResponse({
+    response = JsonResponse({
         'success': True,
-        'tickets': tickets_data
+        'tickets': tickets_data,
+        'next': next_cursor
     })
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
 @login_required
 def ticket_detail(request, ticket_id):
@@ -3071,7 +3297,8 @@ def ticket_detail(request, ticket_id):
             'user': ticket.user.get_full_name(),
             'resolution_notes': ticket.resolution_notes,
             'assigned_to': ticket.assigned_to.get_full_name() if ticket.assigned_to else None,
-            'image': ticket.image.url if ticket.image else None
+            'image': ticket.image.url if ticket.image else None,
+            'image_thumbnail': ticket.image_thumbnail.url if ticket.image_thumbnail else None
         }
         
         return JsonResponse({
@@ -3191,10 +3418,11 @@ def delete_ticket(request, ticket_id):
         if not (request.user.is_staff or request.user.is_instructor or request.user.is_superuser):
             raise PermissionDenied
 
-        # Try deleting attached image file if present
+        # Try deleting attached image file (and its variants) if present
         try:
             if ticket.image:
                 ticket.image.delete(save=False)
+            remove_ticket_image_variants(ticket)
         except Exception as e:
             logger.error(f"Error deleting ticket image: {str(e)}")
 